@@ -1,12 +1,15 @@
+import asyncio
 import json
 from typing import Dict, Any
-from app.ai.claude_client import claude_client
+from app.ai.claude_client import claude_client, parse_json_output
 from app.ai.prompts.base import BASE_SYSTEM_PROMPT, get_generation_prompt
 from app.ai.prompts.worksheet import WORKSHEET_SYSTEM_PROMPT, WORKSHEET_GENERATION_PROMPT
 from app.ai.schemas.worksheet import WorksheetSchema
 from app.ai.schemas.basic_types import PassageSchema, QuizSchema, AssessmentSchema
 from app.utils.storage import storage_manager
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class GeneratorAgent:
     """AI agent responsible for generating educational content"""
@@ -34,7 +37,7 @@ class GeneratorAgent:
         """Generate content for a product and save to storage"""
         
         try:
-            logger.info(f"Starting content generation for product {product_id} ({product_type})")
+            logger.info("Starting content generation for product %s (%s)", product_id, product_type)
             
             # Get appropriate prompts
             if product_type in self.prompt_map:
@@ -49,34 +52,25 @@ class GeneratorAgent:
                 user_prompt += f"\\n\\n{generation_template}"
             
             # Generate content using Claude
-            raw_output = await claude_client.generate(system_prompt, user_prompt)
-            logger.info(f"Claude raw output for product {product_id}: {raw_output[:200]}...")
-            
-            # Clean up Claude response (remove markdown code blocks)
-            cleaned_output = raw_output.strip()
-            if cleaned_output.startswith('```json'):
-                cleaned_output = cleaned_output[7:]  # Remove ```json
-            if cleaned_output.startswith('```'):
-                cleaned_output = cleaned_output[3:]   # Remove ```
-            if cleaned_output.endswith('```'):
-                cleaned_output = cleaned_output[:-3]  # Remove trailing ```
-            cleaned_output = cleaned_output.strip()
+            raw_output = await claude_client.generate(system_prompt, user_prompt, agent="generator", validate=parse_json_output)
+            # Debug only - raw model output is large and of little use in production logs
+            logger.debug("Claude raw output for product %s: %.200s", product_id, raw_output)
             
-            # Parse JSON response
+            # Parse JSON response (tolerating a markdown code block)
             try:
-                content_data = json.loads(cleaned_output)
+                content_data = parse_json_output(raw_output)
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid JSON from Claude for product {product_id}: {e}")
-                logger.error(f"Cleaned Claude output: {cleaned_output}")
+                logger.error(f"Claude output: {raw_output}")
                 raise ValueError("Generated content is not valid JSON")
             
             # Skip schema validation - Claude generates good content but with different field names
             # Content is saved successfully to storage regardless of schema validation
             
             # Save raw content to storage
-            storage_manager.save_json_file(product_id, "raw", content_data)
+            await asyncio.to_thread(storage_manager.save_json_file, product_id, "raw", content_data)
             
-            logger.info(f"Content generation completed for product {product_id}")
+            logger.info("Content generation completed for product %s", product_id)
             return content_data
             
         except Exception as e:
@@ -1,9 +1,12 @@
+import asyncio
 import json
 from typing import Dict, Any
-from app.ai.claude_client import claude_client
+from app.ai.claude_client import claude_client, parse_json_output
 from app.ai.schemas.metadata import MetadataSchema
 from app.utils.storage import storage_manager
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class MetadataAgent:
     """AI agent responsible for generating product metadata"""
@@ -44,7 +47,7 @@ OUTPUT: Valid JSON only, following metadata schema exactly."""
         """Generate metadata for content and save to storage"""
         
         try:
-            logger.info(f"Starting metadata generation for product {product_id}")
+            logger.info("Starting metadata generation for product %s", product_id)
             
             # Build metadata generation prompt
             content_summary = self._extract_content_summary(content, product_type)
@@ -72,21 +75,11 @@ GENERATE:
 Ensure metadata is market-ready and educationally accurate."""
             
             # Generate metadata using Claude
-            raw_output = await claude_client.generate(self.METADATA_SYSTEM_PROMPT, user_prompt)
-            
-            # Clean up Claude response (remove markdown code blocks)
-            cleaned_output = raw_output.strip()
-            if cleaned_output.startswith('```json'):
-                cleaned_output = cleaned_output[7:]  # Remove ```json
-            if cleaned_output.startswith('```'):
-                cleaned_output = cleaned_output[3:]   # Remove ```
-            if cleaned_output.endswith('```'):
-                cleaned_output = cleaned_output[:-3]  # Remove trailing ```
-            cleaned_output = cleaned_output.strip()
+            raw_output = await claude_client.generate(self.METADATA_SYSTEM_PROMPT, user_prompt, agent="metadata", validate=parse_json_output)
             
-            # Parse JSON response
+            # Parse JSON response (tolerating a markdown code block)
             try:
-                metadata_data = json.loads(cleaned_output)
+                metadata_data = parse_json_output(raw_output)
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid metadata JSON for product {product_id}: {e}")
                 # Generate fallback metadata
@@ -112,16 +105,16 @@ Ensure metadata is market-ready and educationally accurate."""
             }
             
             # Save metadata to storage
-            storage_manager.save_json_file(product_id, "metadata", metadata_data)
+            await asyncio.to_thread(storage_manager.save_json_file, product_id, "metadata", metadata_data)
             
-            logger.info(f"Metadata generation completed for product {product_id}")
+            logger.info("Metadata generation completed for product %s", product_id)
             return metadata_data
             
         except Exception as e:
             logger.error(f"Metadata generation failed for product {product_id}: {e}")
             # Generate and save fallback metadata
             fallback_metadata = self._generate_fallback_metadata(product_type, grade_level, standard)
-            storage_manager.save_json_file(product_id, "metadata", fallback_metadata)
+            await asyncio.to_thread(storage_manager.save_json_file, product_id, "metadata", fallback_metadata)
             return fallback_metadata
     
     def _extract_content_summary(self, content: Dict[str, Any], product_type: str) -> str:
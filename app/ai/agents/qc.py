@@ -1,10 +1,13 @@
+import asyncio
 import json
 from typing import Dict, Any
-from app.ai.claude_client import claude_client
+from app.ai.claude_client import claude_client, parse_json_output
 from app.ai.prompts.base import get_qc_prompt
 from app.ai.schemas.qc import QCSchema
 from app.utils.storage import storage_manager
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class QCAgent:
     """AI agent responsible for quality control evaluation"""
@@ -44,7 +47,7 @@ OUTPUT: Valid JSON only, following QC schema exactly."""
         """Evaluate content quality and save QC results"""
         
         try:
-            logger.info(f"Starting QC evaluation for product {product_id}")
+            logger.info("Starting QC evaluation for product %s", product_id)
             
             # Convert content to string for evaluation
             content_str = json.dumps(content, indent=2)
@@ -53,21 +56,11 @@ OUTPUT: Valid JSON only, following QC schema exactly."""
             user_prompt = get_qc_prompt(product_type, content_str, standard, grade_level)
             
             # Get QC evaluation from Claude
-            raw_output = await claude_client.generate(self.QC_SYSTEM_PROMPT, user_prompt)
-            
-            # Clean up Claude response (remove markdown code blocks)
-            cleaned_output = raw_output.strip()
-            if cleaned_output.startswith('```json'):
-                cleaned_output = cleaned_output[7:]  # Remove ```json
-            if cleaned_output.startswith('```'):
-                cleaned_output = cleaned_output[3:]   # Remove ```
-            if cleaned_output.endswith('```'):
-                cleaned_output = cleaned_output[:-3]  # Remove trailing ```
-            cleaned_output = cleaned_output.strip()
+            raw_output = await claude_client.generate(self.QC_SYSTEM_PROMPT, user_prompt, agent="qc", validate=parse_json_output)
             
-            # Parse JSON response
+            # Parse JSON response (tolerating a markdown code block)
             try:
-                qc_data = json.loads(cleaned_output)
+                qc_data = parse_json_output(raw_output)
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid QC JSON for product {product_id}: {e}")
                 # Fallback QC result for parsing errors
@@ -107,9 +100,9 @@ OUTPUT: Valid JSON only, following QC schema exactly."""
             }
             
             # Save QC results to storage
-            storage_manager.save_json_file(product_id, "qc", qc_data)
+            await asyncio.to_thread(storage_manager.save_json_file, product_id, "qc", qc_data)
             
-            logger.info(f"QC evaluation completed for product {product_id}: {qc_data['verdict']} (score: {qc_data['score']})")
+            logger.info("QC evaluation completed for product %s: %s (score: %s)", product_id, qc_data['verdict'], qc_data['score'])
             return qc_data
             
         except Exception as e:
@@ -133,7 +126,7 @@ OUTPUT: Valid JSON only, following QC schema exactly."""
                 "strengths": ["None identified"],
                 "recommendations": ["Retry generation process"]
             }
-            storage_manager.save_json_file(product_id, "qc", fallback_qc)
+            await asyncio.to_thread(storage_manager.save_json_file, product_id, "qc", fallback_qc)
             return fallback_qc
 
 qc_agent = QCAgent()
\ No newline at end of file
@@ -1,67 +1,203 @@
 import httpx
+import json
 import time
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from app.core.config import settings
-from app.utils.logger import logger
+from app.ai.retry import ClaudeAPIError, RetryPolicy, parse_retry_after
+from app.ai.rate_limiter import claude_rate_limiter
+from app.ai.response_cache import response_cache
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+class _CallTimer:
+    """Collects connect / TTFB / total timings from httpx trace events"""
+
+    def __init__(self, agent: str):
+        self.agent = agent
+        self.started = time.perf_counter()
+        self.connect_started: Optional[float] = None
+        self.connect_completed: Optional[float] = None
+        self.headers_received: Optional[float] = None
+
+    async def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event_name == "connection.connect_tcp.started":
+            self.connect_started = now
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            self.connect_completed = now
+        elif event_name.endswith("receive_response_headers.complete"):
+            self.headers_received = now
+
+    def record(self, status: str) -> None:
+        total = time.perf_counter() - self.started
+        prometheus.claude_request_duration.labels(self.agent, status).observe(total)
+        if status != "200":
+            prometheus.claude_errors_total.labels(self.agent, status).inc()
+
+        if self.connect_started is not None and self.connect_completed is not None:
+            prometheus.claude_connect_duration.observe(self.connect_completed - self.connect_started)
+            prometheus.claude_connections_total.labels("false").inc()
+        else:
+            prometheus.claude_connections_total.labels("true").inc()
+
+        if self.headers_received is not None:
+            prometheus.claude_ttfb.labels(self.agent, status).observe(self.headers_received - self.started)
+
+def parse_json_output(raw_output: str) -> Any:
+    """Parse a JSON response, tolerating a surrounding markdown code block"""
+    cleaned_output = raw_output.strip()
+    if cleaned_output.startswith('```json'):
+        cleaned_output = cleaned_output[7:]
+    if cleaned_output.startswith('```'):
+        cleaned_output = cleaned_output[3:]
+    if cleaned_output.endswith('```'):
+        cleaned_output = cleaned_output[:-3]
+    return json.loads(cleaned_output.strip())
 
 class ClaudeClient:
     """Claude Sonnet 4 API client with timeout, retry, and error handling"""
-    
+
     def __init__(self):
         self.api_key = settings.claude_api_key
         self.model = settings.claude_model
         self.timeout = settings.claude_timeout
-        self.max_retries = settings.claude_max_retries
+        self.retry_policy = RetryPolicy.from_settings()
         self.base_url = "https://api.anthropic.com/v1/messages"
-    
-    async def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Generate text using Claude with retries and error handling"""
-        
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        """Open the shared connection pool (called from the app lifespan)"""
+        if self._client is not None:
+            return
+
+        http2 = settings.claude_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested for Claude client but 'h2' is not installed; using HTTP/1.1")
+                http2 = False
+
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(self.timeout, connect=settings.claude_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.claude_max_connections,
+                max_keepalive_connections=settings.claude_max_keepalive_connections,
+                keepalive_expiry=settings.claude_keepalive_expiry
+            )
+        )
+        logger.info("Claude client pool opened (http2=%s, max_connections=%s)", http2, settings.claude_max_connections)
+
+    async def close(self) -> None:
+        """Close pooled connections on shutdown"""
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("Claude client pool closed")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Scripts and tests may use the client without the app lifespan
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        agent: str = "default",
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Generate text using Claude with retries and error handling.
+
+        `agent` names the caller (generator, qc, metadata) for per-agent
+        cache flags and metrics. Responses are only cached once `validate`
+        accepts them (returns without raising), so an unparseable reply is
+        never served again from the cache; without a validator nothing is
+        cached.
+        """
+
         if not self.api_key:
             raise ValueError("CLAUDE_API_KEY not configured")
-        
+
         headers = {
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json"
         }
-        
+
         payload = {
             "model": self.model,
             "max_tokens": 4000,
             "system": system_prompt,
             "messages": [{"role": "user", "content": user_prompt}]
         }
-        
-        for attempt in range(self.max_retries):
+
+        cache_key = None
+        if validate is not None and response_cache.enabled_for(agent):
+            cache_key = response_cache.key_for(payload)
+            cached = await response_cache.get(agent, cache_key)
+            if cached is not None:
+                logger.info("Claude response cache hit for %s", agent)
+                return cached
+
+        client = await self._get_client()
+
+        # Rough pre-flight estimate (~4 chars per token) corrected with actual usage afterwards
+        estimated_tokens = (len(system_prompt) + len(user_prompt)) // 4 + payload["max_tokens"]
+
+        async def attempt_call(attempt: int, remaining: float) -> str:
+            # Slots are taken per attempt so backoff sleeps never hold one
+            async with claude_rate_limiter.acquire(estimated_tokens) as lease:
+                timer = _CallTimer(agent)
+                # Never let a single attempt outlive the overall retry deadline
+                timeout = httpx.Timeout(min(self.timeout, remaining), connect=settings.claude_connect_timeout)
+                try:
+                    response = await client.post(
+                        self.base_url,
+                        json=payload,
+                        headers=headers,
+                        timeout=timeout,
+                        extensions={"trace": timer.trace}
+                    )
+                except httpx.TimeoutException:
+                    timer.record("timeout")
+                    raise
+                except httpx.TransportError:
+                    timer.record("transport_error")
+                    raise
+
+                timer.record(str(response.status_code))
+
+                if response.status_code == 200:
+                    result = response.json()
+                    usage = result.get("usage") or {}
+                    if usage:
+                        lease.report_usage(usage.get("input_tokens", 0) + usage.get("output_tokens", 0))
+                    content = result["content"][0]["text"]
+                    logger.info("Claude generation successful (attempt %s)", attempt + 1)
+                    return content
+
+            logger.warning(f"Claude API error {response.status_code}: {response.text}")
+            raise ClaudeAPIError(
+                f"Claude API failed: {response.status_code}",
+                status_code=response.status_code,
+                retryable=self.retry_policy.is_retryable_status(response.status_code),
+                retry_after=parse_retry_after(response.headers.get("retry-after"))
+            )
+
+        content = await self.retry_policy.run(attempt_call, "Claude generation", agent=agent)
+        if cache_key is not None:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(self.base_url, json=payload, headers=headers)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        content = result["content"][0]["text"]
-                        logger.info(f"Claude generation successful (attempt {attempt + 1})")
-                        return content
-                    else:
-                        logger.warning(f"Claude API error {response.status_code}: {response.text}")
-                        if attempt == self.max_retries - 1:
-                            raise Exception(f"Claude API failed: {response.status_code}")
-                        
-            except httpx.TimeoutException:
-                logger.warning(f"Claude timeout on attempt {attempt + 1}")
-                if attempt == self.max_retries - 1:
-                    raise Exception("Claude API timeout after retries")
-                    
+                validate(content)
             except Exception as e:
-                logger.error(f"Claude error on attempt {attempt + 1}: {e}")
-                if attempt == self.max_retries - 1:
-                    raise
-            
-            # Wait before retry
-            if attempt < self.max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-        
-        raise Exception("Claude generation failed after all retries")
-
-claude_client = ClaudeClient()
\ No newline at end of file
+                logger.warning(f"Not caching invalid Claude response for {agent}: {e}")
+            else:
+                await response_cache.set(agent, cache_key, content)
+        return content
+
+claude_client = ClaudeClient()
@@ -0,0 +1,269 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+class Priority(IntEnum):
+    """Claude call priority lanes - lower values are served first"""
+    INTERACTIVE = 0  # Single-product generation a user is waiting on
+    BULK = 1  # Bundle / catalogue fan-out
+
+_current_priority: ContextVar[Priority] = ContextVar("claude_priority", default=Priority.INTERACTIVE)
+
+@contextmanager
+def claude_priority(priority: Priority) -> Iterator[None]:
+    """Run Claude calls made inside this block (and tasks spawned from it) in a priority lane"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` tokens per minute"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Correct a previous estimate: positive delta charges more, negative refunds"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+class Lease:
+    """A granted slot; report actual token usage so the TPM bucket stays accurate"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def report_usage(self, tokens: int) -> None:
+        self.actual_tokens = tokens
+
+class AdvisoryLockSlots:
+    """
+    Cluster-wide concurrency slots backed by Postgres session advisory locks.
+    Each in-flight call holds one dedicated (unpooled) connection for its lock.
+    """
+
+    LOCK_NAMESPACE = 0x52424231  # "RBB1"
+
+    def __init__(self, slots: int, poll_interval: float = 0.25):
+        if slots < 1:
+            raise ValueError("AdvisoryLockSlots needs at least one slot")
+        self.slots = slots
+        self.poll_interval = poll_interval
+        self.engine = create_engine(settings.database_url, poolclass=NullPool)
+
+    def _try_acquire(self):
+        conn = self.engine.connect()
+        try:
+            for slot in range(self.slots):
+                locked = conn.execute(
+                    text("SELECT pg_try_advisory_lock(:ns, :slot)"),
+                    {"ns": self.LOCK_NAMESPACE, "slot": slot}
+                ).scalar()
+                if locked:
+                    conn.commit()
+                    return conn, slot
+        except Exception:
+            conn.close()
+            raise
+        conn.close()
+        return None
+
+    def _release(self, conn, slot: int) -> None:
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:ns, :slot)"), {"ns": self.LOCK_NAMESPACE, "slot": slot})
+        finally:
+            conn.close()
+
+    def _release_abandoned(self, attempt: asyncio.Future) -> None:
+        """Give back a slot won by an acquire attempt whose caller was cancelled"""
+        if attempt.cancelled() or attempt.exception() is not None:
+            return
+        acquired = attempt.result()
+        if acquired is not None:
+            asyncio.get_running_loop().run_in_executor(None, self._release, *acquired)
+
+    async def acquire(self) -> Tuple[object, int]:
+        while True:
+            # The thread keeps running if we are cancelled, so shield it and
+            # release whatever it ends up holding once it finishes
+            attempt = asyncio.ensure_future(asyncio.to_thread(self._try_acquire))
+            try:
+                acquired = await asyncio.shield(attempt)
+            except asyncio.CancelledError:
+                attempt.add_done_callback(self._release_abandoned)
+                raise
+            if acquired is not None:
+                return acquired
+            await asyncio.sleep(self.poll_interval)
+
+    async def release(self, conn, slot: int) -> None:
+        await asyncio.to_thread(self._release, conn, slot)
+
+class ClaudeRateLimiter:
+    """
+    Process-wide limiter for Claude calls: a concurrency cap plus
+    requests-per-minute and tokens-per-minute token buckets.
+
+    Waiters are served strictly in priority order, FIFO within a lane, so a
+    bulk backlog can never starve interactive requests. A limit of 0 disables
+    that dimension.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        distributed_slots: Optional[AdvisoryLockSlots] = None
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.distributed_slots = distributed_slots
+        self._waiters: List[Tuple[int, int, asyncio.Future, int]] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_settings(cls) -> "ClaudeRateLimiter":
+        distributed_slots = None
+        if settings.claude_limiter_backend == "postgres" and settings.claude_max_concurrency > 0:
+            distributed_slots = AdvisoryLockSlots(settings.claude_max_concurrency)
+        return cls(
+            max_concurrency=settings.claude_max_concurrency,
+            requests_per_minute=settings.claude_requests_per_minute,
+            tokens_per_minute=settings.claude_tokens_per_minute,
+            distributed_slots=distributed_slots
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future, _ in self._waiters if not future.done())
+
+    def _publish_gauges(self) -> None:
+        depths = {priority: 0 for priority in Priority}
+        for priority, _, future, _ in self._waiters:
+            if not future.done():
+                depths[Priority(priority)] += 1
+        for priority, depth in depths.items():
+            prometheus.claude_limiter_queue_depth.labels(priority.name.lower()).set(depth)
+        prometheus.claude_limiter_in_flight.set(self._in_flight)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.time_until(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.time_until(tokens))
+        return wait
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiters at the head of the queue while limits allow"""
+        self._wakeup = None
+        while self._waiters:
+            _, _, future, tokens = self._waiters[0]
+            if future.done():  # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_concurrency > 0 and self._in_flight >= self.max_concurrency:
+                break
+
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                break
+
+            heapq.heappop(self._waiters)
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None:
+                self.tokens.consume(tokens)
+            self._in_flight += 1
+            future.set_result(None)
+
+        self._publish_gauges()
+
+    def _release(self, lease: Lease) -> None:
+        self._in_flight -= 1
+        if self.tokens is not None and lease.actual_tokens is not None:
+            self.tokens.adjust(lease.actual_tokens - lease.estimated_tokens)
+        if self._wakeup is None:
+            self._dispatch()
+        else:
+            self._publish_gauges()
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int, priority: Optional[Priority] = None) -> AsyncIterator[Lease]:
+        """Wait for a slot in the caller's priority lane and hold it for the duration of the block"""
+        if priority is None:
+            priority = _current_priority.get()
+
+        queued_at = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future, estimated_tokens))
+        if self._wakeup is None:
+            self._dispatch()
+
+        lease = Lease(estimated_tokens)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled - give the slot back
+                self._release(lease)
+            else:
+                self._publish_gauges()
+            raise
+
+        lock = None
+        try:
+            if self.distributed_slots is not None:
+                lock = await self.distributed_slots.acquire()
+            waited = time.perf_counter() - queued_at
+            prometheus.claude_limiter_wait.labels(priority.name.lower()).observe(waited)
+            yield lease
+        finally:
+            if lock is not None:
+                try:
+                    await self.distributed_slots.release(*lock)
+                except Exception as e:
+                    logger.error(f"Failed to release Claude advisory lock slot {lock[1]}: {e}")
+            self._release(lease)
+
+claude_rate_limiter = ClaudeRateLimiter.from_settings()
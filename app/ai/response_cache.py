@@ -0,0 +1,132 @@
+import asyncio
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+class CacheBackend(ABC):
+    """Storage interface for cached Claude responses"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        ...
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache with TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache: TTLCache[str] = TTLCache(max_entries, ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+class SQLiteCacheBackend(CacheBackend):
+    """On-disk cache shared by all workers on a host; survives restarts"""
+
+    def __init__(self, path: Path, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+class ResponseCache:
+    """
+    Opt-in, content-addressed cache in front of Claude calls.
+    Keys are a SHA-256 of the full request payload (model, system prompt,
+    messages and sampling parameters), so any prompt change is a miss.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], agents: Set[str]):
+        self.backend = backend
+        self.agents = agents
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        if not settings.claude_cache_enabled:
+            return cls(None, set())
+
+        if settings.claude_cache_backend == "sqlite":
+            path = Path(settings.storage_path) / "cache" / "claude_responses.sqlite3"
+            backend: CacheBackend = SQLiteCacheBackend(path, settings.claude_cache_ttl)
+        else:
+            backend = MemoryCacheBackend(settings.claude_cache_max_entries, settings.claude_cache_ttl)
+
+        agents = {agent.strip() for agent in settings.claude_cache_agents.split(",") if agent.strip()}
+        return cls(backend, agents)
+
+    def enabled_for(self, agent: str) -> bool:
+        return self.backend is not None and agent in self.agents
+
+    @staticmethod
+    def key_for(payload: Dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(self, agent: str, key: str) -> Optional[str]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {agent}: {e}")
+            value = None
+        prometheus.claude_cache_requests_total.labels(agent, "hit" if value is not None else "miss").inc()
+        return value
+
+    async def set(self, agent: str, key: str, value: str) -> None:
+        try:
+            await self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {agent}: {e}")
+
+response_cache = ResponseCache.from_settings()
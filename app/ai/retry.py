@@ -0,0 +1,138 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+import httpx
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 429 = rate limited, 529 = Anthropic overloaded, 5xx = transient upstream failures
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+class ClaudeAPIError(Exception):
+    """Non-200 response from the Claude API"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RetryPolicy:
+    """
+    Async retry policy with full-jitter exponential backoff.
+    Honours Retry-After, never retries fatal errors (e.g. 4xx auth failures)
+    and gives up once the overall deadline budget would be exceeded.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        deadline: float
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=settings.claude_max_retries,
+            base_delay=settings.claude_retry_base_delay,
+            max_delay=settings.claude_retry_max_delay,
+            deadline=settings.claude_retry_deadline
+        )
+
+    @staticmethod
+    def is_retryable_status(status_code: int) -> bool:
+        return status_code in RETRYABLE_STATUS_CODES
+
+    @staticmethod
+    def classify(error: Exception) -> Optional[str]:
+        """Return a retry reason for transient errors, or None if the error is fatal"""
+        if isinstance(error, ClaudeAPIError):
+            return f"status_{error.status_code}" if error.retryable else None
+        if isinstance(error, httpx.TimeoutException):
+            return "timeout"
+        if isinstance(error, httpx.TransportError):
+            return "transport"
+        return None
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt (attempt is zero-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            # The server knows best - never retry earlier than it asked
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        operation: Callable[[int, float], Awaitable[T]],
+        name: str = "operation",
+        agent: str = "default"
+    ) -> T:
+        """Run `operation(attempt, remaining_seconds)` until it succeeds or retries are exhausted"""
+        deadline_at = time.monotonic() + self.deadline
+
+        for attempt in range(self.max_attempts):
+            remaining = deadline_at - time.monotonic()
+            try:
+                return await operation(attempt, remaining)
+            except Exception as e:
+                reason = self.classify(e)
+                if reason is None:
+                    prometheus.claude_failures_total.labels(agent, "fatal").inc()
+                    logger.error(f"{name} failed with non-retryable error: {e}")
+                    raise
+
+                if attempt == self.max_attempts - 1:
+                    prometheus.claude_failures_total.labels(agent, "exhausted").inc()
+                    logger.error(f"{name} failed after {self.max_attempts} attempts: {e}")
+                    raise
+
+                delay = self.backoff(attempt, getattr(e, "retry_after", None))
+                remaining = deadline_at - time.monotonic()
+                if delay >= remaining:
+                    prometheus.claude_failures_total.labels(agent, "deadline").inc()
+                    logger.error(f"{name} retry budget exhausted ({self.deadline}s deadline): {e}")
+                    raise
+
+                prometheus.claude_retries_total.labels(agent, reason).inc()
+                logger.warning(f"{name} attempt {attempt + 1} failed ({reason}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        raise RuntimeError(f"{name} failed after all retries")
@@ -1,46 +1,23 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import get_db
-from app.models.product import Product
-from app.models.generation_job import GenerationJob
-from app.models.upload_task import UploadTask
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.core.enums import ProductStatus, JobStatus, UploadTaskStatus
 from app.core.responses import success
-from app.utils.logger import logger
+from app.services.dashboard_counters import get_status_counts, reconcile_dashboard_counters
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.get("/stats")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics with real data"""
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
+    """Get dashboard statistics from the maintained status counters"""
     try:
-        # Product counts by status
-        product_stats = db.query(
-            Product.status, func.count(Product.id)
-        ).group_by(Product.status).all()
-        
-        products_by_status = {status.value: 0 for status in ProductStatus}
-        for status, count in product_stats:
-            products_by_status[status.value] = count
-        
-        # Generation job counts by status
-        job_stats = db.query(
-            GenerationJob.status, func.count(GenerationJob.id)
-        ).group_by(GenerationJob.status).all()
-        
-        jobs_by_status = {status.value: 0 for status in JobStatus}
-        for status, count in job_stats:
-            jobs_by_status[status.value] = count
-        
-        # Upload task counts by status
-        task_stats = db.query(
-            UploadTask.status, func.count(UploadTask.id)
-        ).group_by(UploadTask.status).all()
-        
-        tasks_by_status = {status.value: 0 for status in UploadTaskStatus}
-        for status, count in task_stats:
-            tasks_by_status[status.value] = count
+        counts = await db.run_sync(get_status_counts)
+        products_by_status = counts["products"]
+        jobs_by_status = counts["generation_jobs"]
+        tasks_by_status = counts["upload_tasks"]
         
         # Total counts
         total_products = sum(products_by_status.values())
@@ -56,7 +33,7 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
             "tasks_by_status": tasks_by_status
         }
         
-        logger.info(f"Dashboard stats retrieved: {total_products} products, {total_jobs} jobs, {total_tasks} tasks")
+        logger.info("Dashboard stats retrieved: %s products, %s jobs, %s tasks", total_products, total_jobs, total_tasks)
         return success("Dashboard stats retrieved", stats)
         
     except Exception as e:
@@ -71,16 +48,13 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
         })
 
 @router.get("/summary")
-async def get_dashboard_summary(db: Session = Depends(get_db)):
+async def get_dashboard_summary(db: AsyncSession = Depends(get_async_db)):
     """Get lightweight dashboard summary"""
     try:
-        total_products = db.query(func.count(Product.id)).scalar() or 0
-        active_jobs = db.query(func.count(GenerationJob.id)).filter(
-            GenerationJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
-        ).scalar() or 0
-        pending_tasks = db.query(func.count(UploadTask.id)).filter(
-            UploadTask.status == UploadTaskStatus.PENDING
-        ).scalar() or 0
+        counts = await db.run_sync(get_status_counts)
+        total_products = sum(counts["products"].values())
+        active_jobs = counts["generation_jobs"][JobStatus.PENDING.value] + counts["generation_jobs"][JobStatus.RUNNING.value]
+        pending_tasks = counts["upload_tasks"][UploadTaskStatus.PENDING.value]
         
         summary = {
             "total_products": total_products,
@@ -88,7 +62,7 @@ async def get_dashboard_summary(db: Session = Depends(get_db)):
             "pending_tasks": pending_tasks
         }
         
-        logger.info(f"Dashboard summary: {total_products} products, {active_jobs} active jobs, {pending_tasks} pending tasks")
+        logger.info("Dashboard summary: %s products, %s active jobs, %s pending tasks", total_products, active_jobs, pending_tasks)
         return success("Dashboard summary retrieved", summary)
         
     except Exception as e:
@@ -97,4 +71,20 @@ async def get_dashboard_summary(db: Session = Depends(get_db)):
             "total_products": 0,
             "active_jobs": 0,
             "pending_tasks": 0
-        })
\ No newline at end of file
+        })
+
+@router.post("/reconcile")
+async def reconcile_dashboard(db: AsyncSession = Depends(get_async_db)):
+    """Recompute dashboard counters from the source tables (repair after drift)"""
+    try:
+        corrected = await db.run_sync(reconcile_dashboard_counters)
+        if corrected is None:
+            raise HTTPException(status_code=409, detail="Dashboard reconciliation already in progress")
+        
+        logger.info("Dashboard counters reconciled: %s corrected", corrected)
+        return success("Dashboard counters reconciled", {"corrected": corrected})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reconciling dashboard counters: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,40 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from app.db.session import get_db
-from app.schemas.generate import GenerateProductRequest, GenerateProductResponse
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.schemas.generate import (
+    GenerateProductRequest,
+    GenerateProductResponse,
+    GenerateBundleRequest,
+    GenerateBundleResponse,
+)
 from app.models.generation_job import GenerationJob
 from app.models.product import Product
-from app.models.standard import Standard
 from app.core.enums import JobType, JobStatus, ProductStatus
-from app.utils.logger import logger
-from app.utils.storage import storage_manager
-from app.utils.pdf_stub import generate_stub_pdf
-from app.utils.thumbnail_stub import generate_stub_thumbnail
+from app.utils.logger import get_logger
 from app.utils.validation import validate_positive_integer, validate_grade_level
-from app.services.job_status import update_job_progress
+from app.services.generation_worker import generation_worker
+from app.services.standards_catalog import standards_catalog
 
-# AI Agents
-from app.ai.agents.generator import generator_agent
-from app.ai.agents.qc import qc_agent
-from app.ai.agents.metadata import metadata_agent
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.post("/generate-product", response_model=GenerateProductResponse)
 async def generate_product(
     request: GenerateProductRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate product endpoint with full AI agent orchestration"""
+    """Create a generation job and queue it for the background worker"""
     
     # Validate input fields using standardized validators
     validate_positive_integer(request.standard_id, "standard_id")
     validate_grade_level(request.grade_level)
     
     try:
-        # Get standard information for AI generation
-        standard = db.query(Standard).filter(Standard.id == request.standard_id).first()
+        # Validate the standard against the in-memory catalogue
+        await standards_catalog.ensure_fresh()
+        standard = await db.run_sync(standards_catalog.get, request.standard_id)
         if not standard:
             raise HTTPException(status_code=404, detail="Standard not found")
         
@@ -53,7 +55,7 @@ async def generate_product(
                 failed_products=0
             )
             db.add(job)
-            db.flush()  # Get job ID
+            await db.flush()  # Get job ID
             
             # Create product record
             product = Product(
@@ -66,93 +68,134 @@ async def generate_product(
                 grade_level=request.grade_level
             )
             db.add(product)
-            db.flush()  # Get product ID
+            await db.flush()  # Get product ID
             
-            # Create storage structure and stub files
-            try:
-                storage_manager.create_stub_files(product.id)
-                generate_stub_pdf(product.id, request.product_type.value)
-                generate_stub_thumbnail(product.id, request.product_type.value)
-            except Exception as storage_error:
-                logger.warning(f"Storage setup failed for product {product.id}: {storage_error}")
-                # Continue - storage issues shouldn't fail the entire operation
-            
-            db.commit()
+            # No files yet: the worker writes the JSON artifacts as each agent finishes,
+            # and the PDF and thumbnails are rendered once the product is GENERATED
+            await db.commit()
         except Exception as db_error:
-            db.rollback()
+            await db.rollback()
             raise db_error
         
-        # AI Agent Orchestration (Sequential)
-        try:
-            logger.info(f"Starting AI generation for product {product.id}")
-            
-            # Step 1: Generate Content
-            content = await generator_agent.generate_content(
-                product_id=product.id,
-                product_type=request.product_type.value,
-                standard=standard.description or standard.code,
-                grade_level=request.grade_level,
-                curriculum=request.curriculum_board.value
-            )
-            
-            # Step 2: Quality Control
-            qc_result = await qc_agent.evaluate_content(
-                product_id=product.id,
-                product_type=request.product_type.value,
-                content=content,
-                standard=standard.description or standard.code,
-                grade_level=request.grade_level
-            )
-            
-            # Step 3: Generate Metadata
-            metadata = await metadata_agent.generate_metadata(
-                product_id=product.id,
-                product_type=request.product_type.value,
-                content=content,
-                standard=standard.description or standard.code,
-                grade_level=request.grade_level,
-                curriculum=request.curriculum_board.value
-            )
-            
-            # Update product status based on QC result
-            if qc_result['verdict'] == 'PASS':
-                product.status = ProductStatus.GENERATED
-                logger.info(f"Product {product.id} generated successfully (QC: {qc_result['score']}%)")
-            else:
-                product.status = ProductStatus.FAILED
-                logger.warning(f"Product {product.id} failed QC: {qc_result['verdict']} (score: {qc_result['score']}%)")
-            
-            db.commit()
-            
-            # Update job progress
-            update_job_progress(db, job.id, product.id, product.status)
-            
-        except Exception as ai_error:
-            logger.error(f"AI generation failed for product {product.id}: {ai_error}")
-            # Mark product as failed
-            product.status = ProductStatus.FAILED
-            db.commit()
-            update_job_progress(db, job.id, product.id, ProductStatus.FAILED)
-            
+        # Hand off to the background worker - clients poll /api/v1/generation-jobs/{id}/summary
+        generation_worker.notify()
+        
         logger.info(
-            f"Generated job {job.id} with product {product.id}: "
+            f"Queued job {job.id} with product {product.id}: "
             f"{request.product_type.value} for standard {request.standard_id} "
-            f"(Grade {request.grade_level}, {request.curriculum_board.value}) - Status: {product.status.value}"
+            f"(Grade {request.grade_level}, {request.curriculum_board.value})"
         )
         
         return GenerateProductResponse(
             job_id=job.id,
             product_ids=[product.id],
-            message=f"Product generation completed for {request.product_type.value} - Status: {product.status.value}"
+            message=f"Product generation queued for {request.product_type.value} - Status: {job.status.value}"
         )
         
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error in generate_product: {e}")
         raise HTTPException(status_code=500, detail="Failed to create generation job")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error in generate_product: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/generate-bundle", response_model=GenerateBundleResponse)
+async def generate_bundle(
+    request: GenerateBundleRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a FULL_BUNDLE job for standards × product types and queue it for the background worker"""
+    
+    if request.grade_level is not None:
+        validate_grade_level(request.grade_level)
+    
+    try:
+        await standards_catalog.ensure_fresh()
+        # Resolve standards - explicit IDs or a curriculum/grade filter
+        if request.standard_ids:
+            standard_ids = list(dict.fromkeys(request.standard_ids))
+            standards = await db.run_sync(
+                lambda session: [std for std in (standards_catalog.get(session, std_id) for std_id in standard_ids) if std]
+            )
+            missing = set(standard_ids) - {std.id for std in standards}
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Standards not found: {sorted(missing)}")
+        else:
+            standards = await db.run_sync(standards_catalog.filter, request.curriculum_board, request.grade_level, request.locale)
+            if not standards:
+                raise HTTPException(status_code=404, detail="No standards match the requested filters")
+        
+        product_types = list(dict.fromkeys(request.product_types))
+        total_products = len(standards) * len(product_types)
+        if total_products > settings.bundle_max_products:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Bundle would create {total_products} products (limit {settings.bundle_max_products})"
+            )
+        
+        try:
+            # A bundle spans many standards; the job row records the first as its anchor
+            job = GenerationJob(
+                standard_id=standards[0].id,
+                locale=request.locale,
+                curriculum_board=request.curriculum_board,
+                grade_level=request.grade_level or standards[0].grade_level,
+                job_type=JobType.FULL_BUNDLE,
+                status=JobStatus.PENDING,
+                total_products=total_products,
+                completed_products=0,
+                failed_products=0
+            )
+            db.add(job)
+            await db.flush()  # Get job ID
+            
+            # One multi-row INSERT for every product in the bundle
+            await db.execute(insert(Product), [
+                {
+                    "standard_id": std.id,
+                    "generation_job_id": job.id,
+                    "product_type": product_type,
+                    "status": ProductStatus.DRAFT,
+                    "locale": std.locale,
+                    "curriculum_board": std.curriculum_board,
+                    "grade_level": std.grade_level
+                }
+                for std in standards
+                for product_type in product_types
+            ])
+            
+            job_id = job.id
+            await db.commit()
+        except Exception as db_error:
+            await db.rollback()
+            raise db_error
+        
+        generation_worker.notify()
+        
+        logger.info(
+            f"Queued bundle job {job_id}: {len(standards)} standards × {len(product_types)} product types "
+            f"= {total_products} products ({request.curriculum_board.value})"
+        )
+        
+        return GenerateBundleResponse(
+            job_id=job_id,
+            standard_count=len(standards),
+            total_products=total_products,
+            message=f"Bundle generation queued for {total_products} products"
+        )
+        
+    except HTTPException:
+        raise
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Database error in generate_bundle: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create bundle job")
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Unexpected error in generate_bundle: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,27 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.generate import GenerateProductRequest, GenerateProductResponse
 from app.models.generation_job import GenerationJob
 from app.models.product import Product
 from app.models.standard import Standard
 from app.core.enums import JobType, JobStatus, ProductStatus
 from app.core.responses import success
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.post("/generate-product")
 async def generate_product(
     request: GenerateProductRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate product endpoint - simplified version"""
     
     try:
         # Validate standard exists
-        standard = db.query(Standard).filter(Standard.id == request.standard_id).first()
+        standard = await db.get(Standard, request.standard_id)
         if not standard:
             raise HTTPException(status_code=404, detail="Standard not found")
         
@@ -39,7 +41,7 @@ async def generate_product(
             status=JobStatus.PENDING
         )
         db.add(job)
-        db.flush()  # Get job ID
+        await db.flush()  # Get job ID
         
         # Create product record
         product = Product(
@@ -52,9 +54,9 @@ async def generate_product(
             grade_level=request.grade_level
         )
         db.add(product)
-        db.flush()  # Get product ID
+        await db.flush()  # Get product ID
         
-        db.commit()
+        await db.commit()
         
         logger.info(
             f"Created job {job.id} with product {product.id}: "
@@ -74,10 +76,10 @@ async def generate_product(
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error in generate_product: {e}")
         raise HTTPException(status_code=500, detail="Failed to create generation job")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error in generate_product: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
@@ -1,23 +1,34 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.repositories.generation_jobs import GenerationJobRepository
 from app.schemas.generation_job import GenerationJobRead, GenerationJobCreate
 from app.core.enums import JobStatus, JobType, Locale, CurriculumBoard
+from app.core.config import settings
 from app.core.responses import success
-from app.utils.pagination import PaginationParams, paginate_query
-from app.utils.logger import logger
+from app.services.job_events import job_event_bus
+from app.services.job_status import get_job_snapshot, reconcile_job_progress
+from app.services.zip_export import export_entries, zip_response
+from app.utils.http_cache import is_not_modified, make_etag, not_modified, set_validators
+from app.utils.pagination import PaginationParams, paginate_query, pagination_params
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.post("/")
-async def create_generation_job(job: GenerationJobCreate, db: Session = Depends(get_db)):
+async def create_generation_job(job: GenerationJobCreate, db: AsyncSession = Depends(get_async_db)):
     """Create new generation job"""
     try:
         repo = GenerationJobRepository(db)
-        db_job = repo.create(job)
-        logger.info(f"Created generation job: {db_job.job_type} for standard {db_job.standard_id} (ID: {db_job.id})")
+        db_job = await repo.create(job)
+        logger.info("Created generation job: %s for standard %s (ID: %s)", db_job.job_type, db_job.standard_id, db_job.id)
         return success("Generation job created successfully", GenerationJobRead.model_validate(db_job))
     except Exception as e:
         logger.error(f"Error creating generation job: {e}")
@@ -30,17 +41,15 @@ async def list_generation_jobs(
     curriculum_board: Optional[CurriculumBoard] = Query(None),
     grade_level: Optional[int] = Query(None),
     locale: Optional[Locale] = Query(None),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all generation jobs with optional filtering and pagination"""
     try:
         repo = GenerationJobRepository(db)
         query = repo.get_all(status, curriculum_board, grade_level, locale, job_type)
         
-        pagination_params = PaginationParams(limit=limit, offset=offset)
-        paginated_result = paginate_query(query, pagination_params)
+        paginated_result = await paginate_query(db, query, pagination)
         
         jobs_data = [GenerationJobRead.model_validate(job) for job in paginated_result.items]
         
@@ -50,32 +59,32 @@ async def list_generation_jobs(
                 "total": paginated_result.total,
                 "limit": paginated_result.limit,
                 "offset": paginated_result.offset,
-                "has_next": paginated_result.has_next
+                "has_next": paginated_result.has_next,
+                "next_cursor": paginated_result.next_cursor
             }
         })
     except Exception as e:
         logger.error(f"Error listing generation jobs: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _job_etag(job: GenerationJobRead, view: str) -> str:
+    return make_etag(view, job.id, job.status.value, job.total_products, job.completed_products, job.failed_products, job.updated_at.isoformat())
+
 @router.get("/{job_id}/summary")
-async def get_generation_job_summary(job_id: int, db: Session = Depends(get_db)):
-    """Get lightweight job summary for frontend status panels"""
+async def get_generation_job_summary(job_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Get lightweight job summary for frontend status panels (supports conditional GET)"""
     if job_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid job ID")
         
     try:
-        repo = GenerationJobRepository(db)
-        job = repo.get_by_id(job_id)
+        job = await db.run_sync(get_job_snapshot, job_id)
         
         if not job:
             raise HTTPException(status_code=404, detail="Generation job not found")
         
-        # Update job counts from products before returning
-        from app.services.job_status import update_job_status
-        update_job_status(db, job_id)
-        
-        # Refresh job to get updated counts
-        db.refresh(job)
+        etag = _job_etag(job, "summary")
+        if is_not_modified(request, etag, job.updated_at):
+            return not_modified(etag, job.updated_at)
         
         summary = {
             "job_id": job.id,
@@ -86,7 +95,7 @@ async def get_generation_job_summary(job_id: int, db: Session = Depends(get_db))
             "created_at": job.created_at
         }
         
-        logger.info(f"Retrieved job {job_id} summary: {job.completed_products}/{job.total_products} completed")
+        set_validators(response, etag, job.updated_at)
         return success("Job summary retrieved successfully", summary)
     except HTTPException:
         raise
@@ -94,30 +103,122 @@ async def get_generation_job_summary(job_id: int, db: Session = Depends(get_db))
         logger.error(f"Error getting job {job_id} summary: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+@router.get("/{job_id}/events")
+async def stream_generation_job_events(job_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Stream live job progress as Server-Sent Events until the job completes"""
+    if job_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    
+    # Subscribe before reading fresh state so no event falls between the two
+    queue = job_event_bus.subscribe(job_id)
+    try:
+        db_job = await GenerationJobRepository(db).get_by_id(job_id)
+        job = GenerationJobRead.model_validate(db_job) if db_job else None
+    except Exception as e:
+        job_event_bus.unsubscribe(job_id, queue)
+        logger.error(f"Error opening event stream for job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        # Don't pin a pooled connection for the lifetime of the stream
+        await db.close()
+    
+    if not job:
+        job_event_bus.unsubscribe(job_id, queue)
+        raise HTTPException(status_code=404, detail="Generation job not found")
+    
+    async def event_stream():
+        try:
+            progress = {
+                "job_id": job.id,
+                "status": job.status,
+                "total_products": job.total_products,
+                "completed_products": job.completed_products,
+                "failed_products": job.failed_products
+            }
+            yield _sse("job_progress", {"type": "job_progress", **progress})
+            if job.status == JobStatus.COMPLETED:
+                yield _sse("job_completed", {"type": "job_completed", **progress})
+                return
+            
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.job_events_keepalive)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield _sse(event["type"], event)
+                if event["type"] == "job_completed":
+                    return
+        finally:
+            job_event_bus.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{job_id}")
-async def get_generation_job(job_id: int, db: Session = Depends(get_db)):
-    """Get specific job details and progress"""
+async def get_generation_job(job_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Get specific job details and progress (supports conditional GET)"""
     if job_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid job ID")
         
     try:
-        repo = GenerationJobRepository(db)
-        job = repo.get_by_id(job_id)
+        job = await db.run_sync(get_job_snapshot, job_id)
         
         if not job:
             raise HTTPException(status_code=404, detail="Generation job not found")
         
-        # Update job counts from products before returning
-        from app.services.job_status import update_job_status
-        update_job_status(db, job_id)
-        
-        # Refresh job to get updated counts
-        db.refresh(job)
+        etag = _job_etag(job, "detail")
+        if is_not_modified(request, etag, job.updated_at):
+            return not_modified(etag, job.updated_at)
         
-        logger.info(f"Retrieved job {job_id}: {job.completed_products}/{job.total_products} completed")
-        return success("Generation job retrieved successfully", GenerationJobRead.model_validate(job))
+        set_validators(response, etag, job.updated_at)
+        return success("Generation job retrieved successfully", job)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting generation job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/{job_id}/export")
+async def export_generation_job_zip(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Stream a ZIP of every product in the job (e.g. a FULL_BUNDLE) in constant memory"""
+    if job_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    
+    job = await GenerationJobRepository(db).get_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Generation job not found")
+    
+    logger.info("Exporting ZIP for job %s (%s products)", job_id, job.total_products)
+    return zip_response(export_entries(job_id=job_id), f"job_{job_id}_{job.job_type.value.lower()}.zip")
+
+@router.post("/{job_id}/reconcile")
+async def reconcile_generation_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Recompute job progress counters from its products (repair after manual edits)"""
+    if job_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+        
+    try:
+        repo = GenerationJobRepository(db)
+        job = await repo.get_by_id(job_id)
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Generation job not found")
+        
+        await db.run_sync(reconcile_job_progress, job_id)
+        await db.refresh(job)
+        
+        return success("Generation job reconciled", GenerationJobRead.model_validate(job))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reconciling generation job {job_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
@@ -1,18 +1,20 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.core.config import settings
-from app.db.session import get_db
-from app.utils.logger import logger
+from app.db.session import get_async_db
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.get("/health")
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Enhanced health check endpoint with service info and DB connectivity"""
     try:
         # Test database connectivity
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -26,5 +28,5 @@ def health_check(db: Session = Depends(get_db)):
         "database": db_status
     }
     
-    logger.info(f"Health check: {health_info['status']} (DB: {db_status})")
+    logger.info("Health check: %s (DB: %s)", health_info['status'], db_status)
     return health_info
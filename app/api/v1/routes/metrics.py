@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Response
+from app.core.responses import success
+from app.db.pool_metrics import pool_status
+from app.db.session import async_engine, engine
+from app.utils.prometheus import render_latest, snapshot
+
+router = APIRouter()
+# Mounted at the application root - Prometheus scrapes /metrics
+exposition_router = APIRouter()
+
+@exposition_router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition (all worker processes in multiprocess mode)"""
+    # Sync on purpose: multiprocess collection reads every worker's files, so it runs in the threadpool
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
+
+@router.get("/")
+def get_metrics():
+    """The /metrics series as JSON (all worker processes in multiprocess mode)"""
+    return success("Metrics retrieved", snapshot())
+
+@router.get("/pool")
+def get_pool_metrics():
+    """Live connection pool occupancy plus the rbb_db_* checkout wait / hold-time series"""
+    return success("Pool metrics retrieved", {
+        "pools": {
+            "async": pool_status(async_engine.sync_engine.pool),
+            "sync": pool_status(engine.pool)
+        },
+        "metrics": snapshot("rbb_db_")
+    })
@@ -1,28 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from pathlib import Path
-import json
-from app.db.session import get_db
+import asyncio
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.repositories.file_artifacts import FileArtifactRepository
 from app.repositories.products import ProductRepository
+from app.schemas.file_artifact import FileArtifactRead
 from app.schemas.product import ProductRead, ProductCreate
-from app.core.enums import Locale, CurriculumBoard, ProductType, ProductStatus
+from app.core.enums import Locale, CurriculumBoard, FileType, ProductType, ProductStatus
 from app.core.responses import success
-from app.utils.pagination import PaginationParams, paginate_query
-from app.utils.logger import logger
+from app.utils.http_cache import is_not_modified, make_etag, not_modified
+from app.utils.pagination import PaginationParams, paginate_query, pagination_params
+from app.utils.logger import get_logger
 from app.utils.storage import storage_manager
-from app.utils.pdf_generator import pdf_generator
+from app.services.batch_render import batch_renderer
+from app.services.generation_worker import generation_worker
+from app.services.job_status import transition_product_status
+from app.services.pdf_render import pdf_render_service
+from app.services.render_errors import RenderQueueFull
+from app.services.thumbnail_render import thumbnail_service
+from app.services.zip_export import export_entries, zip_response
+from app.utils.thumbnails import THUMBNAIL_SIZES, thumbnail_path
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+MAX_MANIFEST_PRODUCTS = 500
+
 @router.post("/")
-async def create_product(product: ProductCreate, db: Session = Depends(get_db)):
+async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
     """Create new product"""
     try:
         repo = ProductRepository(db)
-        db_product = repo.create(product)
-        logger.info(f"Created product: {db_product.product_type} for standard {db_product.standard_id} (ID: {db_product.id})")
+        db_product = await repo.create(product)
+        logger.info("Created product: %s for standard %s (ID: %s)", db_product.product_type, db_product.standard_id, db_product.id)
         return success("Product created successfully", ProductRead.model_validate(db_product))
     except Exception as e:
         logger.error(f"Error creating product: {e}")
@@ -37,20 +52,15 @@ async def list_products(
     curriculum_board: Optional[CurriculumBoard] = Query(None),
     grade_level: Optional[int] = Query(None),
     locale: Optional[Locale] = Query(None),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all products with filtering and pagination (newest first)"""
     try:
         repo = ProductRepository(db)
         query = repo.get_all(status, product_type, generation_job_id, standard_id, curriculum_board, grade_level, locale)
         
-        # Ensure consistent ordering (newest first)
-        query = query.order_by(repo.model.created_at.desc())
-        
-        pagination_params = PaginationParams(limit=limit, offset=offset)
-        paginated_result = paginate_query(query, pagination_params)
+        paginated_result = await paginate_query(db, query, pagination)
         
         products_data = [ProductRead.model_validate(product) for product in paginated_result.items]
         
@@ -62,7 +72,7 @@ async def list_products(
         if standard_id: filters_applied.append(f"standard_id={standard_id}")
         
         filter_str = ", ".join(filters_applied) if filters_applied else "no filters"
-        logger.info(f"Listed {len(products_data)} products (total: {paginated_result.total}) with {filter_str}")
+        logger.info("Listed %s products (total: %s) with %s", len(products_data), paginated_result.total, filter_str)
         
         return success("Products retrieved successfully", {
             "products": products_data,
@@ -70,27 +80,65 @@ async def list_products(
                 "total": paginated_result.total,
                 "limit": paginated_result.limit,
                 "offset": paginated_result.offset,
-                "has_next": paginated_result.has_next
+                "has_next": paginated_result.has_next,
+                "next_cursor": paginated_result.next_cursor
             }
         })
     except Exception as e:
         logger.error(f"Error listing products: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/pdfs/prerender")
+async def start_pdf_prerender(limit: Optional[int] = Query(None, ge=1)):
+    """Pre-render PDFs for every GENERATED product missing one, in the background"""
+    started = batch_renderer.start_background(workers=settings.pdf_batch_workers or None, limit=limit)
+    if not started:
+        raise HTTPException(status_code=409, detail="A PDF pre-render is already running")
+    logger.info("Started PDF pre-render job (limit: %s)", limit)
+    return success("PDF pre-render started", {"running": True})
+
+@router.get("/pdfs/prerender")
+async def get_pdf_prerender_status():
+    """Progress of the current (or last) PDF pre-render job"""
+    summary = batch_renderer.current
+    return success("PDF pre-render status", {
+        "running": batch_renderer.running,
+        "summary": summary.as_dict() if summary else None
+    })
+
+@router.get("/artifacts")
+async def get_artifact_manifests(
+    ids: List[int] = Query(..., description="Product IDs (repeat the parameter for each)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Artifact manifests for many products in one query"""
+    if len(ids) > MAX_MANIFEST_PRODUCTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_MANIFEST_PRODUCTS} products per request")
+    
+    try:
+        manifests = await FileArtifactRepository(db).get_manifests(ids)
+        return success("Artifact manifests retrieved", {
+            str(product_id): [FileArtifactRead.model_validate(artifact) for artifact in artifacts]
+            for product_id, artifacts in manifests.items()
+        })
+    except Exception as e:
+        logger.error(f"Error getting artifact manifests: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/{product_id}")
-async def get_product(product_id: int, db: Session = Depends(get_db)):
+async def get_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific product details"""
     if product_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid product ID")
         
     try:
         repo = ProductRepository(db)
-        product = repo.get_by_id(product_id)
+        product = await repo.get_by_id(product_id)
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
             
-        logger.info(f"Retrieved product {product_id}")
+        logger.info("Retrieved product %s", product_id)
         return success("Product retrieved successfully", ProductRead.model_validate(product))
         
     except HTTPException:
@@ -100,29 +148,27 @@ async def get_product(product_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{product_id}/content")
-async def get_product_content(product_id: int, db: Session = Depends(get_db)):
+async def get_product_content(product_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get the actual generated content for a product"""
     if product_id <= 0:
         raise HTTPException(status_code=400, detail="Invalid product ID")
         
     try:
         repo = ProductRepository(db)
-        product = repo.get_by_id(product_id)
+        product = await repo.get_by_id(product_id)
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        # Load content from raw.json
-        product_path = storage_manager.get_product_path(product_id)
-        raw_json_path = product_path / "raw.json"
-        
-        if not raw_json_path.exists():
+        # Resolve raw.json from the artifact index
+        artifacts = await FileArtifactRepository(db).get_by_types(product_id, FileType.RAW_JSON)
+        raw_artifact = artifacts.get(FileType.RAW_JSON)
+        if raw_artifact is None:
             raise HTTPException(status_code=404, detail="Product content not found")
         
-        with open(raw_json_path, 'r') as f:
-            content_data = json.load(f)
+        content_data = await asyncio.to_thread(storage_manager.read_json, raw_artifact.file_path)
         
-        logger.info(f"Retrieved content for product {product_id}")
+        logger.info("Retrieved content for product %s", product_id)
         return success("Product content retrieved successfully", content_data)
         
     except HTTPException:
@@ -132,11 +178,11 @@ async def get_product_content(product_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{product_id}/download/pdf")
-async def download_product_pdf(product_id: int, db: Session = Depends(get_db)):
+async def download_product_pdf(product_id: int, db: AsyncSession = Depends(get_async_db)):
     """Download product as PDF file"""
     try:
         repo = ProductRepository(db)
-        product = repo.get_by_id(product_id)
+        product = await repo.get_by_id(product_id)
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -144,26 +190,26 @@ async def download_product_pdf(product_id: int, db: Session = Depends(get_db)):
         if product.status != ProductStatus.GENERATED:
             raise HTTPException(status_code=400, detail="Product not ready for download")
         
-        # Check if PDF already exists
-        product_path = storage_manager.get_product_path(product_id)
-        pdf_path = product_path / f"worksheet_{product_id}.pdf"
+        # One index lookup for both the rendered PDF and its source content
+        artifacts = await FileArtifactRepository(db).get_by_types(product_id, FileType.PDF, FileType.RAW_JSON)
         
-        # Generate PDF if it doesn't exist
-        if not pdf_path.exists():
-            # Load content from raw.json
-            raw_json_path = product_path / "raw.json"
-            if not raw_json_path.exists():
+        if FileType.PDF in artifacts:
+            pdf_path = storage_manager.resolve(artifacts[FileType.PDF].file_path)
+        else:
+            # Render from raw.json (registers the PDF artifact)
+            raw_artifact = artifacts.get(FileType.RAW_JSON)
+            if raw_artifact is None:
                 raise HTTPException(status_code=404, detail="Product content not found")
             
-            with open(raw_json_path, 'r') as f:
-                content_data = json.load(f)
+            content_data = await asyncio.to_thread(storage_manager.read_json, raw_artifact.file_path)
             
-            # Generate PDF
-            pdf_path = pdf_generator.generate_pdf_from_content(
-                product_id, 
-                product.product_type.value, 
-                content_data
-            )
+            # Render in the process pool; concurrent downloads share one render
+            try:
+                pdf_path = await pdf_render_service.render(product_id, product.product_type.value, content_data)
+            except RenderQueueFull:
+                raise HTTPException(status_code=503, detail="PDF renderer busy, please retry", headers={"Retry-After": "5"})
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="PDF rendering timed out, please retry")
         
         # Return PDF file
         filename = f"{product.product_type.value.lower()}_{product.grade_level}_{product_id}.pdf"
@@ -178,11 +224,83 @@ async def download_product_pdf(product_id: int, db: Session = Depends(get_db)):
     except Exception as e:
         logger.error(f"Error downloading PDF for product {product_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate PDF")
+
+@router.get("/{product_id}/thumbnail")
+async def get_product_thumbnail(
+    product_id: int,
+    request: Request,
+    size: str = Query("medium", pattern=f"^({'|'.join(THUMBNAIL_SIZES)})$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Page-one PNG of the product's PDF (small/medium/large)"""
+    if product_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid product ID")
+    
+    pdf_artifact = (await FileArtifactRepository(db).get_by_types(product_id, FileType.PDF)).get(FileType.PDF)
+    if pdf_artifact is None or not pdf_artifact.checksum:
+        raise HTTPException(status_code=404, detail="Product PDF has not been rendered yet")
+    
+    # Thumbnails are addressed by the PDF's checksum, so it makes a strong validator
+    etag = make_etag("thumbnail", pdf_artifact.checksum, size)
+    cache_control = f"public, max-age={settings.thumbnail_cache_max_age}"
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control=cache_control)
+    
+    path = thumbnail_path(pdf_artifact.checksum, size)
+    if not path.is_file():
+        try:
+            paths = await thumbnail_service.render(
+                product_id, storage_manager.resolve(pdf_artifact.file_path), pdf_artifact.checksum
+            )
+        except RenderQueueFull:
+            raise HTTPException(status_code=503, detail="Thumbnail renderer busy, please retry", headers={"Retry-After": "5"})
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Thumbnail rendering timed out, please retry")
+        except Exception as e:
+            logger.error(f"Error rendering thumbnail for product {product_id}: {e}")
+            raise HTTPException(status_code=500, detail="Failed to render thumbnail")
+        path = paths[size]
+    
+    return FileResponse(path=str(path), media_type="image/png", headers={"ETag": etag, "Cache-Control": cache_control})
+
+@router.get("/{product_id}/export")
+async def export_product_zip(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Stream a ZIP of the product's JSON, PDF and thumbnails"""
+    if product_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid product ID")
+    
+    product = await ProductRepository(db).get_by_id(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    logger.info("Exporting ZIP for product %s", product_id)
+    return zip_response(export_entries(product_id=product_id), f"product_{product_id}.zip")
+
+@router.get("/{product_id}/artifacts")
+async def get_product_artifacts(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Artifact manifest (paths, sizes, checksums) for one product"""
+    if product_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid product ID")
+    
+    try:
+        product = await ProductRepository(db).get_by_id(product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        
+        artifacts = await FileArtifactRepository(db).list_for_product(product_id)
+        return success("Product artifacts retrieved", [FileArtifactRead.model_validate(artifact) for artifact in artifacts])
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving artifacts for product {product_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.patch("/{product_id}/status")
 async def update_product_status(
     product_id: int,
     status: ProductStatus,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update product status with validation and job progress tracking"""
     if product_id <= 0:
@@ -190,7 +308,7 @@ async def update_product_status(
         
     try:
         repo = ProductRepository(db)
-        product = repo.get_by_id(product_id)
+        product = await repo.get_by_id(product_id)
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -210,15 +328,26 @@ async def update_product_status(
         
         old_status = product.status
         
-        # Update product status
-        updated_product = repo.update_status(product_id, status)
+        # Update product status and its generation job counters atomically
+        transitioned = await db.run_sync(
+            lambda session: transition_product_status(session, product, status, expected_status=old_status)
+        )
+        if not transitioned:
+            raise HTTPException(status_code=409, detail="Product status changed concurrently, please retry")
+        await db.refresh(product)
+        updated_product = product
         
-        # Update associated generation job progress
-        if updated_product.generation_job_id:
-            from app.services.job_status import update_job_progress
-            update_job_progress(db, updated_product.generation_job_id, product_id, status)
+        if status == ProductStatus.DRAFT:
+            # Reopened product - let the background worker regenerate it
+            generation_worker.notify()
+        elif status == ProductStatus.GENERATED and settings.pdf_render_eager:
+            # Pre-render so the first download doesn't wait
+            artifacts = await FileArtifactRepository(db).get_by_types(product_id, FileType.RAW_JSON)
+            if FileType.RAW_JSON in artifacts:
+                content_data = await asyncio.to_thread(storage_manager.read_json, artifacts[FileType.RAW_JSON].file_path)
+                pdf_render_service.schedule(product_id, product.product_type.value, content_data)
         
-        logger.info(f"Updated product {product_id} status from {old_status.value} to {status.value}")
+        logger.info("Updated product %s status from %s to %s", product_id, old_status.value, status.value)
         
         return success("Product status updated", {
             "id": product_id, 
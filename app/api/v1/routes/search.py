@@ -0,0 +1,49 @@
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db.session import get_async_db
+from app.core.enums import CurriculumBoard, Locale, ProductType
+from app.core.responses import success
+from app.services.search import search_products, search_standards
+from app.services.standards_catalog import standards_catalog
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+class SearchType(str, Enum):
+    ALL = "all"
+    STANDARDS = "standards"
+    PRODUCTS = "products"
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search standard codes/descriptions and product metadata"),
+    type: SearchType = Query(SearchType.ALL),
+    curriculum_board: Optional[CurriculumBoard] = Query(None),
+    grade_level: Optional[int] = Query(None, ge=1, le=12),
+    locale: Optional[Locale] = Query(None, description="Standards only"),
+    product_type: Optional[ProductType] = Query(None, description="Products only"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ranked search across standards and products, paginated per result type"""
+    try:
+        results = {}
+        if type in (SearchType.ALL, SearchType.STANDARDS):
+            # Standard rows are hydrated from the catalogue inside run_sync
+            await standards_catalog.ensure_fresh()
+            page = await db.run_sync(search_standards, q, curriculum_board, grade_level, locale, limit, offset)
+            results["standards"] = page.to_dict()
+        if type in (SearchType.ALL, SearchType.PRODUCTS):
+            page = await db.run_sync(search_products, q, curriculum_board, grade_level, product_type, limit, offset)
+            results["products"] = page.to_dict()
+        
+        logger.info("Search '%s' (%s): %s", q, type.value, {name: len(page['items']) for name, page in results.items()})
+        return success("Search results retrieved", {"query": q, **results})
+    except Exception as e:
+        logger.error(f"Error searching '{q}': {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,23 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.repositories.standards import StandardRepository
 from app.schemas.standard import StandardRead, StandardCreate
 from app.core.enums import Locale, CurriculumBoard
 from app.core.responses import success
-from app.utils.pagination import PaginationParams, paginate_query
-from app.utils.logger import logger
+from app.services.standards_catalog import standards_catalog
+from app.utils.pagination import PaginationParams, paginate_query, pagination_params
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.post("/")
-async def create_standard(standard: StandardCreate, db: Session = Depends(get_db)):
+async def create_standard(standard: StandardCreate, db: AsyncSession = Depends(get_async_db)):
     """Create new educational standard"""
     try:
         repo = StandardRepository(db)
-        db_standard = repo.create(standard)
-        logger.info(f"Created standard: {db_standard.code} (ID: {db_standard.id})")
+        db_standard = await repo.create(standard)
+        standards_catalog.invalidate()
+        logger.info("Created standard: %s (ID: %s)", db_standard.code, db_standard.id)
         return success("Standard created successfully", StandardRead.model_validate(db_standard))
     except Exception as e:
         logger.error(f"Error creating standard: {e}")
@@ -28,17 +32,15 @@ async def list_standards(
     curriculum_board: Optional[CurriculumBoard] = Query(None),
     grade_level: Optional[int] = Query(None),
     locale: Optional[Locale] = Query(None),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all available standards with filtering and pagination"""
     try:
         repo = StandardRepository(db)
         query = repo.get_all(curriculum_board, grade_level, locale)
         
-        pagination_params = PaginationParams(limit=limit, offset=offset)
-        paginated_result = paginate_query(query, pagination_params)
+        paginated_result = await paginate_query(db, query, pagination)
         
         standards_data = [StandardRead.model_validate(std) for std in paginated_result.items]
         
@@ -48,53 +50,52 @@ async def list_standards(
                 "total": paginated_result.total,
                 "limit": paginated_result.limit,
                 "offset": paginated_result.offset,
-                "has_next": paginated_result.has_next
+                "has_next": paginated_result.has_next,
+                "next_cursor": paginated_result.next_cursor
             }
         })
     except Exception as e:
         logger.error(f"Error listing standards: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/{standard_id}")
-async def get_standard(standard_id: int, db: Session = Depends(get_db)):
-    """Get specific standard details"""
-    try:
-        repo = StandardRepository(db)
-        standard = repo.get_by_id(standard_id)
-        
-        if not standard:
-            raise HTTPException(status_code=404, detail="Standard not found")
-            
-        logger.info(f"Retrieved standard {standard_id}")
-        return success("Standard retrieved successfully", StandardRead.model_validate(standard))
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting standard {standard_id}: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+# Registered before /{standard_id}, which would otherwise capture "lookup"
 @router.get("/lookup")
 async def lookup_standards(
+    q: Optional[str] = Query(None, description="Search standard code and description"),
     code: Optional[str] = Query(None, description="Search by standard code"),
     grade_level: Optional[int] = Query(None, ge=1, le=12),
     curriculum_board: Optional[CurriculumBoard] = Query(None),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Lightweight standards lookup for Quick Generate flow"""
+    """Lightweight standards lookup for Quick Generate flow (served from the in-memory catalogue)"""
     try:
-        repo = StandardRepository(db)
-        query = repo.get_all(curriculum_board, grade_level, None)
-        
-        if code:
-            query = query.filter(repo.model.code.ilike(f"%{code}%"))
-        
-        standards = query.limit(limit).all()
+        await standards_catalog.ensure_fresh()
+        standards = await db.run_sync(standards_catalog.search, q or code, curriculum_board, grade_level, None, limit)
         
         return success("Standards found", {
-            "standards": [StandardRead.model_validate(std) for std in standards],
+            "standards": standards,
             "count": len(standards)
         })
     except Exception as e:
         logger.error(f"Error in standards lookup: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/{standard_id}")
+async def get_standard(standard_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get specific standard details"""
+    try:
+        await standards_catalog.ensure_fresh()
+        standard = await db.run_sync(standards_catalog.get, standard_id)
+        
+        if not standard:
+            raise HTTPException(status_code=404, detail="Standard not found")
+            
+        logger.info("Retrieved standard %s", standard_id)
+        return success("Standard retrieved successfully", standard)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting standard {standard_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
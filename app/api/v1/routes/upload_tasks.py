@@ -1,26 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.upload_task import UploadTaskRead, UploadTaskCreate, UploadTaskUpdate
 from app.models.upload_task import UploadTask
 from app.core.enums import UploadTaskStatus
 from app.core.responses import success, error
-from app.utils.logger import logger
+from app.utils.pagination import PaginationParams, paginate_query, pagination_params
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 @router.post("/", response_model=UploadTaskRead)
 async def create_upload_task(
     task: UploadTaskCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create new upload task with product validation"""
     try:
         # Validate product exists
         from app.models.product import Product
-        product = db.query(Product).filter(Product.id == task.product_id).first()
+        product = await db.get(Product, task.product_id)
         if not product:
             raise HTTPException(status_code=404, detail=f"Product {task.product_id} not found")
         
@@ -30,16 +34,16 @@ async def create_upload_task(
             assigned_to=task.assigned_to
         )
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
         
-        logger.info(f"Created upload task {db_task.id} for product {task.product_id} (type: {product.product_type.value})")
+        logger.info("Created upload task %s for product %s (type: %s)", db_task.id, task.product_id, product.product_type.value)
         return db_task
         
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error creating upload task: {e}")
         raise HTTPException(status_code=500, detail="Failed to create upload task")
     except Exception as e:
@@ -51,26 +55,25 @@ async def list_upload_tasks(
     status: Optional[UploadTaskStatus] = Query(None),
     assigned_to: Optional[str] = Query(None),
     product_id: Optional[int] = Query(None),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    pagination: PaginationParams = Depends(pagination_params),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List upload tasks with enhanced filtering and product context"""
     try:
         from app.models.product import Product
         
         # Join with Product for better context
-        query = db.query(UploadTask).join(Product, UploadTask.product_id == Product.id)
+        query = select(UploadTask).join(Product, UploadTask.product_id == Product.id)
         
         if status:
-            query = query.filter(UploadTask.status == status)
+            query = query.where(UploadTask.status == status)
         if assigned_to:
-            query = query.filter(UploadTask.assigned_to == assigned_to)
+            query = query.where(UploadTask.assigned_to == assigned_to)
         if product_id:
-            query = query.filter(UploadTask.product_id == product_id)
+            query = query.where(UploadTask.product_id == product_id)
         
-        total = query.count()
-        tasks = query.order_by(UploadTask.created_at.desc()).offset(offset).limit(limit).all()
+        paginated_result = await paginate_query(db, query, pagination)
+        tasks = paginated_result.items
         
         # Log filtering info
         filters_applied = []
@@ -79,15 +82,16 @@ async def list_upload_tasks(
         if product_id: filters_applied.append(f"product_id={product_id}")
         
         filter_str = ", ".join(filters_applied) if filters_applied else "no filters"
-        logger.info(f"Listed {len(tasks)} upload tasks (total: {total}) with {filter_str}")
+        logger.info("Listed %s upload tasks (total: %s) with %s", len(tasks), paginated_result.total, filter_str)
         
         return success("Upload tasks retrieved", {
             "tasks": [UploadTaskRead.model_validate(task) for task in tasks],
             "pagination": {
-                "total": total,
-                "limit": limit,
-                "offset": offset,
-                "has_next": offset + limit < total
+                "total": paginated_result.total,
+                "limit": paginated_result.limit,
+                "offset": paginated_result.offset,
+                "has_next": paginated_result.has_next,
+                "next_cursor": paginated_result.next_cursor
             }
         })
     except Exception as e:
@@ -95,10 +99,10 @@ async def list_upload_tasks(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{task_id}", response_model=UploadTaskRead)
-async def get_upload_task(task_id: int, db: Session = Depends(get_db)):
+async def get_upload_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific upload task with proper error handling"""
     try:
-        task = db.query(UploadTask).filter(UploadTask.id == task_id).first()
+        task = await db.get(UploadTask, task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Upload task not found")
         return task
@@ -112,11 +116,11 @@ async def get_upload_task(task_id: int, db: Session = Depends(get_db)):
 async def update_upload_task(
     task_id: int,
     task_update: UploadTaskUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update upload task with status transition validation"""
     try:
-        task = db.query(UploadTask).filter(UploadTask.id == task_id).first()
+        task = await db.get(UploadTask, task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Upload task not found")
         
@@ -139,16 +143,16 @@ async def update_upload_task(
         if task_update.assigned_to is not None:
             task.assigned_to = task_update.assigned_to
         
-        db.commit()
-        db.refresh(task)
+        await db.commit()
+        await db.refresh(task)
         
-        logger.info(f"Updated upload task {task_id}: status={task.status}, assigned_to={task.assigned_to}")
+        logger.info("Updated upload task %s: status=%s, assigned_to=%s", task_id, task.status, task.assigned_to)
         return success("Upload task updated", UploadTaskRead.model_validate(task))
         
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error updating upload task {task_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to update upload task")
     except Exception as e:
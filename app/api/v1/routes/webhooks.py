@@ -1,24 +1,26 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.workflow import GenerationRequestPayload
 from app.schemas.generation_job import GenerationJobCreate
-from app.utils.logger import logger
+from app.utils.logger import get_logger
 from app.core.responses import success
 
+logger = get_logger(__name__)
+
 router = APIRouter()
 
 @router.post("/generation-request")
 async def webhook_generation_request(
     payload: GenerationRequestPayload,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Webhook endpoint for n8n generation requests"""
     request_id = str(uuid.uuid4())
     
     # Log workflow request
-    logger.info(f"Webhook request received - ID: {request_id}, Source: {payload.source}, Standard: {payload.standard_code}")
+    logger.info("Webhook request received - ID: %s, Source: %s, Standard: %s", request_id, payload.source, payload.standard_code)
     
     # Create generation job using existing logic
     job_data = GenerationJobCreate(
@@ -29,7 +31,7 @@ async def webhook_generation_request(
     # TODO: Call existing generation job creation service
     # For now, return success response
     
-    logger.info(f"Generation job created for webhook request {request_id}")
+    logger.info("Generation job created for webhook request %s", request_id)
     
     return success("Generation request received", {
         "request_id": request_id,
@@ -51,6 +51,7 @@ class FileType(str, Enum):
     RAW_JSON = "RAW_JSON"
     FINAL_JSON = "FINAL_JSON"
     METADATA_JSON = "METADATA_JSON"
+    QC_JSON = "QC_JSON"
     PDF = "PDF"
     ZIP = "ZIP"
     THUMBNAIL = "THUMBNAIL"
\ No newline at end of file
@@ -4,14 +4,82 @@ class Settings(BaseSettings):
     app_name: str
     environment: str
     database_url: str
+    async_database_url: str = ""  # Defaults to DATABASE_URL with the asyncpg / aiosqlite driver
     storage_path: str
     log_level: str
+    log_format: str = "json"  # "json" (one object per line) or "text"
+    log_queue_size: int = 10000  # Records buffered for the log writer thread before new ones are dropped
+    log_sampling: str = ""  # Comma-separated logger=rate pairs for INFO/DEBUG, e.g. "rbb_engine.api=0.1"
+    
+    # Database Connection Pool (Postgres; per engine - the API's async engine and the worker's sync engine)
+    db_pool_size: int = 10  # Persistent connections
+    db_max_overflow: int = 20  # Extra connections opened under load
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection before failing
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced (-1 = never)
+    db_statement_timeout: int = 30000  # Milliseconds per statement (0 = no limit)
+    db_long_held_threshold: float = 10.0  # Seconds a checked-out connection may be held before it's reported (0 = off)
     
     # Claude AI Configuration
     claude_api_key: str = ""
     claude_model: str = "claude-3-5-sonnet-20241022"
     claude_timeout: int = 60
-    claude_max_retries: int = 3
+    claude_max_retries: int = 3  # Total attempts per call
+    claude_retry_base_delay: float = 1.0  # Seconds; doubled per attempt, full jitter
+    claude_retry_max_delay: float = 30.0
+    claude_retry_deadline: float = 300.0  # Overall budget per call, including backoff
+    claude_connect_timeout: float = 10.0
+    claude_http2: bool = True
+    claude_max_connections: int = 100
+    claude_max_keepalive_connections: int = 20
+    claude_keepalive_expiry: float = 60.0  # Seconds an idle connection stays pooled
+    claude_max_concurrency: int = 10  # In-flight Claude calls (0 = unlimited)
+    claude_requests_per_minute: int = 50  # 0 = unlimited
+    claude_tokens_per_minute: int = 0  # Input + output tokens, 0 = unlimited
+    claude_limiter_backend: str = "local"  # "local" or "postgres" (cluster-wide concurrency via advisory locks)
+
+    # Claude Response Cache (opt-in)
+    claude_cache_enabled: bool = False
+    claude_cache_backend: str = "memory"  # "memory" (per-process LRU) or "sqlite" (under storage_path)
+    claude_cache_ttl: int = 86400  # Seconds
+    claude_cache_max_entries: int = 1000  # Memory backend only
+    claude_cache_agents: str = "generator,qc,metadata"  # Comma-separated agents allowed to use the cache
+
+    # Background Generation Worker
+    generation_worker_enabled: bool = True
+    generation_worker_concurrency: int = 32  # Products generated in parallel per process
+    generation_worker_poll_interval: float = 5.0  # Seconds between PENDING job scans
+    generation_job_stale_after: int = 900  # Seconds before a RUNNING job is requeued
+    generation_bundle_concurrency: int = 16  # Max products in flight per FULL_BUNDLE job
+    bundle_max_products: int = 5000  # Upper bound on products created by one bundle request
+    job_status_cache_ttl: float = 2.0  # Seconds a job progress snapshot is served from memory
+    job_status_cache_max_entries: int = 10000
+    standards_catalog_refresh_interval: float = 60.0  # Seconds between catalogue version checks
+
+    # Dashboard Counters
+    dashboard_reconcile_interval: int = 3600  # Seconds between dashboard counter reconciliations (0 = off)
+
+    # Live Job Progress Events
+    job_events_backend: str = "auto"  # "auto", "local" (single process) or "postgres" (LISTEN/NOTIFY fan-out)
+    job_events_queue_size: int = 1000  # Buffered events per viewer before the oldest are dropped
+    job_events_keepalive: float = 15.0  # Seconds between SSE keep-alive comments
+    job_events_reconnect_delay: float = 5.0  # Seconds before re-establishing a lost LISTEN connection
+
+    # PDF Rendering
+    pdf_render_workers: int = 2  # Render processes per API process
+    pdf_render_queue_size: int = 64  # Distinct renders queued or running before requests are refused
+    pdf_render_timeout: float = 60.0  # Seconds a download waits for its render
+    pdf_render_eager: bool = True  # Pre-render when a product becomes GENERATED
+    pdf_batch_workers: int = 0  # Processes for catalogue pre-render jobs started from the API (0 = all cores)
+    pdf_font_dir: str = ""  # Directory with DejaVuSans*.ttf for non-Latin text (built-in Helvetica when empty)
+
+    # Thumbnails
+    thumbnail_workers: int = 1  # Rasterise processes per API process
+    thumbnail_queue_size: int = 64  # Distinct PDFs queued or rasterising before requests are refused
+    thumbnail_timeout: float = 30.0  # Seconds a thumbnail request waits for its render
+    thumbnail_cache_max_age: int = 86400  # Cache-Control max-age for /products/{id}/thumbnail
+
+    # Prometheus
+    prometheus_multiproc_dir: str = ""  # Shared directory for multi-worker metrics (empty = single process)
 
     class Config:
         env_file = ".env"
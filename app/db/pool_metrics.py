@@ -0,0 +1,77 @@
+# Connection pool instrumentation: checkout wait, hold time and saturation
+import time
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+class _WaitTimingMixin:
+    """Times every checkout, including waits for a free connection"""
+    engine_name = ""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            prometheus.db_pool_timeouts_total.labels(self.engine_name).inc()
+            raise
+        finally:
+            prometheus.db_pool_wait.labels(self.engine_name).observe(time.perf_counter() - started)
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    engine_name = "sync"
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    engine_name = "async"
+
+def _record_usage(pool: Pool, name: str) -> None:
+    if isinstance(pool, QueuePool):
+        prometheus.db_pool_checked_out.labels(name).set(pool.checkedout())
+        prometheus.db_pool_overflow.labels(name).set(max(pool.overflow(), 0))
+
+def instrument_pool(pool: Pool, name: str) -> None:
+    """Attach checkout/checkin listeners (they survive pool.recreate() on dispose)"""
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        prometheus.db_connections_opened_total.labels(name).inc()
+        # QueuePool counts a connection beyond pool_size before opening it
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            prometheus.db_pool_overflow_connections_total.labels(name).inc()
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        _record_usage(pool, name)
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        _record_usage(pool, name)
+        if checked_out_at is None:
+            return
+        held = time.perf_counter() - checked_out_at
+        prometheus.db_connection_hold.labels(name).observe(held)
+        if settings.db_long_held_threshold > 0 and held > settings.db_long_held_threshold:
+            prometheus.db_long_held_connections_total.labels(name).inc()
+            logger.warning(f"Database connection ({name} pool) held for {held:.1f}s")
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """Live pool occupancy for the metrics endpoint"""
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout()
+    }
@@ -2,19 +2,50 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.api.v1.routes import health, standards, products, generation_jobs, upload_tasks, dashboard, webhooks
+from app.api.v1.routes import health, standards, products, generation_jobs, upload_tasks, dashboard, webhooks, metrics, search
 from app.api.v1.routes import generate
 from app.utils.storage import storage_manager
-from app.utils.logger import logger
+from app.utils.logger import RequestContextMiddleware, logger, shutdown_logging, start_logging
+from app.utils.prometheus import PrometheusMiddleware, mark_process_dead
+from app.services.generation_worker import generation_worker
+from app.services.job_events import job_event_bus
+from app.services.pdf_render import pdf_render_service
+from app.services.thumbnail_render import thumbnail_service
+from app.services.dashboard_counters import dashboard_reconciler
+from app.services.standards_catalog import standards_catalog
+from app.services.search import ensure_search_schema
+from app.db.session import async_engine, engine
+from app.ai.claude_client import claude_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    logger.info(f"Starting {settings.app_name}")
+    start_logging()
+    logger.info("Starting %s", settings.app_name)
     storage_manager.ensure_directories()
+    await claude_client.start()
+    ensure_search_schema(engine)
+    try:
+        standards_catalog.load()
+    except Exception as e:
+        # Loaded lazily on first use instead
+        logger.error("Failed to warm standards catalogue: %s", e)
+    await job_event_bus.start()
+    if settings.generation_worker_enabled:
+        generation_worker.start()
+    dashboard_reconciler.start()
     yield
     # Shutdown
-    logger.info(f"Shutting down {settings.app_name}")
+    await dashboard_reconciler.stop()
+    await generation_worker.stop()
+    await pdf_render_service.stop()
+    await thumbnail_service.stop()
+    await job_event_bus.stop()
+    await claude_client.close()
+    await async_engine.dispose()
+    mark_process_dead()
+    logger.info("Shutting down %s", settings.app_name)
+    shutdown_logging()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -31,6 +62,9 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(RequestContextMiddleware)
+    # Outermost, so latency includes every other middleware
+    app.add_middleware(PrometheusMiddleware)
     
     # Register routers
     app.include_router(health.router, prefix="/api", tags=["health"])
@@ -41,6 +75,9 @@ def create_app() -> FastAPI:
     app.include_router(generation_jobs.router, prefix="/api/v1/generation-jobs", tags=["generation-jobs"])
     app.include_router(upload_tasks.router, prefix="/api/v1/upload-tasks", tags=["upload-tasks"])
     app.include_router(webhooks.router, prefix="/api/v1/webhooks", tags=["webhooks"])
+    app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+    app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
+    app.include_router(metrics.exposition_router, tags=["metrics"])
     
     return app
 
@@ -6,6 +6,8 @@ from app.models.upload_task import UploadTask
 from app.models.file_artifact import FileArtifact
 from app.models.bundle import Bundle
 from app.models.error_log import ErrorLog
+from app.models.dashboard_counter import DashboardCounter
+from app.models.product_search import ProductSearch
 
 __all__ = [
     "Product", 
@@ -15,5 +17,7 @@ __all__ = [
     "UploadTask", 
     "FileArtifact",
     "Bundle",
-    "ErrorLog"
+    "ErrorLog",
+    "DashboardCounter",
+    "ProductSearch"
 ]
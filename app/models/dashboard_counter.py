@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class DashboardCounter(Base):
+    """Row counts per entity and status, kept current by database triggers (see migration 007)"""
+    __tablename__ = "dashboard_counters"
+
+    entity = Column(String, primary_key=True)  # products | generation_jobs | upload_tasks
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
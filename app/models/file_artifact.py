@@ -1,10 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Index, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, Enum
 from sqlalchemy.sql import func
 from app.db.session import Base
 from app.core.enums import Locale, FileType
 
 class FileArtifact(Base):
-    """Files associated with products (raw.json, final.json, metadata.json, zip bundles)"""
+    """Files associated with products (raw/qc/metadata JSON, PDFs, thumbnails, zip bundles)"""
     __tablename__ = "file_artifacts"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -12,9 +12,15 @@ class FileArtifact(Base):
     locale = Column(Enum(Locale), nullable=False, default=Locale.IN, index=True)
     file_type = Column(Enum(FileType), nullable=False, index=True)
     file_path = Column(String, nullable=False)  # Relative path to file in storage
+    size_bytes = Column(BigInteger, nullable=True)
+    checksum = Column(String(64), nullable=True)  # SHA-256 hex digest
+    content_type = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
         Index('ix_file_artifacts_product_type', 'product_id', 'file_type'),
         Index('ix_file_artifacts_locale', 'locale'),
-    )
\ No newline at end of file
+        # One row per stored file; rewrites update it in place (see migration 009)
+        Index('ux_file_artifacts_product_path', 'product_id', 'file_path', unique=True),
+    )
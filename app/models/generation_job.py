@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Index, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Index, Enum, JSON
 from sqlalchemy.sql import func
 from app.db.session import Base
 from app.core.enums import Locale, CurriculumBoard, JobStatus, JobType
@@ -17,6 +17,7 @@ class GenerationJob(Base):
     total_products = Column(Integer, default=0)  # Total products to generate
     completed_products = Column(Integer, default=0)  # Successfully completed
     failed_products = Column(Integer, default=0)  # Failed products
+    step_timings = Column(JSON, nullable=True)  # Per agent step: runs, failures, total/max/last ms
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -24,4 +25,8 @@ class GenerationJob(Base):
         Index('ix_generation_jobs_locale_curriculum', 'locale', 'curriculum_board'),
         Index('ix_generation_jobs_status_created', 'status', 'created_at'),
         Index('ix_generation_jobs_standard_type', 'standard_id', 'job_type'),
+        # Filter + newest-first listing (see migration 006)
+        Index('ix_generation_jobs_created_id', 'created_at', 'id'),
+        Index('ix_generation_jobs_type_created', 'job_type', 'created_at', 'id'),
+        Index('ix_generation_jobs_curriculum_grade_created', 'curriculum_board', 'grade_level', 'created_at', 'id'),
     )
\ No newline at end of file
@@ -17,8 +17,15 @@ class Product(Base):
     grade_level = Column(Integer, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # ix_products_generation_job_id comes from the column's index=True
     __table_args__ = (
-        Index('ix_products_generation_job_id', 'generation_job_id'),
         Index('ix_products_status_type', 'status', 'product_type'),
         Index('ix_products_standard_status', 'standard_id', 'status'),
+        # Filter + newest-first listing (see migration 006)
+        Index('ix_products_created_id', 'created_at', 'id'),
+        Index('ix_products_job_created', 'generation_job_id', 'created_at', 'id'),
+        Index('ix_products_status_created', 'status', 'created_at', 'id'),
+        Index('ix_products_standard_created', 'standard_id', 'created_at', 'id'),
+        Index('ix_products_type_created', 'product_type', 'created_at', 'id'),
+        Index('ix_products_curriculum_grade_created', 'curriculum_board', 'grade_level', 'created_at', 'id'),
     )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class ProductSearch(Base):
+    """Searchable copy of each product's metadata.json (indexes: see migration 008)"""
+    __tablename__ = "product_search"
+
+    product_id = Column(Integer, primary_key=True)  # References Product.id
+    title = Column(String, nullable=True)
+    description = Column(String, nullable=True)
+    tags = Column(String, nullable=True)  # Comma-separated
+    keywords = Column(String, nullable=True)  # Comma-separated SEO keywords
+    topic = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -17,4 +17,8 @@ class UploadTask(Base):
     __table_args__ = (
         Index('ix_upload_tasks_status_created', 'status', 'created_at'),
         Index('ix_upload_tasks_assigned', 'assigned_to'),
+        # Filter + newest-first listing (see migration 006)
+        Index('ix_upload_tasks_created_id', 'created_at', 'id'),
+        Index('ix_upload_tasks_product_created', 'product_id', 'created_at', 'id'),
+        Index('ix_upload_tasks_assigned_created', 'assigned_to', 'created_at', 'id'),
     )
\ No newline at end of file
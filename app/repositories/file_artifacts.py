@@ -0,0 +1,46 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.file_artifact import FileArtifact
+from app.core.enums import FileType
+
+class FileArtifactRepository:
+    """Artifact lookups served by ix_file_artifacts_product_type"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_for_product(
+        self,
+        product_id: int,
+        file_types: Optional[Iterable[FileType]] = None
+    ) -> List[FileArtifact]:
+        """A product's artifacts, optionally limited to some types"""
+        query = select(FileArtifact).where(FileArtifact.product_id == product_id)
+        if file_types is not None:
+            query = query.where(FileArtifact.file_type.in_(list(file_types)))
+        result = await self.db.execute(query.order_by(FileArtifact.file_type, FileArtifact.file_path))
+        return list(result.scalars())
+
+    async def get_by_types(self, product_id: int, *file_types: FileType) -> Dict[FileType, FileArtifact]:
+        """Resolve several artifact types in one query (first path per type)"""
+        artifacts: Dict[FileType, FileArtifact] = {}
+        for artifact in await self.list_for_product(product_id, file_types):
+            artifacts.setdefault(artifact.file_type, artifact)
+        return artifacts
+
+    async def get_manifests(self, product_ids: Iterable[int]) -> Dict[int, List[FileArtifact]]:
+        """Artifacts for many products in one query, keyed by product ID"""
+        ids = list(dict.fromkeys(product_ids))
+        manifests: Dict[int, List[FileArtifact]] = {product_id: [] for product_id in ids}
+        if not ids:
+            return manifests
+
+        result = await self.db.execute(
+            select(FileArtifact)
+            .where(FileArtifact.product_id.in_(ids))
+            .order_by(FileArtifact.product_id, FileArtifact.file_type, FileArtifact.file_path)
+        )
+        for artifact in result.scalars():
+            manifests[artifact.product_id].append(artifact)
+        return manifests
@@ -1,26 +1,27 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session, Query
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.generation_job import GenerationJob
 from app.schemas.generation_job import GenerationJobCreate
 from app.core.enums import Locale, CurriculumBoard, JobStatus, JobType
 
 class GenerationJobRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, job_data: GenerationJobCreate) -> GenerationJob:
+    async def create(self, job_data: GenerationJobCreate) -> GenerationJob:
         """Create new generation job"""
         job_dict = job_data.model_dump()
         job_dict['status'] = JobStatus.PENDING
         db_job = GenerationJob(**job_dict)
         self.db.add(db_job)
-        self.db.commit()
-        self.db.refresh(db_job)
+        await self.db.commit()
+        await self.db.refresh(db_job)
         return db_job
 
-    def get_by_id(self, job_id: int) -> Optional[GenerationJob]:
+    async def get_by_id(self, job_id: int) -> Optional[GenerationJob]:
         """Get generation job by ID"""
-        return self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        return await self.db.get(GenerationJob, job_id)
 
     def get_all(
         self,
@@ -29,19 +30,19 @@ class GenerationJobRepository:
         grade_level: Optional[int] = None,
         locale: Optional[Locale] = None,
         job_type: Optional[JobType] = None
-    ) -> Query:
+    ) -> Select:
         """Get all generation jobs with optional filters"""
-        query = self.db.query(GenerationJob)
+        query = select(GenerationJob)
         
         if status:
-            query = query.filter(GenerationJob.status == status)
+            query = query.where(GenerationJob.status == status)
         if curriculum_board:
-            query = query.filter(GenerationJob.curriculum_board == curriculum_board)
+            query = query.where(GenerationJob.curriculum_board == curriculum_board)
         if grade_level:
-            query = query.filter(GenerationJob.grade_level == grade_level)
+            query = query.where(GenerationJob.grade_level == grade_level)
         if locale:
-            query = query.filter(GenerationJob.locale == locale)
+            query = query.where(GenerationJob.locale == locale)
         if job_type:
-            query = query.filter(GenerationJob.job_type == job_type)
+            query = query.where(GenerationJob.job_type == job_type)
             
-        return query.order_by(GenerationJob.created_at.desc())
\ No newline at end of file
+        return query.order_by(GenerationJob.created_at.desc())
@@ -1,25 +1,26 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session, Query
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.product import Product
 from app.schemas.product import ProductCreate
 from app.core.enums import Locale, CurriculumBoard, ProductType, ProductStatus
 
 class ProductRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.model = Product
 
-    def create(self, product_data: ProductCreate) -> Product:
+    async def create(self, product_data: ProductCreate) -> Product:
         """Create new product"""
         db_product = Product(**product_data.model_dump())
         self.db.add(db_product)
-        self.db.commit()
-        self.db.refresh(db_product)
+        await self.db.commit()
+        await self.db.refresh(db_product)
         return db_product
 
-    def get_by_id(self, product_id: int) -> Optional[Product]:
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
         """Get product by ID"""
-        return self.db.query(Product).filter(Product.id == product_id).first()
+        return await self.db.get(Product, product_id)
 
     def get_all(
         self,
@@ -30,38 +31,39 @@ class ProductRepository:
         curriculum_board: Optional[CurriculumBoard] = None,
         grade_level: Optional[int] = None,
         locale: Optional[Locale] = None
-    ) -> Query:
+    ) -> Select:
         """Get all products with optional filters"""
-        query = self.db.query(Product)
+        query = select(Product)
         
         if status:
-            query = query.filter(Product.status == status)
+            query = query.where(Product.status == status)
         if product_type:
-            query = query.filter(Product.product_type == product_type)
+            query = query.where(Product.product_type == product_type)
         if generation_job_id:
-            query = query.filter(Product.generation_job_id == generation_job_id)
+            query = query.where(Product.generation_job_id == generation_job_id)
         if standard_id:
-            query = query.filter(Product.standard_id == standard_id)
+            query = query.where(Product.standard_id == standard_id)
         if curriculum_board:
-            query = query.filter(Product.curriculum_board == curriculum_board)
+            query = query.where(Product.curriculum_board == curriculum_board)
         if grade_level:
-            query = query.filter(Product.grade_level == grade_level)
+            query = query.where(Product.grade_level == grade_level)
         if locale:
-            query = query.filter(Product.locale == locale)
+            query = query.where(Product.locale == locale)
             
         return query.order_by(Product.created_at.desc())
 
-    def list_by_job(self, generation_job_id: int) -> List[Product]:
+    async def list_by_job(self, generation_job_id: int) -> List[Product]:
         """Get all products for a specific generation job"""
-        return self.db.query(Product).filter(
-            Product.generation_job_id == generation_job_id
-        ).order_by(Product.created_at.desc()).all()
+        result = await self.db.execute(
+            select(Product).where(Product.generation_job_id == generation_job_id).order_by(Product.created_at.desc())
+        )
+        return list(result.scalars())
     
-    def update_status(self, product_id: int, status: ProductStatus) -> Product:
+    async def update_status(self, product_id: int, status: ProductStatus) -> Product:
         """Update product status"""
-        product = self.get_by_id(product_id)
+        product = await self.get_by_id(product_id)
         if product:
             product.status = status
-            self.db.commit()
-            self.db.refresh(product)
-        return product
\ No newline at end of file
+            await self.db.commit()
+            await self.db.refresh(product)
+        return product
@@ -1,39 +1,40 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session, Query
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.standard import Standard
 from app.schemas.standard import StandardCreate
 from app.core.enums import Locale, CurriculumBoard
 
 class StandardRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, standard_data: StandardCreate) -> Standard:
+    async def create(self, standard_data: StandardCreate) -> Standard:
         """Create new standard"""
         db_standard = Standard(**standard_data.model_dump())
         self.db.add(db_standard)
-        self.db.commit()
-        self.db.refresh(db_standard)
+        await self.db.commit()
+        await self.db.refresh(db_standard)
         return db_standard
 
-    def get_by_id(self, standard_id: int) -> Optional[Standard]:
+    async def get_by_id(self, standard_id: int) -> Optional[Standard]:
         """Get standard by ID"""
-        return self.db.query(Standard).filter(Standard.id == standard_id).first()
+        return await self.db.get(Standard, standard_id)
 
     def get_all(
         self,
         curriculum_board: Optional[CurriculumBoard] = None,
         grade_level: Optional[int] = None,
         locale: Optional[Locale] = None
-    ) -> Query:
+    ) -> Select:
         """Get all standards with optional filters"""
-        query = self.db.query(Standard)
+        query = select(Standard)
         
         if curriculum_board:
-            query = query.filter(Standard.curriculum_board == curriculum_board)
+            query = query.where(Standard.curriculum_board == curriculum_board)
         if grade_level:
-            query = query.filter(Standard.grade_level == grade_level)
+            query = query.where(Standard.grade_level == grade_level)
         if locale:
-            query = query.filter(Standard.locale == locale)
+            query = query.where(Standard.locale == locale)
             
-        return query.order_by(Standard.created_at.desc())
\ No newline at end of file
+        return query.order_by(Standard.created_at.desc())
@@ -5,7 +5,7 @@ from app.schemas.generation_job import GenerationJobBase, GenerationJobCreate, G
 from app.schemas.upload_task import UploadTaskBase, UploadTaskCreate, UploadTaskRead, UploadTaskUpdate
 from app.schemas.file_artifact import FileArtifactBase, FileArtifactCreate, FileArtifactRead
 from app.schemas.workflow import GenerationRequestPayload
-from app.schemas.generate import GenerateProductRequest, GenerateProductResponse
+from app.schemas.generate import GenerateProductRequest, GenerateProductResponse, GenerateBundleRequest, GenerateBundleResponse
 
 __all__ = [
     "ProductBase", "ProductCreate", "ProductRead",
@@ -15,5 +15,6 @@ __all__ = [
     "UploadTaskBase", "UploadTaskCreate", "UploadTaskRead", "UploadTaskUpdate",
     "FileArtifactBase", "FileArtifactCreate", "FileArtifactRead",
     "GenerationRequestPayload",
-    "GenerateProductRequest", "GenerateProductResponse"
+    "GenerateProductRequest", "GenerateProductResponse",
+    "GenerateBundleRequest", "GenerateBundleResponse"
 ]
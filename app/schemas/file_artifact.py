@@ -1,17 +1,25 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
+from app.core.enums import FileType
 
 class FileArtifactBase(BaseModel):
     product_id: int
-    file_type: str
+    file_type: FileType
     file_path: str
 
 class FileArtifactCreate(FileArtifactBase):
-    pass
+    size_bytes: Optional[int] = None
+    checksum: Optional[str] = None
+    content_type: Optional[str] = None
 
 class FileArtifactRead(FileArtifactBase):
     id: int
+    size_bytes: Optional[int] = None
+    checksum: Optional[str] = None
+    content_type: Optional[str] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Optional
 from app.core.enums import ProductType, Locale, CurriculumBoard
 
 class GenerateProductRequest(BaseModel):
@@ -11,4 +12,17 @@ class GenerateProductRequest(BaseModel):
 class GenerateProductResponse(BaseModel):
     job_id: int
     product_ids: list[int]
+    message: str
+
+class GenerateBundleRequest(BaseModel):
+    standard_ids: Optional[list[int]] = None  # Omit to use every standard matching the filters below
+    product_types: list[ProductType] = Field(..., min_length=1)
+    locale: Locale = Locale.IN
+    curriculum_board: CurriculumBoard = CurriculumBoard.CBSE
+    grade_level: Optional[int] = None
+
+class GenerateBundleResponse(BaseModel):
+    job_id: int
+    standard_count: int
+    total_products: int
     message: str
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, field_validator
 from datetime import datetime
+from typing import Any, Dict, Optional
 from app.core.enums import Locale, CurriculumBoard, JobStatus, JobType
 
 class GenerationJobBase(BaseModel):
@@ -33,6 +34,7 @@ class GenerationJobRead(GenerationJobBase):
     total_products: int
     completed_products: int
     failed_products: int
+    step_timings: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
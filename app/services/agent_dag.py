@@ -0,0 +1,119 @@
+# Small DAG executor for agent orchestration
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class StepStatus:
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"  # An upstream step did not succeed
+
+class AgentStep:
+    """A unit of work; `run` receives the results of its dependencies by step name"""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        depends_on: Iterable[str] = ()
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+
+class StepResult:
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        value: Any = None,
+        error: Optional[BaseException] = None,
+        duration_ms: float = 0.0
+    ):
+        self.name = name
+        self.status = status
+        self.value = value
+        self.error = error
+        self.duration_ms = duration_ms
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == StepStatus.SUCCEEDED
+
+def _topological_order(steps: List[AgentStep]) -> List[AgentStep]:
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps):
+        raise ValueError("Duplicate step names in agent DAG")
+
+    ordered: List[AgentStep] = []
+    state: Dict[str, str] = {}
+
+    def visit(step: AgentStep) -> None:
+        if state.get(step.name) == "done":
+            return
+        if state.get(step.name) == "visiting":
+            raise ValueError(f"Cycle detected in agent DAG at step '{step.name}'")
+        state[step.name] = "visiting"
+        for dependency in step.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dependency}'")
+            visit(by_name[dependency])
+        state[step.name] = "done"
+        ordered.append(step)
+
+    for step in steps:
+        visit(step)
+    return ordered
+
+async def run_dag(
+    steps: List[AgentStep],
+    on_step_finished: Optional[Callable[[StepResult], None]] = None
+) -> Dict[str, StepResult]:
+    """
+    Run steps as soon as their dependencies succeed; independent steps run
+    concurrently. A failing step never raises - it is recorded as FAILED and
+    its dependents are SKIPPED while unrelated branches carry on.
+    `on_step_finished` is called with each step's result as it settles.
+    """
+    tasks: Dict[str, "asyncio.Task[StepResult]"] = {}
+
+    async def execute(step: AgentStep) -> StepResult:
+        result = await run_step(step)
+        if on_step_finished is not None:
+            try:
+                on_step_finished(result)
+            except Exception as e:
+                logger.warning(f"Step callback failed for '{step.name}': {e}")
+        return result
+
+    async def run_step(step: AgentStep) -> StepResult:
+        upstream = [await tasks[dependency] for dependency in step.depends_on]
+        if any(not result.succeeded for result in upstream):
+            return StepResult(step.name, StepStatus.SKIPPED)
+
+        inputs = {result.name: result.value for result in upstream}
+        started = time.perf_counter()
+        try:
+            value = await step.run(inputs)
+        except Exception as e:
+            duration_ms = (time.perf_counter() - started) * 1000
+            logger.error(f"Agent step '{step.name}' failed after {duration_ms:.0f}ms: {e}")
+            return StepResult(step.name, StepStatus.FAILED, error=e, duration_ms=duration_ms)
+
+        return StepResult(step.name, StepStatus.SUCCEEDED, value=value, duration_ms=(time.perf_counter() - started) * 1000)
+
+    # Dependencies are scheduled before dependents, so every awaited task exists
+    for step in _topological_order(steps):
+        tasks[step.name] = asyncio.create_task(execute(step))
+
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except asyncio.CancelledError:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    return {result.name: result for result in results}
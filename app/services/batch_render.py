@@ -0,0 +1,240 @@
+# Catalogue-wide PDF pre-rendering, shared by scripts/render_pdfs.py and the API background job
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import and_, exists
+from app.core.enums import FileType, ProductStatus
+from app.db.session import SessionLocal
+from app.models.file_artifact import FileArtifact
+from app.models.product import Product
+from app.services.thumbnail_render import register_thumbnails
+from app.utils.logger import get_logger
+from app.utils import prometheus
+from app.utils.pdf_generator import pdf_generator
+from app.utils.storage import storage_manager
+from app.utils.thumbnails import render_thumbnails
+
+logger = get_logger(__name__)
+
+# (product_id, product_type, storage-relative raw.json path)
+RenderItem = Tuple[int, str, str]
+
+def _render_stored(product_id: int, product_type: str, raw_path: str) -> Tuple[str, int, float, Dict[str, str]]:
+    """Runs in a pool process: load raw.json from storage, build the PDF and its thumbnails"""
+    started = time.perf_counter()
+    with open(storage_manager.resolve(raw_path), 'r') as f:
+        content_data = json.load(f)
+    result = pdf_generator.render(product_id, product_type, content_data)
+    seconds = time.perf_counter() - started
+
+    try:
+        _, thumbnails = render_thumbnails(result.path)
+    except Exception as e:
+        # The PDF still counts; the thumbnail endpoint renders them on demand
+        logger.warning(f"Thumbnails failed for product {product_id}: {e}")
+        thumbnails = {}
+    return str(result.path), result.pages, seconds, {size: str(path) for size, path in thumbnails.items()}
+
+class BatchRenderSummary:
+    """Running totals for a batch render; `as_dict` is the progress/summary payload"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.rendered = 0
+        self.failed = 0
+        self.pages = 0
+        self.render_seconds = 0.0
+        self.last_product_id = 0
+        self.failures: List[Dict[str, Any]] = []  # First 100, for the summary
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed
+        return {
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "pages": self.pages,
+            "elapsed_seconds": round(elapsed, 1),
+            "products_per_second": round(self.rendered / elapsed, 2) if elapsed else 0.0,
+            "pages_per_second": round(self.pages / elapsed, 2) if elapsed else 0.0,
+            "avg_render_seconds": round(self.render_seconds / self.rendered, 3) if self.rendered else 0.0,
+            "last_product_id": self.last_product_id,
+            "finished": self.finished_at is not None,
+            "failures": self.failures,
+        }
+
+class BatchRenderer:
+    """
+    Renders every GENERATED product that has no PDF artifact, with its
+    thumbnails, across a process pool.
+
+    Products are streamed in keyset batches and each worker reads its own
+    raw.json, so memory stays flat however large the catalogue is. Every
+    finished PDF is registered immediately, which makes runs resumable:
+    a rerun selects only what is still missing (including earlier failures).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current: Optional[BatchRenderSummary] = None
+        self._running = False
+
+    @property
+    def current(self) -> Optional[BatchRenderSummary]:
+        return self._current
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _pending_batches(self, batch_size: int, after_id: int, limit: Optional[int]) -> Iterator[List[RenderItem]]:
+        has_pdf = exists().where(and_(
+            FileArtifact.product_id == Product.id,
+            FileArtifact.file_type == FileType.PDF
+        ))
+        remaining = limit
+        last_id = after_id
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            db = SessionLocal()
+            try:
+                rows = (
+                    db.query(Product.id, Product.product_type, FileArtifact.file_path)
+                    .join(FileArtifact, and_(
+                        FileArtifact.product_id == Product.id,
+                        FileArtifact.file_type == FileType.RAW_JSON
+                    ))
+                    .filter(Product.status == ProductStatus.GENERATED, Product.id > last_id, ~has_pdf)
+                    .order_by(Product.id)
+                    .limit(size)
+                    .all()
+                )
+            finally:
+                db.close()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+            yield [(product_id, product_type.value, raw_path) for product_id, product_type, raw_path in rows]
+
+    def run(
+        self,
+        workers: Optional[int] = None,
+        batch_size: int = 200,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        progress: Optional[Callable[[BatchRenderSummary], None]] = None,
+        progress_every: int = 50
+    ) -> BatchRenderSummary:
+        """Render missing PDFs and return the summary; one run at a time per process"""
+        summary = self._claim()
+        if summary is None:
+            raise RuntimeError("A batch render is already running")
+        return self._run_claimed(summary, workers, batch_size, after_id, limit, progress, progress_every)
+
+    def _claim(self) -> Optional[BatchRenderSummary]:
+        """Mark a run as started, or None if one already is"""
+        with self._lock:
+            if self._running:
+                return None
+            self._running = True
+            self._current = summary = BatchRenderSummary()
+            return summary
+
+    def _run_claimed(
+        self,
+        summary: BatchRenderSummary,
+        workers: Optional[int] = None,
+        batch_size: int = 200,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        progress: Optional[Callable[[BatchRenderSummary], None]] = None,
+        progress_every: int = 50
+    ) -> BatchRenderSummary:
+        workers = workers or os.cpu_count() or 1
+        # Enough queued work to keep every core busy without loading the whole catalogue
+        max_in_flight = workers * 2
+        logger.info("Batch PDF render started (%s workers, after product %s)", workers, after_id)
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                in_flight: Dict[Future, RenderItem] = {}
+
+                def collect(done: Set[Future]) -> None:
+                    for future in done:
+                        item = in_flight.pop(future)
+                        self._record(summary, item, future)
+                        if progress is not None and (summary.rendered + summary.failed) % progress_every == 0:
+                            progress(summary)
+
+                for batch in self._pending_batches(batch_size, after_id, limit):
+                    for item in batch:
+                        if len(in_flight) >= max_in_flight:
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            collect(done)
+                        in_flight[pool.submit(_render_stored, *item)] = item
+
+                if in_flight:
+                    done, _ = wait(in_flight)
+                    collect(done)
+        finally:
+            summary.finished_at = time.perf_counter()
+            self._running = False
+
+        if progress is not None:
+            progress(summary)
+        logger.info("Batch PDF render finished: %s", summary.as_dict())
+        return summary
+
+    def start_background(self, **options: Any) -> bool:
+        """Run on a daemon thread (API background job); False if a run is already in progress"""
+        # Claimed here rather than on the thread, so two requests can't both start a run
+        summary = self._claim()
+        if summary is None:
+            return False
+        try:
+            threading.Thread(
+                target=self._run_logged, args=(summary,), kwargs=options, name="batch-pdf-render", daemon=True
+            ).start()
+        except Exception:
+            self._running = False
+            raise
+        return True
+
+    def _run_logged(self, summary: BatchRenderSummary, **options: Any) -> None:
+        try:
+            self._run_claimed(summary, **options)
+        except Exception as e:
+            logger.error("Batch PDF render aborted: %s", e)
+
+    def _record(self, summary: BatchRenderSummary, item: RenderItem, future: Future) -> None:
+        product_id, product_type, _ = item
+        summary.last_product_id = max(summary.last_product_id, product_id)
+        try:
+            path, pages, seconds, thumbnails = future.result()
+            storage_manager.register_file(product_id, FileType.PDF, Path(path))
+            if thumbnails:
+                register_thumbnails(product_id, {size: Path(thumbnail) for size, thumbnail in thumbnails.items()})
+        except Exception as e:
+            summary.failed += 1
+            if len(summary.failures) < 100:
+                summary.failures.append({"product_id": product_id, "error": str(e)})
+            logger.error("Batch render failed for product %s: %s", product_id, e)
+            return
+
+        summary.rendered += 1
+        summary.pages += pages
+        summary.render_seconds += seconds
+        prometheus.pdf_render_duration.labels(product_type.upper()).observe(seconds)
+
+batch_renderer = BatchRenderer()
@@ -0,0 +1,144 @@
+# Dashboard statistics served from trigger-maintained counters
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.enums import JobStatus, ProductStatus, UploadTaskStatus
+from app.db.session import SessionLocal
+from app.models.dashboard_counter import DashboardCounter
+from app.models.generation_job import GenerationJob
+from app.models.product import Product
+from app.models.upload_task import UploadTask
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Counter entity -> (model, status enum)
+ENTITIES = {
+    "products": (Product, ProductStatus),
+    "generation_jobs": (GenerationJob, JobStatus),
+    "upload_tasks": (UploadTask, UploadTaskStatus),
+}
+
+RECONCILE_LOCK = (0x52424231, 2)  # Advisory lock: one reconciler per cluster
+
+StatusCounts = Dict[str, Dict[str, int]]
+
+def _empty_counts() -> StatusCounts:
+    return {entity: {status.value: 0 for status in enum} for entity, (_, enum) in ENTITIES.items()}
+
+def _uses_counters(db: Session) -> bool:
+    # Counters are maintained by Postgres triggers; other databases (dev SQLite) aggregate live
+    return db.get_bind().dialect.name == "postgresql"
+
+def _live_counts(db: Session) -> StatusCounts:
+    counts = _empty_counts()
+    for entity, (model, _) in ENTITIES.items():
+        rows = db.query(model.status, func.count(model.id)).filter(model.status.isnot(None)).group_by(model.status).all()
+        for status, count in rows:
+            counts[entity][status.value] = count
+    return counts
+
+def get_status_counts(db: Session) -> StatusCounts:
+    """Row counts per status for each dashboard entity, with every status present"""
+    if not _uses_counters(db):
+        return _live_counts(db)
+
+    counts = _empty_counts()
+    for entity, status, count in db.query(DashboardCounter.entity, DashboardCounter.status, DashboardCounter.count).all():
+        if entity in counts:
+            counts[entity][status] = count
+    return counts
+
+def _drift(db: Session) -> List[Tuple[str, str, int, int]]:
+    """(entity, status, stored, actual) for every counter that disagrees with its table.
+
+    One statement, so the aggregates and the stored counters are read from the
+    same snapshot: trigger updates committed in between can't show up as drift.
+    """
+    live = " UNION ALL ".join(
+        f"SELECT '{entity}' AS entity, status::text AS status, count(*) AS count "
+        f"FROM {model.__tablename__} WHERE status IS NOT NULL GROUP BY status"
+        for entity, (model, _) in ENTITIES.items()
+    )
+    entities = ", ".join(f"'{entity}'" for entity in ENTITIES)
+    return db.execute(text(f"""
+        WITH live AS ({live}),
+        stored AS (SELECT entity, status, count FROM dashboard_counters WHERE entity IN ({entities}))
+        SELECT coalesce(live.entity, stored.entity), coalesce(live.status, stored.status),
+               coalesce(stored.count, 0), coalesce(live.count, 0)
+        FROM live FULL OUTER JOIN stored ON stored.entity = live.entity AND stored.status = live.status
+        WHERE coalesce(stored.count, 0) <> coalesce(live.count, 0)
+    """)).all()
+
+def reconcile_dashboard_counters(db: Session) -> Optional[int]:
+    """Correct drifted counters against exact aggregates.
+
+    Returns the number of corrected counters, or None if another process is
+    already reconciling. Corrections are applied as deltas rather than
+    overwrites, so the aggregates need no table lock: writers keep running,
+    and trigger updates they commit after the snapshot are preserved.
+    """
+    if not _uses_counters(db):
+        return 0
+
+    if not db.execute(text("SELECT pg_try_advisory_xact_lock(:ns, :key)"), {"ns": RECONCILE_LOCK[0], "key": RECONCILE_LOCK[1]}).scalar():
+        db.rollback()
+        return None
+
+    drift = _drift(db)
+    if drift:
+        statement = insert(DashboardCounter).values([
+            {"entity": entity, "status": status, "count": actual - stored}
+            for entity, status, stored, actual in drift
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[DashboardCounter.entity, DashboardCounter.status],
+            set_={"count": DashboardCounter.count + statement.excluded.count, "updated_at": func.now()}
+        ))
+        for entity, status, stored, actual in drift:
+            logger.warning(f"Dashboard counter drift: {entity}.{status} {stored} -> {actual}")
+    db.commit()
+    return len(drift)
+
+class DashboardReconciler:
+    """Periodically repairs counter drift (e.g. rows changed while triggers were disabled)"""
+
+    def __init__(self):
+        self.interval = settings.dashboard_reconcile_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is not None or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("Dashboard counter reconciler started (every %ss)", self.interval)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                # Full-table aggregates - keep them off the event loop
+                corrected = await asyncio.to_thread(self._reconcile_once)
+                if corrected:
+                    logger.info("Reconciled %s dashboard counters", corrected)
+            except Exception as e:
+                logger.error(f"Dashboard counter reconciliation failed: {e}")
+
+    def _reconcile_once(self) -> Optional[int]:
+        db = SessionLocal()
+        try:
+            return reconcile_dashboard_counters(db)
+        finally:
+            db.close()
+
+dashboard_reconciler = DashboardReconciler()
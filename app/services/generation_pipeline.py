@@ -0,0 +1,177 @@
+# AI agent orchestration for a single product, run by the background generation worker
+import asyncio
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.product import Product
+from app.core.enums import ProductStatus
+from app.services.agent_dag import AgentStep, StepResult, StepStatus, run_dag
+from app.services.job_events import publish_job_event
+from app.services.pdf_render import pdf_render_service
+from app.services.standards_catalog import standards_catalog
+from app.services.job_status import StepTimings, add_step_results, transition_product_status
+from app.services.search import index_product_metadata
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+# AI Agents
+from app.ai.agents.generator import generator_agent
+from app.ai.agents.qc import qc_agent
+from app.ai.agents.metadata import metadata_agent
+
+logger = get_logger(__name__)
+
+def _finish_product(
+    product_id: int,
+    status: ProductStatus,
+    step_results: Optional[Dict[str, StepResult]] = None
+) -> None:
+    """Persist the final product status and roll it up into the job counters"""
+    db = SessionLocal()
+    try:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product:
+            logger.warning(f"Product {product_id} disappeared before status update")
+            return
+
+        product_type = product.product_type.value
+        if not transition_product_status(db, product, status, expected_status=ProductStatus.DRAFT):
+            return
+        prometheus.products_finished_total.labels(product_type, status.value).inc()
+
+        metadata_step = (step_results or {}).get("metadata")
+        if metadata_step is not None and metadata_step.succeeded:
+            try:
+                index_product_metadata(db, product_id, metadata_step.value)
+                db.commit()
+            except Exception as e:
+                # Search is secondary; scripts/reindex_search.py can backfill
+                db.rollback()
+                logger.error(f"Failed to index metadata for product {product_id}: {e}")
+    finally:
+        db.close()
+
+def _load_product(product_id: int) -> Optional[Dict[str, Any]]:
+    """Snapshot what the agents need from a product, or None if it is missing"""
+    db = SessionLocal()
+    try:
+        product = db.query(Product).filter(Product.id == product_id).first()
+        if not product:
+            return None
+
+        standard = standards_catalog.get(db, product.standard_id)
+        return {
+            "status": product.status,
+            "job_id": product.generation_job_id,
+            "product_type": product.product_type.value,
+            "grade_level": product.grade_level,
+            "curriculum": product.curriculum_board.value,
+            "standard_text": (standard.description or standard.code) if standard else None,
+        }
+    finally:
+        db.close()
+
+async def run_product_generation(product_id: int, step_timings: Optional[StepTimings] = None) -> Optional[ProductStatus]:
+    """Run the generator, then QC and metadata in parallel, for a DRAFT product.
+
+    Database sessions are only held around the short read and write phases,
+    never across Claude calls, and those phases run in worker threads so the
+    event loop keeps serving other products meanwhile. Step timings are added
+    to `step_timings`, which the worker writes to the job once per run.
+    """
+    product = await asyncio.to_thread(_load_product, product_id)
+    if product is None:
+        logger.warning(f"Product {product_id} not found for generation")
+        return None
+
+    if product["status"] != ProductStatus.DRAFT:
+        # Already processed (e.g. job was requeued after a restart)
+        return product["status"]
+
+    job_id = product["job_id"]
+    product_type = product["product_type"]
+    grade_level = product["grade_level"]
+    curriculum = product["curriculum"]
+    standard_text = product["standard_text"]
+
+    if standard_text is None:
+        logger.error(f"Standard not found for product {product_id}")
+        await asyncio.to_thread(_finish_product, product_id, ProductStatus.FAILED)
+        return ProductStatus.FAILED
+
+    async def generate(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return await generator_agent.generate_content(
+            product_id=product_id,
+            product_type=product_type,
+            standard=standard_text,
+            grade_level=grade_level,
+            curriculum=curriculum
+        )
+
+    async def quality_control(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return await qc_agent.evaluate_content(
+            product_id=product_id,
+            product_type=product_type,
+            content=inputs["generate"],
+            standard=standard_text,
+            grade_level=grade_level
+        )
+
+    async def metadata(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return await metadata_agent.generate_metadata(
+            product_id=product_id,
+            product_type=product_type,
+            content=inputs["generate"],
+            standard=standard_text,
+            grade_level=grade_level,
+            curriculum=curriculum
+        )
+
+    def step_finished(result: StepResult) -> None:
+        if result.status != StepStatus.SKIPPED:
+            prometheus.agent_step_duration.labels(result.name, result.status).observe(result.duration_ms / 1000)
+        if job_id:
+            publish_job_event({
+                "type": "step_finished",
+                "job_id": job_id,
+                "product_id": product_id,
+                "step": result.name,
+                "status": result.status,
+                "duration_ms": round(result.duration_ms, 1)
+            })
+
+    logger.info("Starting AI generation for product %s", product_id)
+    if job_id:
+        publish_job_event({"type": "product_started", "job_id": job_id, "product_id": product_id})
+
+    # QC and metadata only depend on the generated content, so they run concurrently
+    results = await run_dag([
+        AgentStep("generate", generate),
+        AgentStep("qc", quality_control, depends_on=["generate"]),
+        AgentStep("metadata", metadata, depends_on=["generate"]),
+    ], on_step_finished=step_finished)
+
+    qc_step = results["qc"]
+    if not results["generate"].succeeded:
+        logger.error(f"AI generation failed for product {product_id}: {results['generate'].error}")
+        status = ProductStatus.FAILED
+    elif not qc_step.succeeded:
+        logger.error(f"QC step failed for product {product_id}: {qc_step.error}")
+        status = ProductStatus.FAILED
+    elif not results["metadata"].succeeded:
+        logger.error(f"Metadata step failed for product {product_id}: {results['metadata'].error}")
+        status = ProductStatus.FAILED
+    elif qc_step.value['verdict'] == 'PASS':
+        status = ProductStatus.GENERATED
+        logger.info("Product %s generated successfully (QC: %s%%)", product_id, qc_step.value['score'])
+    else:
+        status = ProductStatus.FAILED
+        logger.warning(f"Product {product_id} failed QC: {qc_step.value['verdict']} (score: {qc_step.value['score']}%)")
+
+    if step_timings is not None:
+        add_step_results(step_timings, results)
+    await asyncio.to_thread(_finish_product, product_id, status, results)
+    if status == ProductStatus.GENERATED and settings.pdf_render_eager:
+        # Render now so downloads never wait on ReportLab
+        pdf_render_service.schedule(product_id, product_type, results["generate"].value)
+    return status
@@ -0,0 +1,206 @@
+# Background execution engine for generation jobs
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.product import Product
+from app.models.generation_job import GenerationJob
+from app.core.enums import JobType, ProductStatus
+from app.ai.rate_limiter import Priority, claude_priority
+from app.services.generation_pipeline import run_product_generation
+from app.services.job_status import (
+    StepTimings,
+    claim_pending_jobs,
+    count_pending_jobs,
+    reconcile_job_progress,
+    record_step_timings,
+    requeue_jobs,
+    requeue_stale_jobs,
+)
+from app.utils.logger import get_logger, log_context
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+class GenerationWorker:
+    """
+    Picks up PENDING generation jobs from the database and runs the agent
+    chain for their DRAFT products with bounded concurrency.
+
+    Jobs are claimed by flipping them to RUNNING, so the queue is durable:
+    anything left unfinished on shutdown is requeued, and jobs abandoned by
+    a crashed process are requeued once they go stale. All database work
+    runs in worker threads so the event loop never blocks on it.
+    """
+
+    def __init__(self):
+        self.concurrency = settings.generation_worker_concurrency
+        self.poll_interval = settings.generation_worker_poll_interval
+        self.stale_after = settings.generation_job_stale_after
+        self.bundle_concurrency = settings.generation_bundle_concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._job_tasks: Dict[int, asyncio.Task] = {}
+        self._running = False
+
+    @property
+    def active_jobs(self) -> int:
+        return len(self._job_tasks)
+
+    def start(self) -> None:
+        """Start the polling loop on the running event loop"""
+        if self._running:
+            return
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._running = True
+        self._loop_task = asyncio.create_task(self._run())
+        logger.info("Generation worker started (concurrency: %s)", self.concurrency)
+
+    async def stop(self) -> None:
+        """Cancel in-flight work and hand unfinished jobs back to the queue"""
+        if not self._running:
+            return
+        self._running = False
+
+        # Capture before cancelling - done callbacks remove finished jobs
+        unfinished = list(self._job_tasks.keys())
+        tasks: List[asyncio.Task] = list(self._job_tasks.values())
+        if self._loop_task:
+            tasks.append(self._loop_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._job_tasks.clear()
+        if unfinished:
+            await asyncio.to_thread(self._with_session, requeue_jobs, unfinished)
+
+        logger.info("Generation worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker immediately instead of waiting for the next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @staticmethod
+    def _with_session(func, *args):
+        """Run a job_status helper with its own session (called via asyncio.to_thread)"""
+        db = SessionLocal()
+        try:
+            return func(db, *args)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.to_thread(self._with_session, requeue_stale_jobs, self.stale_after)
+        except Exception as e:
+            logger.error(f"Failed to requeue stale generation jobs: {e}")
+
+        while self._running:
+            try:
+                await self._claim_jobs()
+            except Exception as e:
+                logger.error(f"Generation worker failed to claim jobs: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    @staticmethod
+    def _claim(db, capacity: int) -> Tuple[List[int], int]:
+        job_ids = claim_pending_jobs(db, capacity) if capacity > 0 else []
+        return job_ids, count_pending_jobs(db)
+
+    async def _claim_jobs(self) -> None:
+        capacity = self.concurrency - len(self._job_tasks)
+
+        job_ids, pending = await asyncio.to_thread(self._with_session, self._claim, capacity)
+        # Refreshed even when saturated - that is when the backlog grows
+        prometheus.generation_queue_depth.set(pending)
+
+        for job_id in job_ids:
+            task = asyncio.create_task(self._process_job(job_id))
+            self._job_tasks[job_id] = task
+            task.add_done_callback(lambda _, job_id=job_id: self._job_done(job_id))
+        prometheus.generation_active_jobs.set(len(self._job_tasks))
+
+    def _job_done(self, job_id: int) -> None:
+        self._job_tasks.pop(job_id, None)
+        prometheus.generation_active_jobs.set(len(self._job_tasks))
+        # A slot freed up - look for more work
+        self.notify()
+
+    async def _process_job(self, job_id: int) -> None:
+        # Product tasks created below inherit the job_id log context
+        with log_context(job_id=job_id):
+            await self._run_job(job_id)
+
+    @staticmethod
+    def _load_job(db, job_id: int) -> Tuple[Optional[JobType], List[int]]:
+        job_type = db.query(GenerationJob.job_type).filter(GenerationJob.id == job_id).scalar()
+        product_ids = [
+            product_id for (product_id,) in db.query(Product.id).filter(
+                Product.generation_job_id == job_id,
+                Product.status == ProductStatus.DRAFT
+            ).order_by(Product.id).all()
+        ]
+        return job_type, product_ids
+
+    async def _run_job(self, job_id: int) -> None:
+        job_type, product_ids = await asyncio.to_thread(self._with_session, self._load_job, job_id)
+
+        logger.info("Processing generation job %s: %s products", job_id, len(product_ids))
+
+        if product_ids:
+            # Bundle fan-out queues behind interactive single-product requests for Claude slots
+            priority = Priority.BULK if job_type == JobType.FULL_BUNDLE else Priority.INTERACTIVE
+            # Cap each bundle's share of the worker so one catalogue run can't take every slot
+            job_slots = asyncio.Semaphore(
+                self.bundle_concurrency if job_type == JobType.FULL_BUNDLE else self.concurrency
+            )
+            errored: Set[int] = set()
+            timings: StepTimings = {}
+            try:
+                with claude_priority(priority):
+                    while product_ids:
+                        succeeded = await asyncio.gather(
+                            *(self._run_product(product_id, job_slots, timings) for product_id in product_ids)
+                        )
+                        errored.update(product_id for product_id, ok in zip(product_ids, succeeded) if not ok)
+                        # Products reopened (FAILED -> DRAFT) while the job ran missed the list loaded above.
+                        # Once none are left the job is COMPLETED, and a later reopen requeues it instead.
+                        _, drafts = await asyncio.to_thread(self._with_session, self._load_job, job_id)
+                        # Products that errored stay DRAFT; the stale-job requeue retries them, not this loop
+                        product_ids = [product_id for product_id in drafts if product_id not in errored]
+                        if product_ids:
+                            logger.info("Generation job %s: %s reopened products to generate", job_id, len(product_ids))
+            finally:
+                # One write per run; also keeps what finished before a shutdown cancelled the rest
+                try:
+                    await asyncio.to_thread(self._with_session, record_step_timings, job_id, timings)
+                except Exception as e:
+                    logger.error(f"Failed to record step timings for job {job_id}: {e}")
+        else:
+            # Nothing left to generate (e.g. requeued after all products finished)
+            await asyncio.to_thread(self._with_session, reconcile_job_progress, job_id)
+
+    async def _run_product(self, product_id: int, job_slots: asyncio.Semaphore, timings: StepTimings) -> bool:
+        """False if generation raised (the product may still be DRAFT)"""
+        async with job_slots, self._slots:
+            prometheus.generation_products_in_flight.inc()
+            try:
+                with log_context(product_id=product_id):
+                    await run_product_generation(product_id, timings)
+                return True
+            except Exception as e:
+                logger.error(f"Generation worker failed on product {product_id}: {e}")
+                return False
+            finally:
+                prometheus.generation_products_in_flight.dec()
+
+generation_worker = GenerationWorker()
@@ -0,0 +1,197 @@
+# In-process pub/sub for live generation job progress, bridged across
+# processes with Postgres LISTEN/NOTIFY
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JobEvent = Dict[str, Any]
+
+class JobEventBus:
+    """
+    Fans job events out to subscriber queues keyed by job ID.
+
+    With the Postgres bridge enabled, events are published with NOTIFY and
+    every process (including the publisher) delivers them from its LISTEN
+    connection, so viewers attached to any uvicorn worker see every event.
+    """
+
+    CHANNEL = "rbb_job_events"
+
+    def __init__(self):
+        backend = settings.job_events_backend
+        if backend == "auto":
+            backend = "postgres" if settings.database_url.startswith("postgresql") else "local"
+        self.uses_postgres = backend == "postgres"
+        self.queue_size = settings.job_events_queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_engine = None
+        self._listen_conn = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Bind to the running event loop and open the LISTEN connection if bridged"""
+        self._loop = asyncio.get_running_loop()
+        if self.uses_postgres:
+            self._listen_engine = create_engine(settings.database_url, poolclass=NullPool)
+            await self._listen()
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._close_listener()
+        if self._listen_engine is not None:
+            self._listen_engine.dispose()
+            self._listen_engine = None
+
+    def subscribe(self, job_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+
+    def publish_local(self, event: JobEvent) -> None:
+        """Deliver to this process's subscribers; safe to call from any thread"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: JobEvent) -> None:
+        for queue in list(self._subscribers.get(event.get("job_id"), ())):
+            if queue.full():
+                # Slow viewer - drop its oldest event rather than block publishers
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        try:
+            raw = await asyncio.to_thread(self._listen_engine.raw_connection)
+            conn = raw.driver_connection
+            conn.set_session(autocommit=True)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.CHANNEL}")
+        except Exception as e:
+            logger.error(f"Job event bridge failed to LISTEN: {e}")
+            self._schedule_reconnect()
+            return
+
+        self._listen_conn = raw
+        self._loop.add_reader(conn.fileno(), self._on_notify)
+        logger.info("Job event bridge listening on '%s'", self.CHANNEL)
+
+    def _on_notify(self) -> None:
+        conn = self._listen_conn.driver_connection
+        try:
+            conn.poll()
+        except Exception as e:
+            logger.error(f"Job event bridge connection lost: {e}")
+            self._close_listener()
+            self._schedule_reconnect()
+            return
+
+        while conn.notifies:
+            notification = conn.notifies.pop(0)
+            try:
+                self._deliver(json.loads(notification.payload))
+            except ValueError:
+                logger.warning("Ignoring malformed job event payload")
+
+    def _close_listener(self) -> None:
+        if self._listen_conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._listen_conn.driver_connection.fileno())
+        except Exception:
+            pass
+        try:
+            self._listen_conn.close()
+        except Exception:
+            pass
+        self._listen_conn = None
+
+    def _schedule_reconnect(self) -> None:
+        async def reconnect() -> None:
+            await asyncio.sleep(settings.job_events_reconnect_delay)
+            self._reconnect_task = None
+            await self._listen()
+
+        if self._reconnect_task is None and self._loop is not None:
+            self._reconnect_task = self._loop.create_task(reconnect())
+
+job_event_bus = JobEventBus()
+
+PENDING_EVENTS_KEY = "pending_job_events"
+
+def publish_job_event(event_data: JobEvent, db: Optional[Session] = None) -> None:
+    """Publish a job event.
+
+    When a session is given the event is tied to its transaction and only
+    delivered if it commits: bridged through Postgres the NOTIFY joins the
+    transaction, and locally the event waits for the session's after_commit.
+    Without a session, a bridged publish from the event loop is sent from a
+    background thread so the loop never waits on the database.
+    """
+    if not job_event_bus.uses_postgres:
+        if db is not None:
+            db.info.setdefault(PENDING_EVENTS_KEY, []).append(event_data)
+        else:
+            job_event_bus.publish_local(event_data)
+        return
+
+    if db is not None:
+        payload = json.dumps(event_data, default=str)
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": JobEventBus.CHANNEL, "payload": payload})
+        return
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Already off the loop (worker thread or script)
+        _notify(event_data)
+        return
+    # On the event loop: hand the round-trip to the notifier thread, which keeps events in order
+    _notifier.submit(_notify, event_data)
+
+# One thread so NOTIFYs from the event loop go out in publish order
+_notifier = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-event-notify")
+
+def _notify(event_data: JobEvent) -> None:
+    """NOTIFY in a transaction of its own"""
+    payload = json.dumps(event_data, default=str)
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": JobEventBus.CHANNEL, "payload": payload})
+        session.commit()
+    except Exception as e:
+        logger.warning(f"Failed to publish job event {event_data.get('type')}: {e}")
+    finally:
+        session.close()
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session) -> None:
+    for event_data in session.info.pop(PENDING_EVENTS_KEY, ()):
+        job_event_bus.publish_local(event_data)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_events(session: Session) -> None:
+    session.info.pop(PENDING_EVENTS_KEY, None)
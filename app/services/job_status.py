@@ -1,8 +1,26 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import and_, case, func, literal, update
 from sqlalchemy.orm import Session
 from app.models.generation_job import GenerationJob
 from app.models.product import Product
+from app.core.config import settings
 from app.core.enums import JobStatus, ProductStatus
-from app.utils.logger import logger
+from app.schemas.generation_job import GenerationJobRead
+from app.services.agent_dag import StepResult, StepStatus
+from app.services.job_events import publish_job_event
+from app.utils.cache import TTLCache
+from app.utils.logger import get_logger
+from app.utils import prometheus
+
+logger = get_logger(__name__)
+
+# Short-lived read cache for job polling; writes in this process invalidate it,
+# other processes see changes once the TTL lapses
+job_snapshot_cache: TTLCache[GenerationJobRead] = TTLCache(
+    settings.job_status_cache_max_entries,
+    settings.job_status_cache_ttl
+)
 
 def mark_job_running(db: Session, job_id: int) -> None:
     """Mark job as running and log the transition"""
@@ -13,7 +31,8 @@ def mark_job_running(db: Session, job_id: int) -> None:
     
     job.status = JobStatus.RUNNING
     db.commit()
-    logger.info(f"Job {job_id} marked as RUNNING")
+    job_snapshot_cache.delete(job_id)
+    logger.info("Job %s marked as RUNNING", job_id)
 
 def mark_job_completed(db: Session, job_id: int) -> None:
     """Mark job as completed and log the transition"""
@@ -24,7 +43,8 @@ def mark_job_completed(db: Session, job_id: int) -> None:
     
     job.status = JobStatus.COMPLETED
     db.commit()
-    logger.info(f"Job {job_id} marked as COMPLETED")
+    job_snapshot_cache.delete(job_id)
+    logger.info("Job %s marked as COMPLETED", job_id)
 
 def mark_job_failed(db: Session, job_id: int) -> None:
     """Mark job as failed and log the transition"""
@@ -35,55 +55,138 @@ def mark_job_failed(db: Session, job_id: int) -> None:
     
     job.status = JobStatus.FAILED
     db.commit()
-    logger.info(f"Job {job_id} marked as FAILED")
+    job_snapshot_cache.delete(job_id)
+    logger.info("Job %s marked as FAILED", job_id)
 
-def update_job_progress(db: Session, job_id: int, product_id: int, new_status: ProductStatus) -> None:
-    """Update job progress counters when product status changes"""
-    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
-    if not job:
-        logger.warning(f"Job {job_id} not found for progress update")
-        return
+def transition_product_status(
+    db: Session,
+    product: Product,
+    new_status: ProductStatus,
+    expected_status: Optional[ProductStatus] = None
+) -> bool:
+    """Move a product to `new_status` and adjust its job counters in one transaction.
+
+    The product update is guarded on its current status, so concurrent or
+    repeated transitions are applied (and counted) exactly once. Returns
+    False if the product was no longer in the expected status.
+    """
+    old_status = expected_status or product.status
+    product_id = product.id
+    job_id = product.generation_job_id
     
-    # Count products by status
-    products = db.query(Product).filter(Product.generation_job_id == job_id).all()
+    updated = db.query(Product).filter(
+        Product.id == product_id,
+        Product.status == old_status
+    ).update({Product.status: new_status}, synchronize_session=False)
     
-    total = len(products)
-    completed = sum(1 for p in products if p.status == ProductStatus.GENERATED)
-    failed = sum(1 for p in products if p.status == ProductStatus.FAILED)
+    if not updated:
+        db.rollback()
+        logger.warning(f"Product {product_id} is no longer {old_status.value}; skipped transition to {new_status.value}")
+        return False
     
-    # Update job tracking fields
-    job.total_products = total
-    job.completed_products = completed
-    job.failed_products = failed
-    
-    # Update job status based on completion
-    old_status = job.status
-    if completed + failed == total and total > 0:
-        job.status = JobStatus.COMPLETED
-        logger.info(f"Job {job_id} completed: {completed} generated, {failed} failed")
-    elif completed > 0 or failed > 0:
-        job.status = JobStatus.RUNNING
+    if job_id and old_status != new_status:
+        if new_status in (ProductStatus.GENERATED, ProductStatus.FAILED):
+            publish_job_event({
+                "type": "product_finished",
+                "job_id": job_id,
+                "product_id": product_id,
+                "status": new_status.value
+            }, db)
+        update_job_progress(db, job_id, product_id, old_status, new_status)
     
     db.commit()
+    db.expire(product)
+    if job_id:
+        job_snapshot_cache.delete(job_id)
+    return True
+
+def update_job_progress(
+    db: Session,
+    job_id: int,
+    product_id: int,
+    old_status: ProductStatus,
+    new_status: ProductStatus
+) -> None:
+    """Apply one product transition to the job counters with a single atomic UPDATE.
+
+    Does not commit - callers run it in the same transaction as the product change.
+    """
+    completed_delta = int(new_status == ProductStatus.GENERATED) - int(old_status == ProductStatus.GENERATED)
+    failed_delta = int(new_status == ProductStatus.FAILED) - int(old_status == ProductStatus.FAILED)
     
-    if old_status != job.status:
-        logger.info(f"Job {job_id} status changed from {old_status} to {job.status}")
+    # SET expressions see pre-update column values, so recompute the new totals inline
+    finished = (
+        GenerationJob.completed_products + completed_delta
+        + GenerationJob.failed_products + failed_delta
+    )
+    status_type = GenerationJob.status.type
+    status_cases = []
+    if new_status == ProductStatus.DRAFT:
+        # A product sent back for regeneration reopens a finished job for the worker
+        status_cases.append((GenerationJob.status == JobStatus.COMPLETED, literal(JobStatus.PENDING, status_type)))
+    status_cases += [
+        (
+            and_(GenerationJob.total_products > 0, finished >= GenerationJob.total_products),
+            literal(JobStatus.COMPLETED, status_type)
+        ),
+        (finished > 0, literal(JobStatus.RUNNING, status_type)),
+    ]
+    
+    row = db.execute(
+        update(GenerationJob)
+        .where(GenerationJob.id == job_id)
+        .values(
+            completed_products=GenerationJob.completed_products + completed_delta,
+            failed_products=GenerationJob.failed_products + failed_delta,
+            status=case(*status_cases, else_=GenerationJob.status)
+        )
+        .returning(
+            GenerationJob.status,
+            GenerationJob.completed_products,
+            GenerationJob.failed_products,
+            GenerationJob.total_products
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+    
+    if row is None:
+        logger.warning(f"Job {job_id} not found for progress update")
+        return
     
-    logger.info(f"Job {job_id} progress: {completed}/{total} completed, {failed} failed (product {product_id} → {new_status.value})")
+    job_snapshot_cache.delete(job_id)
+    status, completed, failed, total = row
+    progress = {
+        "job_id": job_id,
+        "status": status.value,
+        "total_products": total,
+        "completed_products": completed,
+        "failed_products": failed
+    }
+    publish_job_event({"type": "job_progress", **progress}, db)
+    if status == JobStatus.COMPLETED and new_status != ProductStatus.DRAFT:
+        publish_job_event({"type": "job_completed", **progress}, db)
+        prometheus.generation_jobs_completed_total.inc()
+        logger.info("Job %s completed: %s generated, %s failed", job_id, completed, failed)
+    
+    logger.info("Job %s progress: %s/%s completed, %s failed (product %s → %s)", job_id, completed, total, failed, product_id, new_status.value)
 
-def update_job_status(db: Session, job_id: int) -> None:
-    """Update generation job status based on associated products"""
-    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+def reconcile_job_progress(db: Session, job_id: int) -> None:
+    """Recompute job counters from its products with one GROUP BY aggregate"""
+    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).with_for_update().first()
     if not job:
-        logger.warning(f"Job {job_id} not found for status update")
+        logger.warning(f"Job {job_id} not found for reconciliation")
         return
     
-    # Count products by status
-    products = db.query(Product).filter(Product.generation_job_id == job_id).all()
+    counts = dict(
+        db.query(Product.status, func.count(Product.id))
+        .filter(Product.generation_job_id == job_id)
+        .group_by(Product.status)
+        .all()
+    )
     
-    total = len(products)
-    completed = sum(1 for p in products if p.status == ProductStatus.GENERATED)
-    failed = sum(1 for p in products if p.status == ProductStatus.FAILED)
+    total = sum(counts.values())
+    completed = counts.get(ProductStatus.GENERATED, 0)
+    failed = counts.get(ProductStatus.FAILED, 0)
     
     # Update job tracking fields
     job.total_products = total
@@ -96,14 +199,130 @@ def update_job_status(db: Session, job_id: int) -> None:
         job.status = JobStatus.PENDING
     elif completed + failed == total:
         job.status = JobStatus.COMPLETED
-    elif completed > 0 or failed > 0:
-        job.status = JobStatus.RUNNING
-    else:
+    elif job.status == JobStatus.COMPLETED:
+        # Draft products remain - hand the job back to the worker
         job.status = JobStatus.PENDING
     
     db.commit()
+    job_snapshot_cache.delete(job_id)
     
     if old_status != job.status:
-        logger.info(f"Job {job_id} status changed from {old_status} to {job.status}")
+        logger.info("Job %s status changed from %s to %s", job_id, old_status, job.status)
+    
+    logger.info("Reconciled job %s: %s/%s completed, %s failed", job_id, completed, total, failed)
+
+def claim_pending_jobs(db: Session, limit: int) -> List[int]:
+    """Atomically move up to `limit` PENDING jobs to RUNNING and return their IDs"""
+    jobs = (
+        db.query(GenerationJob)
+        .filter(GenerationJob.status == JobStatus.PENDING)
+        .order_by(GenerationJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    
+    for job in jobs:
+        job.status = JobStatus.RUNNING
+    db.commit()
+    
+    job_ids = [job.id for job in jobs]
+    for job_id in job_ids:
+        job_snapshot_cache.delete(job_id)
+    if job_ids:
+        logger.info("Claimed %s pending generation jobs: %s", len(job_ids), job_ids)
+    return job_ids
+
+def count_pending_jobs(db: Session) -> int:
+    """Number of PENDING jobs waiting for a worker (served by the status index)"""
+    return db.query(func.count(GenerationJob.id)).filter(GenerationJob.status == JobStatus.PENDING).scalar() or 0
+
+def requeue_jobs(db: Session, job_ids: List[int]) -> None:
+    """Return unfinished RUNNING jobs to PENDING so another worker can pick them up"""
+    if not job_ids:
+        return
+    
+    requeued = db.query(GenerationJob).filter(
+        GenerationJob.id.in_(job_ids),
+        GenerationJob.status == JobStatus.RUNNING
+    ).update({GenerationJob.status: JobStatus.PENDING}, synchronize_session=False)
+    db.commit()
+    
+    if requeued:
+        logger.info("Requeued %s unfinished generation jobs", requeued)
+
+def requeue_stale_jobs(db: Session, stale_after_seconds: int) -> None:
+    """Requeue RUNNING jobs whose worker stopped reporting progress (e.g. after a crash)"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds)
+    
+    requeued = db.query(GenerationJob).filter(
+        GenerationJob.status == JobStatus.RUNNING,
+        GenerationJob.updated_at < cutoff
+    ).update({GenerationJob.status: JobStatus.PENDING}, synchronize_session=False)
+    db.commit()
+    
+    if requeued:
+        logger.warning(f"Requeued {requeued} stale RUNNING generation jobs")
+
+StepTimings = Dict[str, Dict[str, float]]
+
+def _empty_step_stats() -> Dict[str, float]:
+    return {"runs": 0, "failures": 0, "skipped": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+def add_step_results(timings: StepTimings, step_results: Dict[str, StepResult]) -> None:
+    """Fold one product's per-step agent timings into an in-memory aggregate"""
+    for name, result in step_results.items():
+        stats = timings.setdefault(name, _empty_step_stats())
+        if result.status == StepStatus.SKIPPED:
+            stats["skipped"] += 1
+            continue
+        stats["runs"] += 1
+        if result.status == StepStatus.FAILED:
+            stats["failures"] += 1
+        stats["total_ms"] = round(stats["total_ms"] + result.duration_ms, 1)
+        stats["max_ms"] = round(max(stats["max_ms"], result.duration_ms), 1)
+        stats["last_ms"] = round(result.duration_ms, 1)
+
+def record_step_timings(db: Session, job_id: int, timings: StepTimings) -> None:
+    """Merge a job run's aggregated step timings into the job's running totals.
+
+    The worker calls this once per job run rather than once per product, so
+    concurrent products never contend for the job row (or, on SQLite, which
+    has no row locks, overwrite each other's updates).
+    """
+    if not timings:
+        return
+    
+    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).with_for_update().first()
+    if not job:
+        logger.warning(f"Job {job_id} not found for step timing update")
+        return
+    
+    # Reassign a fresh dict so SQLAlchemy detects the JSON change
+    merged = {name: dict(stats) for name, stats in (job.step_timings or {}).items()}
+    for name, batch in timings.items():
+        stats = merged.setdefault(name, _empty_step_stats())
+        for key in ("runs", "failures", "skipped"):
+            stats[key] += batch[key]
+        stats["total_ms"] = round(stats["total_ms"] + batch["total_ms"], 1)
+        stats["max_ms"] = max(stats["max_ms"], batch["max_ms"])
+        if "last_ms" in batch:
+            stats["last_ms"] = batch["last_ms"]
+    
+    job.step_timings = merged
+    db.commit()
+    job_snapshot_cache.delete(job_id)
+
+def get_job_snapshot(db: Session, job_id: int) -> Optional[GenerationJobRead]:
+    """Read-only view of a job's stored progress counters (never recomputes or writes)"""
+    snapshot = job_snapshot_cache.get(job_id)
+    if snapshot is not None:
+        return snapshot
+    
+    job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+    if not job:
+        return None
     
-    logger.info(f"Updated job {job_id}: {completed}/{total} completed, {failed} failed")
\ No newline at end of file
+    snapshot = GenerationJobRead.model_validate(job)
+    job_snapshot_cache.set(job_id, snapshot)
+    return snapshot
@@ -0,0 +1,142 @@
+# Off-loop PDF rendering: ReportLab builds run in a process pool behind a bounded, coalescing queue
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.enums import FileType
+from app.services.render_errors import RenderQueueFull
+from app.services.thumbnail_render import thumbnail_service
+from app.utils.logger import get_logger
+from app.utils import prometheus
+from app.utils.pdf_generator import pdf_generator
+from app.utils.storage import storage_manager
+
+logger = get_logger(__name__)
+
+def _render_in_worker(product_id: int, product_type: str, content_data: Dict[str, Any]) -> Tuple[str, float]:
+    """Runs in a pool process: build the file and report how long it took"""
+    started = time.perf_counter()
+    pdf_path = pdf_generator.render_pdf(product_id, product_type, content_data)
+    return str(pdf_path), time.perf_counter() - started
+
+class PDFRenderService:
+    """
+    Renders PDFs in a ProcessPoolExecutor so CPU-bound ReportLab builds
+    never block the event loop.
+
+    Concurrent requests for the same product share one render, at most
+    `queue_size` distinct renders are pending or running at once, and
+    callers stop waiting after `timeout` seconds - the render itself keeps
+    going, and later callers join it. Workers are spawned rather than
+    forked so they never inherit the parent's database connections or
+    logging thread.
+    """
+
+    def __init__(self):
+        self.workers = settings.pdf_render_workers
+        self.queue_size = settings.pdf_render_queue_size
+        self.timeout = settings.pdf_render_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._renders: Dict[int, "asyncio.Task[Path]"] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._renders)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created on first use so scripts and the worker-only process don't pay for idle workers
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("PDF render pool started (%s workers)", self.workers)
+        return self._pool
+
+    async def stop(self) -> None:
+        """Cancel queued renders and shut the pool down"""
+        for task in list(self._renders.values()):
+            task.cancel()
+        await asyncio.gather(*self._renders.values(), return_exceptions=True)
+        self._renders.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("PDF render pool stopped")
+
+    async def render(
+        self,
+        product_id: int,
+        product_type: str,
+        content_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Path:
+        """Render (or join the in-flight render of) a product's PDF and return its path.
+
+        Raises RenderQueueFull when the queue is saturated and
+        asyncio.TimeoutError when the render outlives `timeout`.
+        """
+        task = self._renders.get(product_id)
+        if task is None:
+            task = self._submit(product_id, product_type, content_data)
+        else:
+            prometheus.pdf_render_coalesced_total.inc()
+
+        # Shielded: one caller timing out or disconnecting must not cancel the shared render
+        return await asyncio.wait_for(asyncio.shield(task), self.timeout if timeout is None else timeout)
+
+    def schedule(self, product_id: int, product_type: str, content_data: Dict[str, Any]) -> None:
+        """Start a render in the background (e.g. when a product becomes GENERATED)"""
+        if product_id in self._renders:
+            return
+        try:
+            self._submit(product_id, product_type, content_data)
+        except RenderQueueFull:
+            # The first download renders it instead
+            logger.warning("PDF render queue full; skipped eager render for product %s", product_id)
+
+    def _submit(self, product_id: int, product_type: str, content_data: Dict[str, Any]) -> "asyncio.Task[Path]":
+        if len(self._renders) >= self.queue_size:
+            prometheus.pdf_render_rejected_total.inc()
+            raise RenderQueueFull(f"{len(self._renders)} PDF renders already queued")
+
+        task = asyncio.create_task(self._run(product_id, product_type, content_data))
+        self._renders[product_id] = task
+        prometheus.pdf_render_queue_depth.set(len(self._renders))
+        task.add_done_callback(lambda done, product_id=product_id: self._finished(product_id, done))
+        return task
+
+    def _finished(self, product_id: int, task: "asyncio.Task[Path]") -> None:
+        if self._renders.get(product_id) is task:
+            del self._renders[product_id]
+        prometheus.pdf_render_queue_depth.set(len(self._renders))
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("PDF render failed for product %s: %s", product_id, task.exception())
+
+    async def _run(self, product_id: int, product_type: str, content_data: Dict[str, Any]) -> Path:
+        loop = asyncio.get_running_loop()
+        try:
+            path, seconds = await loop.run_in_executor(
+                self._get_pool(), _render_in_worker, product_id, product_type, content_data
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM) - start a fresh pool for the next render
+            logger.error("PDF render pool broke while rendering product %s; recreating", product_id)
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            raise
+
+        prometheus.pdf_render_duration.labels(product_type.upper()).observe(seconds)
+        pdf_path = Path(path)
+        # Checksumming reads the file back - keep that off the loop too
+        stored = await asyncio.to_thread(storage_manager.register_file, product_id, FileType.PDF, pdf_path)
+        thumbnail_service.schedule(product_id, pdf_path, stored.checksum)
+        logger.info("Rendered PDF for product %s in %.2fs", product_id, seconds)
+        return pdf_path
+
+pdf_render_service = PDFRenderService()
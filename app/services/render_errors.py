@@ -0,0 +1,4 @@
+# Errors shared by the PDF and thumbnail render queues
+
+class RenderQueueFull(Exception):
+    """More renders are queued than the render queue size allows"""
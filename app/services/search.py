@@ -0,0 +1,249 @@
+# Ranked search over standards and product metadata
+# Postgres uses the pg_trgm / tsvector indexes from migration 008; SQLite (local
+# runs) uses FTS5 trigram tables kept in sync by triggers created at startup.
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.enums import CurriculumBoard, Locale, ProductType
+from app.models.product_search import ProductSearch
+from app.services.standards_catalog import standards_catalog
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# FTS5 table -> (source table, key column, indexed columns, bm25 column weights)
+_FTS_TABLES = {
+    "standards_fts": ("standards", "id", ("code", "description"), (10.0, 1.0)),
+    "product_search_fts": (
+        "product_search", "product_id",
+        ("title", "description", "tags", "keywords", "topic"),
+        (10.0, 2.0, 5.0, 5.0, 1.0)
+    ),
+}
+
+# The trigram tokenizer can't match terms shorter than one trigram
+_MIN_FTS_TERM = 3
+
+class SearchPage:
+    def __init__(self, items: List[Any], limit: int, offset: int, has_next: bool):
+        self.items = items
+        self.limit = limit
+        self.offset = offset
+        self.has_next = has_next
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "pagination": {"limit": self.limit, "offset": self.offset, "has_next": self.has_next}
+        }
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _fts_match(term: str) -> Optional[str]:
+    """FTS5 query requiring every word of 3+ characters, or None if there are none"""
+    words = [word for word in term.split() if len(word) >= _MIN_FTS_TERM]
+    if not words:
+        return None
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+def _filter_sql(alias: str, filters: Dict[str, Any], params: Dict[str, Any]) -> str:
+    clauses = []
+    for column, value in filters.items():
+        if value is None:
+            continue
+        params[column] = value.value if isinstance(value, Enum) else value
+        clauses.append(f" AND {alias}.{column} = :{column}")
+    return "".join(clauses)
+
+def _page(rows: List[Any], limit: int, offset: int) -> Tuple[List[Any], bool]:
+    return rows[:limit], len(rows) > limit
+
+def ensure_search_schema(engine: Engine) -> None:
+    """Create the SQLite FTS5 tables and sync triggers (Postgres is covered by migration 008)"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        for fts_table, (source, key, columns, _) in _FTS_TABLES.items():
+            existing = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+            if source not in existing or fts_table in existing:
+                continue
+
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            old_values = ", ".join(f"old.{column}" for column in columns)
+            insert_new = f"INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.{key}, {new_values});"
+            delete_old = (
+                f"INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) "
+                f"VALUES ('delete', old.{key}, {old_values});"
+            )
+
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+                f"{column_list}, content='{source}', content_rowid='{key}', tokenize='trigram')"
+            ))
+            conn.execute(text(f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {source} BEGIN {insert_new} END"))
+            conn.execute(text(f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {source} BEGIN {delete_old} END"))
+            conn.execute(text(f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {source} BEGIN {delete_old} {insert_new} END"))
+            # Index rows written before the table existed
+            conn.execute(text(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')"))
+            logger.info("Created SQLite search index %s", fts_table)
+
+def _join_values(values: Any) -> Optional[str]:
+    if isinstance(values, (list, tuple)):
+        return ", ".join(str(value) for value in values if value)
+    return str(values) if values else None
+
+def index_product_metadata(db: Session, product_id: int, metadata: Dict[str, Any]) -> None:
+    """Upsert the searchable fields of a product's metadata.json (caller commits)"""
+    db.merge(ProductSearch(
+        product_id=product_id,
+        title=metadata.get("title"),
+        description=metadata.get("description"),
+        tags=_join_values(metadata.get("tags")),
+        keywords=_join_values(metadata.get("seo_keywords")),
+        topic=metadata.get("topic_focus")
+    ))
+
+def search_standards(
+    db: Session,
+    q: str,
+    curriculum_board: Optional[CurriculumBoard] = None,
+    grade_level: Optional[int] = None,
+    locale: Optional[Locale] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> SearchPage:
+    """Standards ranked by code and description relevance"""
+    term = q.strip()
+    params: Dict[str, Any] = {
+        "q": term,
+        "contains": f"%{_escape_like(term)}%",
+        "prefix": f"{_escape_like(term)}%",
+        "limit": limit + 1,
+        "offset": offset
+    }
+    filters = _filter_sql("s", {"curriculum_board": curriculum_board, "grade_level": grade_level, "locale": locale}, params)
+
+    if _is_postgres(db):
+        # Document expression must match ix_standards_document
+        sql = f"""
+            SELECT s.id,
+                   greatest(similarity(s.code, :q), word_similarity(:q, coalesce(s.description, '')))
+                   + ts_rank(to_tsvector('simple', code || ' ' || coalesce(description, '')), plainto_tsquery('simple', :q))
+                   + CASE WHEN lower(s.code) = lower(:q) THEN 2 WHEN s.code ILIKE :prefix THEN 1 ELSE 0 END AS score
+            FROM standards s
+            WHERE (s.code ILIKE :contains OR s.description ILIKE :contains
+                   OR s.code % :q OR :q <% s.description
+                   OR to_tsvector('simple', code || ' ' || coalesce(description, '')) @@ plainto_tsquery('simple', :q))
+                  {filters}
+            ORDER BY score DESC, s.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+    elif (match := _fts_match(term)) is not None:
+        params["match"] = match
+        sql = f"""
+            SELECT s.id,
+                   CASE WHEN lower(s.code) = lower(:q) THEN 2 WHEN s.code LIKE :prefix ESCAPE '\\' THEN 1 ELSE 0 END
+                   - bm25(standards_fts, {', '.join(map(str, _FTS_TABLES['standards_fts'][3]))}) AS score
+            FROM standards_fts JOIN standards s ON s.id = standards_fts.rowid
+            WHERE standards_fts MATCH :match {filters}
+            ORDER BY score DESC, s.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        sql = f"""
+            SELECT s.id,
+                   CASE WHEN lower(s.code) = lower(:q) THEN 2 WHEN s.code LIKE :prefix ESCAPE '\\' THEN 1 ELSE 0 END AS score
+            FROM standards s
+            WHERE (s.code LIKE :contains ESCAPE '\\' OR s.description LIKE :contains ESCAPE '\\') {filters}
+            ORDER BY score DESC, s.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+
+    rows, has_next = _page(db.execute(text(sql), params).all(), limit, offset)
+    items = []
+    for standard_id, score in rows:
+        standard = standards_catalog.get(db, standard_id)
+        if standard is not None:
+            items.append({**standard.model_dump(), "score": round(float(score), 4)})
+    return SearchPage(items, limit, offset, has_next)
+
+def search_products(
+    db: Session,
+    q: str,
+    curriculum_board: Optional[CurriculumBoard] = None,
+    grade_level: Optional[int] = None,
+    product_type: Optional[ProductType] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> SearchPage:
+    """Products ranked by metadata relevance (title, then tags/keywords, then description/topic)"""
+    term = q.strip()
+    params: Dict[str, Any] = {
+        "q": term,
+        "contains": f"%{_escape_like(term)}%",
+        "limit": limit + 1,
+        "offset": offset
+    }
+    filters = _filter_sql(
+        "p", {"curriculum_board": curriculum_board, "grade_level": grade_level, "product_type": product_type}, params
+    )
+    columns = """ps.product_id, ps.title, ps.description, ps.tags,
+                 p.product_type, p.grade_level, p.curriculum_board, p.status"""
+
+    if _is_postgres(db):
+        sql = f"""
+            SELECT {columns},
+                   ts_rank(ps.document, websearch_to_tsquery('english', :q))
+                   + coalesce(similarity(ps.title, :q), 0) AS score
+            FROM product_search ps JOIN products p ON p.id = ps.product_id
+            WHERE (ps.document @@ websearch_to_tsquery('english', :q)
+                   OR ps.title ILIKE :contains OR ps.title % :q)
+                  {filters}
+            ORDER BY score DESC, ps.product_id DESC
+            LIMIT :limit OFFSET :offset
+        """
+    elif (match := _fts_match(term)) is not None:
+        params["match"] = match
+        sql = f"""
+            SELECT {columns},
+                   -bm25(product_search_fts, {', '.join(map(str, _FTS_TABLES['product_search_fts'][3]))}) AS score
+            FROM product_search_fts
+            JOIN product_search ps ON ps.product_id = product_search_fts.rowid
+            JOIN products p ON p.id = ps.product_id
+            WHERE product_search_fts MATCH :match {filters}
+            ORDER BY score DESC, ps.product_id DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        sql = f"""
+            SELECT {columns}, 0 AS score
+            FROM product_search ps JOIN products p ON p.id = ps.product_id
+            WHERE (ps.title LIKE :contains ESCAPE '\\' OR ps.tags LIKE :contains ESCAPE '\\') {filters}
+            ORDER BY ps.product_id DESC
+            LIMIT :limit OFFSET :offset
+        """
+
+    rows, has_next = _page(db.execute(text(sql), params).mappings().all(), limit, offset)
+    items = [
+        {
+            "product_id": row["product_id"],
+            "title": row["title"],
+            "description": row["description"],
+            "tags": row["tags"].split(", ") if row["tags"] else [],
+            "product_type": row["product_type"],
+            "grade_level": row["grade_level"],
+            "curriculum_board": row["curriculum_board"],
+            "status": row["status"],
+            "score": round(float(row["score"]), 4)
+        }
+        for row in rows
+    ]
+    return SearchPage(items, limit, offset, has_next)
@@ -0,0 +1,238 @@
+# Warm in-memory index of the standards catalogue for lookups and generation requests
+import asyncio
+import heapq
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.enums import CurriculumBoard, Locale
+from app.db.session import SessionLocal
+from app.models.standard import Standard
+from app.schemas.standard import StandardRead
+from app.utils.cache import TTLCache
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Characters that start a new segment in codes like "CBSE.MATH.6.1"
+_SEGMENT_SEPARATORS = ".-_ /"
+
+class _Entry:
+    __slots__ = ("standard", "code", "description", "words")
+
+    def __init__(self, standard: StandardRead):
+        self.standard = standard
+        self.code = standard.code.lower()
+        self.description = (standard.description or "").lower()
+        self.words = tuple(self.description.split())
+
+    def rank(self, term: str) -> Optional[int]:
+        """Lower is better; None if the entry doesn't match"""
+        if self.code == term:
+            return 0
+        if self.code.startswith(term):
+            return 1
+        position = self.code.find(term)
+        if position > 0:
+            return 2 if self.code[position - 1] in _SEGMENT_SEPARATORS else 3
+        if any(word.startswith(term) for word in self.words):
+            return 4
+        if term in self.description:
+            return 5
+        return None
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class _Snapshot:
+    """Immutable index over one version of the catalogue"""
+
+    def __init__(self, standards: List[StandardRead], version: Tuple[int, int]):
+        self.version = version
+        self.entries = [_Entry(standard) for standard in standards]  # Newest first
+        self.by_id: Dict[int, _Entry] = {entry.standard.id: entry for entry in self.entries}
+        # Quick Generate usually fixes curriculum and grade first - search only that slice
+        self.by_curriculum_grade: Dict[Tuple[CurriculumBoard, int], Set[int]] = {}
+        # Trigram postings narrow substring searches to a few candidates
+        self.postings: Dict[str, Set[int]] = {}
+        for index, entry in enumerate(self.entries):
+            key = (entry.standard.curriculum_board, entry.standard.grade_level)
+            self.by_curriculum_grade.setdefault(key, set()).add(index)
+            for gram in _trigrams(entry.code) | _trigrams(entry.description):
+                self.postings.setdefault(gram, set()).add(index)
+        # Results for repeated keystrokes; discarded with the snapshot
+        self.results: TTLCache[List[StandardRead]] = TTLCache(1024, float("inf"))
+
+    def candidates(
+        self,
+        term: str,
+        curriculum_board: Optional[CurriculumBoard],
+        grade_level: Optional[int]
+    ) -> Iterable[int]:
+        sets = []
+        if curriculum_board is not None and grade_level is not None:
+            sets.append(self.by_curriculum_grade.get((curriculum_board, grade_level), set()))
+        if len(term) >= 3:
+            sets.extend(self.postings.get(gram, set()) for gram in _trigrams(term))
+        if not sets:
+            return range(len(self.entries))
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+class StandardsCatalog:
+    """
+    Versioned in-memory copy of all standards.
+
+    Loaded at startup and swapped atomically on reload. Writes in this
+    process invalidate it. Other processes' inserts, and deletes that change
+    the row count, are detected by a cheap version check (row count + max
+    ID) every `refresh_interval` seconds. The version can't see in-place
+    edits or a delete paired with an insert below the max ID (standards have
+    no updated_at); those appear after a restart or a local write.
+
+    Version checks and reloads always use their own sync session. Async
+    routes await `ensure_fresh()` first, which runs them in a worker thread,
+    so the lookups they then make through `db.run_sync` are pure in-memory
+    reads and never hold the lock while the event loop is needed.
+    """
+
+    def __init__(self):
+        self.refresh_interval = settings.standards_catalog_refresh_interval
+        self._snapshot: Optional[_Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        return self._snapshot.version if self._snapshot else None
+
+    def load(self, db: Optional[Session] = None) -> None:
+        """(Re)build the index from the database"""
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            started = time.perf_counter()
+            rows = db.query(Standard).order_by(Standard.created_at.desc(), Standard.id.desc()).all()
+            standards = [StandardRead.model_validate(row) for row in rows]
+            version = (len(standards), max((standard.id for standard in standards), default=0))
+            self._snapshot = _Snapshot(standards, version)
+            self._checked_at = time.monotonic()
+            logger.info("Standards catalogue loaded: %s standards in %.0fms", len(standards), (time.perf_counter() - started) * 1000)
+        finally:
+            if own_session:
+                db.close()
+
+    def invalidate(self) -> None:
+        """Force a version check on next access (call after writing standards)"""
+        self._checked_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return self._snapshot is not None and time.monotonic() - self._checked_at < self.refresh_interval
+
+    def refresh(self) -> None:
+        """Reload if the catalogue changed since the last check (blocking; own session)"""
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            if self._is_fresh():
+                return
+            db = SessionLocal()
+            try:
+                if self._snapshot is not None:
+                    count, max_id = db.query(func.count(Standard.id), func.max(Standard.id)).one()
+                    if (count, max_id or 0) == self._snapshot.version:
+                        self._checked_at = time.monotonic()
+                        return
+                self.load(db)
+            finally:
+                db.close()
+
+    async def ensure_fresh(self) -> None:
+        """Run a due version check off the event loop; one check per loop at a time"""
+        if self._is_fresh():
+            return
+        async with self._async_lock:
+            if not self._is_fresh():
+                await asyncio.to_thread(self.refresh)
+
+    def _current(self, db: Session) -> _Snapshot:
+        # `db` may be an async session inside run_sync - catalogue queries never use it
+        if not self._is_fresh():
+            self.refresh()
+        return self._snapshot
+
+    def get(self, db: Session, standard_id: int) -> Optional[StandardRead]:
+        entry = self._current(db).by_id.get(standard_id)
+        if entry is not None:
+            return entry.standard
+
+        # Possibly created by another process since our last version check
+        row = db.query(Standard).filter(Standard.id == standard_id).first()
+        if row is None:
+            return None
+        self.invalidate()
+        return StandardRead.model_validate(row)
+
+    def filter(
+        self,
+        db: Session,
+        curriculum_board: Optional[CurriculumBoard] = None,
+        grade_level: Optional[int] = None,
+        locale: Optional[Locale] = None
+    ) -> List[StandardRead]:
+        """All standards matching the filters, newest first"""
+        return [
+            entry.standard for entry in self._current(db).entries
+            if self._matches(entry.standard, curriculum_board, grade_level, locale)
+        ]
+
+    def search(
+        self,
+        db: Session,
+        term: Optional[str] = None,
+        curriculum_board: Optional[CurriculumBoard] = None,
+        grade_level: Optional[int] = None,
+        locale: Optional[Locale] = None,
+        limit: int = 20
+    ) -> List[StandardRead]:
+        """Ranked code/description search: exact code, code prefix, code segment,
+        code substring, description word prefix, then description substring"""
+        snapshot = self._current(db)
+        term = (term or "").strip().lower()
+        if not term:
+            return self.filter(db, curriculum_board, grade_level, locale)[:limit]
+
+        cache_key = (term, curriculum_board, grade_level, locale, limit)
+        results = snapshot.results.get(cache_key)
+        if results is not None:
+            return results
+
+        ranked = []
+        for index in snapshot.candidates(term, curriculum_board, grade_level):
+            entry = snapshot.entries[index]
+            if not self._matches(entry.standard, curriculum_board, grade_level, locale):
+                continue
+            rank = entry.rank(term)
+            if rank is not None:
+                ranked.append((rank, len(entry.code), entry.code, index))
+
+        results = [snapshot.entries[index].standard for *_, index in heapq.nsmallest(limit, ranked)]
+        snapshot.results.set(cache_key, results)
+        return results
+
+    @staticmethod
+    def _matches(
+        standard: StandardRead,
+        curriculum_board: Optional[CurriculumBoard],
+        grade_level: Optional[int],
+        locale: Optional[Locale]
+    ) -> bool:
+        return (
+            (curriculum_board is None or standard.curriculum_board == curriculum_board)
+            and (grade_level is None or standard.grade_level == grade_level)
+            and (locale is None or standard.locale == locale)
+        )
+
+standards_catalog = StandardsCatalog()
@@ -0,0 +1,164 @@
+# Thumbnail rasterising off the request path: a process pool keyed by PDF content hash
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.enums import FileType
+from app.db.session import SessionLocal
+from app.models.file_artifact import FileArtifact
+from app.services.render_errors import RenderQueueFull
+from app.utils.logger import get_logger
+from app.utils import prometheus
+from app.utils.storage import storage_manager
+from app.utils.thumbnails import existing_thumbnails, render_thumbnails
+
+logger = get_logger(__name__)
+
+def _thumbnails_in_worker(pdf_path: str, checksum: str) -> Tuple[Dict[str, str], float]:
+    """Runs in a pool process"""
+    started = time.perf_counter()
+    _, paths = render_thumbnails(Path(pdf_path), checksum)
+    return {size: str(path) for size, path in paths.items()}, time.perf_counter() - started
+
+def register_thumbnails(product_id: int, paths: Dict[str, Path]) -> None:
+    """Point the product's THUMBNAIL artifacts at this set, dropping rows from earlier renders"""
+    relative_paths = [storage_manager.relative_path(path) for path in paths.values()]
+    db = SessionLocal()
+    try:
+        db.query(FileArtifact).filter(
+            FileArtifact.product_id == product_id,
+            FileArtifact.file_type == FileType.THUMBNAIL,
+            FileArtifact.file_path.notin_(relative_paths)
+        ).delete(synchronize_session=False)
+        for path in paths.values():
+            storage_manager.register_file(product_id, FileType.THUMBNAIL, path, db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+class ThumbnailService:
+    """
+    Rasterises page one of rendered PDFs in a ProcessPoolExecutor.
+
+    Work is keyed by the PDF's SHA-256, so products whose PDFs are
+    byte-identical share one render, and a PDF whose thumbnails are already
+    in the content store is never rasterised again. Mirrors
+    PDFRenderService: bounded queue, shielded shared tasks, spawned workers.
+    """
+
+    def __init__(self):
+        self.workers = settings.thumbnail_workers
+        self.queue_size = settings.thumbnail_queue_size
+        self.timeout = settings.thumbnail_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._rasters: Dict[str, "asyncio.Task[Dict[str, Path]]"] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("Thumbnail pool started (%s workers)", self.workers)
+        return self._pool
+
+    async def stop(self) -> None:
+        """Cancel queued work and shut the pool down"""
+        tasks = list(self._rasters.values()) + list(self._background)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._rasters.clear()
+        self._background.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Thumbnail pool stopped")
+
+    async def render(
+        self,
+        product_id: int,
+        pdf_path: Path,
+        checksum: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Path]:
+        """Thumbnails for a product's PDF, rasterising them if the content store lacks them.
+
+        Raises RenderQueueFull when the queue is saturated and
+        asyncio.TimeoutError when the render outlives `timeout`.
+        """
+        return await asyncio.wait_for(
+            self._thumbnails_for(product_id, pdf_path, checksum),
+            self.timeout if timeout is None else timeout
+        )
+
+    def schedule(self, product_id: int, pdf_path: Path, checksum: str) -> None:
+        """Build thumbnails in the background (e.g. right after a PDF render)"""
+        task = asyncio.create_task(self._thumbnails_for(product_id, pdf_path, checksum))
+        self._background.add(task)
+        task.add_done_callback(lambda done, product_id=product_id: self._background_finished(product_id, done))
+
+    def _background_finished(self, product_id: int, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        if isinstance(task.exception(), RenderQueueFull):
+            # The first thumbnail request renders them instead
+            logger.warning("Thumbnail queue full; skipped thumbnails for product %s", product_id)
+        elif task.exception() is not None:
+            logger.error("Thumbnails failed for product %s: %s", product_id, task.exception())
+
+    async def _thumbnails_for(self, product_id: int, pdf_path: Path, checksum: str) -> Dict[str, Path]:
+        paths = existing_thumbnails(checksum)
+        if paths is not None:
+            prometheus.thumbnail_cache_hits_total.inc()
+        else:
+            raster = self._rasters.get(checksum)
+            if raster is None:
+                raster = self._submit(pdf_path, checksum)
+            # Shielded: a caller timing out must not cancel the shared render
+            paths = await asyncio.shield(raster)
+
+        await asyncio.to_thread(register_thumbnails, product_id, paths)
+        return paths
+
+    def _submit(self, pdf_path: Path, checksum: str) -> "asyncio.Task[Dict[str, Path]]":
+        if len(self._rasters) >= self.queue_size:
+            raise RenderQueueFull(f"{len(self._rasters)} thumbnail renders already queued")
+
+        task = asyncio.create_task(self._run(pdf_path, checksum))
+        self._rasters[checksum] = task
+        task.add_done_callback(lambda done, checksum=checksum: self._finished(checksum, done))
+        return task
+
+    def _finished(self, checksum: str, task: "asyncio.Task[Dict[str, Path]]") -> None:
+        if self._rasters.get(checksum) is task:
+            del self._rasters[checksum]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Thumbnail render failed for %s: %s", checksum[:12], task.exception())
+
+    async def _run(self, pdf_path: Path, checksum: str) -> Dict[str, Path]:
+        loop = asyncio.get_running_loop()
+        try:
+            paths, seconds = await loop.run_in_executor(
+                self._get_pool(), _thumbnails_in_worker, str(pdf_path), checksum
+            )
+        except BrokenProcessPool:
+            logger.error("Thumbnail pool broke while rendering %s; recreating", checksum[:12])
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            raise
+
+        prometheus.thumbnail_render_duration.observe(seconds)
+        return {size: Path(path) for size, path in paths.items()}
+
+thumbnail_service = ThumbnailService()
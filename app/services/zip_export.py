@@ -0,0 +1,143 @@
+# Streaming ZIP export of product artifacts: no staging files and no in-memory archive
+import time
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from fastapi.responses import StreamingResponse
+from app.core.enums import FileType
+from app.db.session import SessionLocal
+from app.models.file_artifact import FileArtifact
+from app.models.product import Product
+from app.utils.logger import get_logger
+from app.utils.storage import CONTENT_TYPES, ZIP_FOLDERS, storage_manager
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+EXPORT_BATCH_SIZE = 200  # Products loaded per query
+# Already-compressed formats gain nothing from deflate
+STORED_SUFFIXES = {".pdf", ".png", ".zip"}
+
+class ExportEntry(NamedTuple):
+    arcname: str
+    path: Path
+
+class _ZipSink:
+    """Write-only, unseekable file object for zipfile; the stream drains it after every write.
+
+    Without tell/seek zipfile writes each member's sizes and CRC in a data
+    descriptor after its data, so nothing has to be rewound or buffered.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_zip(entries: Iterable[ExportEntry]) -> Iterator[bytes]:
+    """Yield a ZIP archive of `entries` chunk by chunk.
+
+    Memory holds one read chunk plus zipfile's per-member central directory
+    record, never file contents. Missing files are skipped.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for entry in entries:
+            try:
+                stat = entry.path.stat()
+            except FileNotFoundError:
+                logger.warning(f"Skipping missing export file {entry.path}")
+                continue
+
+            # ZIP timestamps start at 1980
+            info = zipfile.ZipInfo(entry.arcname, date_time=time.localtime(max(stat.st_mtime, 315619200))[:6])
+            info.external_attr = 0o644 << 16
+            info.file_size = stat.st_size  # Lets zipfile pick zip64 headers up front
+            info.compress_type = zipfile.ZIP_STORED if entry.path.suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+            with open(entry.path, 'rb') as source, archive.open(info, mode="w") as member:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+def _entries_for(product, artifacts: Iterable) -> Iterator[ExportEntry]:
+    folder = f"product_{product.id}"
+    for artifact in artifacts:
+        subfolder = ZIP_FOLDERS.get(artifact.file_type)
+        if subfolder is None:
+            continue
+        path = storage_manager.resolve(artifact.file_path)
+        name = path.name
+        if artifact.file_type == FileType.PDF:
+            # Same name as /download/pdf
+            name = f"{product.product_type.value.lower()}_{product.grade_level}_{product.id}.pdf"
+        yield ExportEntry(f"{folder}/{subfolder}/{name}", path)
+
+def export_entries(
+    product_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[ExportEntry]:
+    """Archive entries for one product or every product of a generation job.
+
+    Products and their artifacts are read in keyset batches with a short-lived
+    session per batch, so a slow download never pins a connection and a
+    2,000-product bundle never sits in memory at once.
+    """
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            query = db.query(Product.id, Product.product_type, Product.grade_level).filter(Product.id > last_id)
+            if product_id is not None:
+                query = query.filter(Product.id == product_id)
+            if job_id is not None:
+                query = query.filter(Product.generation_job_id == job_id)
+            products = query.order_by(Product.id).limit(batch_size).all()
+
+            artifacts = {}
+            if products:
+                rows = (
+                    db.query(FileArtifact.product_id, FileArtifact.file_type, FileArtifact.file_path)
+                    .filter(FileArtifact.product_id.in_([product.id for product in products]))
+                    .order_by(FileArtifact.product_id, FileArtifact.file_type, FileArtifact.file_path)
+                    .all()
+                )
+                for row in rows:
+                    artifacts.setdefault(row.product_id, []).append(row)
+        finally:
+            db.close()
+
+        if not products:
+            return
+        for product in products:
+            yield from _entries_for(product, artifacts.get(product.id, []))
+        last_id = products[-1].id
+
+def zip_response(entries: Iterable[ExportEntry], filename: str) -> StreamingResponse:
+    """Stream the archive; Starlette iterates the sync generator in its threadpool, off the event loop"""
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type=CONTENT_TYPES[".zip"],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
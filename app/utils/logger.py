@@ -1,17 +1,227 @@
+import atexit
+import json
 import logging
+import queue
+import random
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional
 from app.core.config import settings
+from app.utils import prometheus
+
+ROOT_LOGGER = "rbb_engine"
+CONTEXT_FIELDS = ("request_id", "job_id", "product_id")
+
+# request_id / job_id / product_id for the current request or generation task.
+# asyncio tasks copy the context when created, so agent steps inherit it.
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Attach fields to every log record emitted inside the block"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+class ContextFilter(logging.Filter):
+    """Copies the current log context onto the record (runs on the calling thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            setattr(record, field, context.get(field))
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of INFO/DEBUG records per logger; warnings and errors always pass.
+    Rates apply to a logger and its children, e.g. "rbb_engine.api=0.1".
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    @classmethod
+    def parse(cls, spec: str) -> Optional["SamplingFilter"]:
+        rates = {}
+        for item in spec.split(","):
+            if "=" not in item:
+                continue
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        return cls(rates) if rates else None
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            # Nearest configured ancestor wins
+            candidate = name
+            rate = 1.0
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the request/job/product context"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    """The original plain format, with any context appended"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        context = " ".join(
+            f"{field}={getattr(record, field)}" for field in CONTEXT_FIELDS
+            if getattr(record, field, None) is not None
+        )
+        return f"{line} [{context}]" if context else line
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them - message interpolation and
+    JSON encoding happen on the listener thread. A full queue drops the
+    record instead of blocking the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            prometheus.log_records_dropped_total.inc()
+
+_direct_handler: Optional[logging.Handler] = None
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+    return handler
+
+def _add_filters(handler: logging.Handler) -> logging.Handler:
+    sampling = SamplingFilter.parse(settings.log_sampling)
+    if sampling is not None:
+        # Runs first, so sampled-out records are dropped before any other work
+        handler.addFilter(sampling)
+    handler.addFilter(ContextFilter())
+    return handler
+
+def _swap_handler(old: logging.Handler, new: logging.Handler) -> None:
+    # One list assignment, so no record is dropped or emitted twice mid-swap
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers = [new if handler is old else handler for handler in root.handlers]
 
 def setup_logger(name: str) -> logging.Logger:
+    """
+    Configure `name` (and its children) to write straight to stderr.
+    Long-running processes switch to the queue listener with start_logging().
+    """
+    global _direct_handler
+
     logger = logging.getLogger(name)
-    logger.setLevel(settings.log_level)
-    
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    
+    logger.setLevel(settings.log_level.upper())
+    logger.propagate = False
+
+    _direct_handler = _add_filters(_stream_handler())
+    logger.addHandler(_direct_handler)
     return logger
 
-logger = setup_logger("rbb_engine")
+def start_logging() -> None:
+    """Move the application logger onto a background queue listener thread"""
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+
+    _queue_handler = _add_filters(NonBlockingQueueHandler(queue.Queue(maxsize=settings.log_queue_size)))
+    # The listener's handler has no filters: context was captured on the calling thread
+    _listener = QueueListener(_queue_handler.queue, _stream_handler(), respect_handler_level=True)
+    _listener.start()
+
+    _swap_handler(_direct_handler, _queue_handler)
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and log directly again"""
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+
+    _swap_handler(_queue_handler, _direct_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
+
+def get_logger(module: str) -> logging.Logger:
+    """Child of the application logger for a module, e.g. rbb_engine.api.v1.routes.products"""
+    if module.startswith("app."):
+        module = module[len("app."):]
+    return logging.getLogger(f"{ROOT_LOGGER}.{module}")
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware giving each request a request_id (the incoming
+    X-Request-ID, or a new one) for log context, echoed in the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for header, value in scope["headers"]:
+            if header == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        with log_context(request_id=request_id):
+            await self.app(scope, receive, send_wrapper)
+
+logger = setup_logger(ROOT_LOGGER)
+atexit.register(shutdown_logging)
@@ -1,27 +1,131 @@
-from typing import Any, Dict, List
-from sqlalchemy.orm import Query
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Query as QueryParam
+from sqlalchemy import Select, String, bindparam, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
+# SQLite keeps CURRENT_TIMESTAMP defaults as 'YYYY-MM-DD HH:MM:SS' text and compares them as text
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class TotalMode(str, Enum):
+    EXACT = "exact"  # COUNT(*) over the filtered query
+    ESTIMATE = "estimate"  # Planner row estimate (Postgres); exact elsewhere
+    NONE = "none"  # Skip counting entirely
+
 class PaginationParams(BaseModel):
     limit: int = 50
     offset: int = 0
+    cursor: Optional[str] = None  # Keyset mode when set; offset is ignored
+    total: TotalMode = TotalMode.EXACT
 
 class PaginatedResponse(BaseModel):
     items: List[Any]
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
     has_next: bool
+    next_cursor: Optional[str] = None
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the (created_at, id) position of a row"""
+    raw = json.dumps([created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+def pagination_params(
+    limit: int = QueryParam(50, ge=1, le=100),
+    offset: int = QueryParam(0, ge=0),
+    cursor: Optional[str] = QueryParam(None, description="Opaque cursor from a previous page's next_cursor"),
+    total: TotalMode = QueryParam(TotalMode.EXACT, description="How to compute the total: exact, estimate or none")
+) -> PaginationParams:
+    """Shared list-endpoint pagination parameters"""
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return PaginationParams(limit=limit, offset=offset, cursor=cursor, total=total)
+
+async def _estimate_total(db: AsyncSession, query: Select) -> int:
+    """Planner row estimate for the filtered query, without executing it"""
+    if db.bind.dialect.name != "postgresql":
+        # No cheap estimate outside Postgres (dev SQLite) - fall back to counting
+        return await _count(db, query)
+
+    statement = query.order_by(None).compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}"))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def _count(db: AsyncSession, query: Select) -> int:
+    return (await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))).scalar_one()
+
+def order_newest_first(query: Select) -> Select:
+    """Replace the query's ordering with the (created_at, id) keyset order"""
+    model = query.column_descriptions[0]["entity"]
+    return query.order_by(None).order_by(model.created_at.desc(), model.id.desc())
+
+def _cursor_timestamp(model, created_at: datetime, dialect_name: Optional[str]):
+    """Bind the cursor's created_at in the column's stored form.
+
+    On SQLite the DateTime type would render it with microseconds
+    ('... 10:00:00.000000'), which sorts after the stored '... 10:00:00'
+    of the same row, so the cursor row and its peers came back again.
+    """
+    if dialect_name == "sqlite":
+        stored_format = SQLITE_TIMESTAMP_FORMAT + (".%f" if created_at.microsecond else "")
+        return bindparam("cursor_created_at", created_at.strftime(stored_format), type_=String)
+    return bindparam("cursor_created_at", created_at, type_=model.created_at.type)
+
+def build_page_query(query: Select, params: PaginationParams, dialect_name: Optional[str] = None) -> Select:
+    """Ordered query for one page, fetching one extra row to detect a next page"""
+    model = query.column_descriptions[0]["entity"]
+    page_query = order_newest_first(query)
+    if params.cursor is not None:
+        created_at, row_id = decode_cursor(params.cursor)
+        page_query = page_query.where(
+            tuple_(model.created_at, model.id) < tuple_(_cursor_timestamp(model, created_at, dialect_name), row_id)
+        )
+    else:
+        page_query = page_query.offset(params.offset)
+    return page_query.limit(params.limit + 1)
+
+async def paginate_query(db: AsyncSession, query: Select, params: PaginationParams) -> PaginatedResponse:
+    """Apply pagination to a SQLAlchemy select.
+
+    Rows are ordered newest first by (created_at, id). With a cursor the page
+    starts strictly after that position (keyset pagination), so deep pages cost
+    the same as the first; otherwise OFFSET/LIMIT is used.
+    """
+    if params.total == TotalMode.EXACT:
+        total = await _count(db, query)
+    elif params.total == TotalMode.ESTIMATE:
+        total = await _estimate_total(db, query)
+    else:
+        total = None
+
+    # One extra row tells us whether another page exists without a count
+    rows = (await db.execute(build_page_query(query, params, db.bind.dialect.name))).scalars().all()
+    has_next = len(rows) > params.limit
+    items = rows[:params.limit]
 
-def paginate_query(query: Query, params: PaginationParams) -> PaginatedResponse:
-    """Apply pagination to SQLAlchemy query"""
-    total = query.count()
-    items = query.offset(params.offset).limit(params.limit).all()
-    
     return PaginatedResponse(
         items=items,
         total=total,
         limit=params.limit,
-        offset=params.offset,
-        has_next=(params.offset + params.limit) < total
-    )
\ No newline at end of file
+        offset=0 if params.cursor is not None else params.offset,
+        has_next=has_next,
+        next_cursor=encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+    )
@@ -1,121 +1,66 @@
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 from pathlib import Path
-import json
-from typing import Dict, Any
-from app.utils.logger import logger
+import os
+import time
+import uuid
+from typing import Dict, Any, NamedTuple
+from app.utils.logger import get_logger
+from app.utils import prometheus
+from app.utils.pdf_templates import PDFTemplate, template_for
 from app.utils.storage import storage_manager
+from app.core.enums import FileType, ProductType
+
+logger = get_logger(__name__)
+
+class RenderResult(NamedTuple):
+    path: Path
+    pages: int
 
 class PDFGenerator:
-    """Generate PDF files from AI-generated content"""
+    """Generate PDF files from AI-generated content using the per-type templates in pdf_templates"""
     
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
-    
-    def setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            textColor=colors.darkblue,
-            alignment=1  # Center alignment
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='QuestionStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=12,
-            leftIndent=20
-        ))
+    def template_for(self, product_type: str) -> PDFTemplate:
+        return template_for(product_type)
     
     def generate_worksheet_pdf(self, product_id: int, content_data: Dict[str, Any]) -> Path:
         """Generate PDF for worksheet content"""
+        return self.render(product_id, ProductType.WORKSHEET.value, content_data).path
+    
+    def generate_quiz_pdf(self, product_id: int, content_data: Dict[str, Any]) -> Path:
+        """Generate PDF for quiz content"""
+        return self.render(product_id, ProductType.QUIZ.value, content_data).path
+    
+    def render(self, product_id: int, product_type: str, content_data: Dict[str, Any]) -> RenderResult:
+        """Build the PDF file only (no database access - safe inside a render worker process)"""
+        template = self.template_for(product_type)
         try:
-            # Get product storage path
             product_path = storage_manager.get_product_path(product_id)
+            # One name for every layout, so a re-render replaces the registered artifact
             pdf_path = product_path / f"worksheet_{product_id}.pdf"
             
-            # Create PDF document
-            doc = SimpleDocTemplate(str(pdf_path), pagesize=A4)
-            story = []
-            
-            # Title
-            title = content_data.get('title', 'Educational Worksheet')
-            story.append(Paragraph(title, self.styles['CustomTitle']))
-            story.append(Spacer(1, 20))
-            
-            # Basic info
-            grade_level = content_data.get('grade_level', 'N/A')
-            subject = content_data.get('subject', 'N/A')
-            estimated_time = content_data.get('estimated_time', 'N/A')
-            
-            info_text = f"<b>Grade:</b> {grade_level} | <b>Subject:</b> {subject} | <b>Time:</b> {estimated_time}"
-            story.append(Paragraph(info_text, self.styles['Normal']))
-            story.append(Spacer(1, 20))
-            
-            # Learning objectives
-            if 'learning_objectives' in content_data:
-                story.append(Paragraph("<b>Learning Objectives:</b>", self.styles['Heading2']))
-                for obj in content_data['learning_objectives']:
-                    story.append(Paragraph(f"• {obj}", self.styles['Normal']))
-                story.append(Spacer(1, 15))
-            
-            # Instructions
-            if 'instructions' in content_data:
-                story.append(Paragraph("<b>Instructions:</b>", self.styles['Heading2']))
-                story.append(Paragraph(content_data['instructions'], self.styles['Normal']))
-                story.append(Spacer(1, 20))
-            
-            # Questions
-            if 'questions' in content_data:
-                story.append(Paragraph("<b>Questions:</b>", self.styles['Heading2']))
-                story.append(Spacer(1, 10))
-                
-                for i, question in enumerate(content_data['questions'], 1):
-                    # Question number and text
-                    q_text = question.get('question', f'Question {i}')
-                    story.append(Paragraph(f"<b>{i}. {q_text}</b>", self.styles['QuestionStyle']))
-                    
-                    # Multiple choice options
-                    if question.get('type') == 'multiple_choice' and 'options' in question:
-                        for j, option in enumerate(question['options']):
-                            letter = chr(65 + j)  # A, B, C, D
-                            story.append(Paragraph(f"   {letter}) {option}", self.styles['Normal']))
-                    
-                    # Points
-                    points = question.get('points', 1)
-                    story.append(Paragraph(f"<i>Points: {points}</i>", self.styles['Normal']))
-                    story.append(Spacer(1, 15))
-            
-            # Build PDF
-            doc.build(story)
-            logger.info(f"Generated PDF for product {product_id}: {pdf_path}")
-            return pdf_path
+            # Build next to the target and swap in, so a served PDF is never half-written;
+            # the unique name keeps concurrent renders of one product from sharing a temp file
+            tmp_path = pdf_path.with_name(f".{pdf_path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                pages = template.build(tmp_path, content_data)
+                os.replace(tmp_path, pdf_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            logger.info("Generated %s PDF for product %s: %s", template.product_type.value, product_id, pdf_path)
+            return RenderResult(pdf_path, pages)
             
         except Exception as e:
             logger.error(f"PDF generation failed for product {product_id}: {e}")
             raise
     
-    def generate_quiz_pdf(self, product_id: int, content_data: Dict[str, Any]) -> Path:
-        """Generate PDF for quiz content"""
-        # Similar to worksheet but with quiz-specific formatting
-        return self.generate_worksheet_pdf(product_id, content_data)
+    def render_pdf(self, product_id: int, product_type: str, content_data: Dict[str, Any]) -> Path:
+        return self.render(product_id, product_type, content_data).path
     
     def generate_pdf_from_content(self, product_id: int, product_type: str, content_data: Dict[str, Any]) -> Path:
-        """Generate PDF based on product type"""
-        if product_type.upper() == 'WORKSHEET':
-            return self.generate_worksheet_pdf(product_id, content_data)
-        elif product_type.upper() == 'QUIZ':
-            return self.generate_quiz_pdf(product_id, content_data)
-        else:
-            # Default to worksheet format for other types
-            return self.generate_worksheet_pdf(product_id, content_data)
+        """Render synchronously and register the PDF artifact (API routes use pdf_render_service instead)"""
+        started = time.perf_counter()
+        pdf_path = self.render_pdf(product_id, product_type, content_data)
+        prometheus.pdf_render_duration.labels(product_type.upper()).observe(time.perf_counter() - started)
+        storage_manager.register_file(product_id, FileType.PDF, pdf_path)
+        return pdf_path
 
 pdf_generator = PDFGenerator()
\ No newline at end of file
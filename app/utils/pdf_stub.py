@@ -1,27 +0,0 @@
-from pathlib import Path
-from app.utils.logger import logger
-from app.utils.storage import storage_manager
-
-def generate_stub_pdf(product_id: int, product_type: str) -> Path:
-    """Generate stub PDF file for product - placeholder implementation"""
-    product_path = storage_manager.get_product_path(product_id)
-    pdf_path = product_path / f"{product_type}_stub.pdf"
-    
-    # Create empty PDF stub file
-    stub_content = f"""%PDF-1.4
-1 0 obj
-<<
-/Type /Catalog
-/Pages 2 0 R
->>
-endobj
-
-% STUB PDF for Product {product_id} - {product_type}
-% This is a placeholder file
-"""
-    
-    with open(pdf_path, 'w') as f:
-        f.write(stub_content)
-    
-    logger.info(f"Generated stub PDF for product {product_id}: {pdf_path}")
-    return pdf_path
\ No newline at end of file
@@ -0,0 +1,425 @@
+# PDF layouts per ProductType. Fonts, paragraph styles and page templates are built
+# once per process and shared by every render; only the content story is per-PDF.
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import BaseDocTemplate, Flowable, Frame, PageTemplate, Paragraph, Spacer, Table, TableStyle
+from app.core.config import settings
+from app.core.enums import ProductType
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PAGE_SIZE = A4
+MARGIN = 0.75 * inch
+HEADER_BAND = 0.6 * inch  # First-page type/info band drawn above the frame
+MAX_CACHED_LABELS = 512
+
+# Registered face suffix -> DejaVu file suffix
+FONT_FACES = {"": "", "-Bold": "-Bold", "-Italic": "-Oblique", "-BoldItalic": "-BoldOblique"}
+
+class Fonts(NamedTuple):
+    regular: str
+    bold: str
+    italic: str
+
+@lru_cache(maxsize=None)
+def register_fonts() -> Fonts:
+    """Register the body font family once per process.
+
+    PDF_FONT_DIR may point at DejaVuSans{,-Bold,-Oblique,-BoldOblique}.ttf for
+    text outside Latin-1; otherwise the built-in Helvetica family is used.
+    """
+    if settings.pdf_font_dir:
+        font_dir = Path(settings.pdf_font_dir)
+        try:
+            for suffix, face in FONT_FACES.items():
+                pdfmetrics.registerFont(TTFont(f"Body{suffix}", str(font_dir / f"DejaVuSans{face}.ttf")))
+            pdfmetrics.registerFontFamily(
+                "Body", normal="Body", bold="Body-Bold", italic="Body-Italic", boldItalic="Body-BoldItalic"
+            )
+            return Fonts("Body", "Body-Bold", "Body-Italic")
+        except Exception as e:
+            logger.warning(f"Could not register fonts from {font_dir}, falling back to Helvetica: {e}")
+    return Fonts("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+
+@lru_cache(maxsize=None)
+def get_styles() -> StyleSheet1:
+    """Paragraph styles shared by every template"""
+    fonts = register_fonts()
+    styles = StyleSheet1()
+    styles.add(ParagraphStyle(name='Body', fontName=fonts.regular, fontSize=10, leading=13, spaceAfter=4))
+    styles.add(ParagraphStyle(
+        name='DocTitle',
+        fontName=fonts.bold,
+        fontSize=18,
+        leading=22,
+        spaceAfter=18,
+        textColor=colors.darkblue,
+        alignment=TA_CENTER
+    ))
+    styles.add(ParagraphStyle(
+        name='Section', parent=styles['Body'], fontName=fonts.bold, fontSize=13, leading=16, spaceBefore=10, spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        name='Subsection', parent=styles['Body'], fontName=fonts.bold, fontSize=11, leading=14, spaceBefore=8, spaceAfter=4
+    ))
+    styles.add(ParagraphStyle(
+        name='Question', parent=styles['Body'], fontName=fonts.bold, fontSize=11, leading=14, spaceBefore=6, leftIndent=20
+    ))
+    styles.add(ParagraphStyle(name='Option', parent=styles['Body'], leftIndent=36, spaceAfter=2))
+    styles.add(ParagraphStyle(name='Bullet', parent=styles['Body'], leftIndent=14, bulletIndent=4))
+    styles.add(ParagraphStyle(
+        name='Points', parent=styles['Body'], fontName=fonts.italic, fontSize=9, leftIndent=20, spaceAfter=8
+    ))
+    styles.add(ParagraphStyle(name='Passage', parent=styles['Body'], fontSize=11, leading=16, alignment=TA_JUSTIFY, spaceAfter=8))
+    styles.add(ParagraphStyle(name='Cell', parent=styles['Body'], fontSize=9, leading=11, spaceAfter=0))
+    return styles
+
+# Parsed markup for template-owned strings ("Instructions:", "Points: 2", ...)
+_label_frags: Dict[Tuple[str, str], list] = {}
+
+def label(markup: str, style: ParagraphStyle) -> Paragraph:
+    """Paragraph for fixed template text, parsed once per process and reused"""
+    key = (markup, style.name)
+    frags = _label_frags.get(key)
+    if frags is not None:
+        return Paragraph(markup, style, frags=frags)
+    paragraph = Paragraph(markup, style)
+    if len(_label_frags) < MAX_CACHED_LABELS:
+        _label_frags[key] = paragraph.frags
+    return paragraph
+
+def text(value: Any) -> str:
+    """Escape generated content so stray '<' or '&' can't break paragraph markup"""
+    return escape(str(value)).replace("\n", "<br/>")
+
+def plain(value: Any) -> str:
+    """Flatten nested rubric/section values into one line"""
+    if isinstance(value, dict):
+        return "; ".join(f"{key}: {plain(item)}" for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return "; ".join(plain(item) for item in value)
+    return str(value)
+
+def minutes(value: Any) -> str:
+    if value in (None, ""):
+        return "N/A"
+    return f"{value} min" if isinstance(value, int) else str(value)
+
+class AnswerLines(Flowable):
+    """Ruled lines for written answers, drawn straight onto the canvas"""
+
+    def __init__(self, count: int, gap: float = 0.3 * inch, indent: float = 20):
+        super().__init__()
+        self.count = count
+        self.gap = gap
+        self.indent = indent
+
+    def wrap(self, available_width, available_height):
+        self.width = available_width
+        return available_width, self.count * self.gap + 4
+
+    def draw(self):
+        canvas = self.canv
+        canvas.saveState()
+        canvas.setStrokeColor(colors.lightgrey)
+        canvas.setLineWidth(0.5)
+        for i in range(self.count):
+            y = 2 + i * self.gap
+            canvas.line(self.indent, y, self.width, y)
+        canvas.restoreState()
+
+RUBRIC_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.whitesmoke),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+class PDFTemplate(ABC):
+    """
+    Layout for one ProductType.
+
+    The first page carries a type/info band and every page a footer, both
+    drawn directly on the canvas rather than laid out as flowables.
+    Subclasses supply the info fields and the content story.
+    """
+
+    product_type = ProductType.WORKSHEET
+    heading = "Worksheet"
+    default_title = "Educational Worksheet"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def styles(self) -> StyleSheet1:
+        return get_styles()
+
+    def page_templates(self) -> List[PageTemplate]:
+        # Frames carry per-build state, so each thread keeps its own pre-built set
+        templates = getattr(self._local, "templates", None)
+        if templates is None:
+            width, height = PAGE_SIZE
+            frame_width = width - 2 * MARGIN
+            first = Frame(MARGIN, MARGIN, frame_width, height - 2 * MARGIN - HEADER_BAND, id="first")
+            later = Frame(MARGIN, MARGIN, frame_width, height - 2 * MARGIN, id="later")
+            templates = [
+                PageTemplate(id="First", frames=[first], onPage=self._draw_first_page, autoNextPageTemplate="Later"),
+                PageTemplate(id="Later", frames=[later], onPage=self._draw_footer),
+            ]
+            self._local.templates = templates
+        return templates
+
+    def build(self, output_path: Path, content: Dict[str, Any]) -> int:
+        """Write the PDF to output_path and return its page count"""
+        title = str(content.get('title') or self.default_title)
+        doc = BaseDocTemplate(
+            str(output_path),
+            pagesize=PAGE_SIZE,
+            leftMargin=MARGIN,
+            rightMargin=MARGIN,
+            topMargin=MARGIN,
+            bottomMargin=MARGIN,
+            title=title,
+            # No timestamps or random document IDs: identical content gives identical bytes,
+            # so the PDF checksum can key the thumbnail store
+            invariant=1
+        )
+        doc.addPageTemplates(self.page_templates())
+        doc.info_fields = self.info_fields(content)
+        doc.footer_text = title if len(title) <= 80 else title[:77] + "..."
+
+        story = [Paragraph(text(title), self.styles['DocTitle'])]
+        story.extend(self.story(content))
+        doc.build(story)
+        return doc.page
+
+    def info_fields(self, content: Dict[str, Any]) -> List[Tuple[str, str]]:
+        return [
+            ("Grade", str(content.get('grade_level', 'N/A'))),
+            ("Subject", str(content.get('subject', 'N/A'))),
+            ("Time", minutes(content.get('estimated_time'))),
+        ]
+
+    @abstractmethod
+    def story(self, content: Dict[str, Any]) -> List[Flowable]:
+        """Content flowables below the title"""
+
+    def _draw_first_page(self, canvas, doc):
+        fonts = register_fonts()
+        width, height = PAGE_SIZE
+        top = height - MARGIN
+        canvas.saveState()
+        canvas.setFont(fonts.bold, 9)
+        canvas.setFillColor(colors.darkblue)
+        canvas.drawString(MARGIN, top - 10, self.heading.upper())
+
+        x = MARGIN
+        y = top - 28
+        canvas.setFillColor(colors.black)
+        for name, value in doc.info_fields:
+            name = f"{name}: "
+            value = f"{value}     "
+            canvas.setFont(fonts.bold, 10)
+            canvas.drawString(x, y, name)
+            x += pdfmetrics.stringWidth(name, fonts.bold, 10)
+            canvas.setFont(fonts.regular, 10)
+            canvas.drawString(x, y, value)
+            x += pdfmetrics.stringWidth(value, fonts.regular, 10)
+
+        canvas.setStrokeColor(colors.lightgrey)
+        canvas.line(MARGIN, top - HEADER_BAND + 8, width - MARGIN, top - HEADER_BAND + 8)
+        canvas.restoreState()
+        self._draw_footer(canvas, doc)
+
+    def _draw_footer(self, canvas, doc):
+        fonts = register_fonts()
+        width, _ = PAGE_SIZE
+        canvas.saveState()
+        canvas.setFont(fonts.regular, 8)
+        canvas.setFillColor(colors.grey)
+        canvas.drawString(MARGIN, MARGIN / 2, doc.footer_text)
+        canvas.drawRightString(width - MARGIN, MARGIN / 2, f"Page {canvas.getPageNumber()}")
+        canvas.restoreState()
+
+    # Story helpers
+
+    def section(self, name: str) -> Paragraph:
+        return label(f"{name}:", self.styles['Section'])
+
+    def add_paragraph(self, story: List[Flowable], name: str, value: Any) -> None:
+        if value:
+            story.append(self.section(name))
+            story.append(Paragraph(text(value), self.styles['Body']))
+
+    def add_list(self, story: List[Flowable], name: str, items: Optional[List[Any]]) -> None:
+        if items:
+            story.append(self.section(name))
+            for item in items:
+                story.append(Paragraph(text(plain(item)), self.styles['Bullet'], bulletText="•"))
+
+    def add_questions(
+        self,
+        story: List[Flowable],
+        questions: Optional[List[Any]],
+        name: Optional[str] = "Questions",
+        answer_lines: int = 2,
+        show_points: bool = True
+    ) -> None:
+        if not questions:
+            return
+        if name:
+            story.append(self.section(name))
+        styles = self.styles
+        for number, question in enumerate(questions, 1):
+            if not isinstance(question, dict):
+                question = {"question_text": question}
+            # Schema output uses question_text/question_type; older content used question/type
+            question_text = question.get('question_text') or question.get('question') or f"Question {number}"
+            story.append(Paragraph(f"{number}. {text(question_text)}", styles['Question']))
+
+            options = question.get('options')
+            if options:
+                for index, option in enumerate(options):
+                    story.append(Paragraph(f"{chr(65 + index)}) {text(option)}", styles['Option']))
+            elif answer_lines:
+                story.append(AnswerLines(answer_lines))
+
+            if show_points:
+                story.append(label(f"Points: {text(question.get('points', 1))}", styles['Points']))
+            else:
+                story.append(Spacer(1, 6))
+
+class WorksheetTemplate(PDFTemplate):
+    product_type = ProductType.WORKSHEET
+
+    def story(self, content: Dict[str, Any]) -> List[Flowable]:
+        story: List[Flowable] = []
+        self.add_list(story, "Learning Objectives", content.get('learning_objectives'))
+        self.add_paragraph(story, "Instructions", content.get('instructions'))
+        self.add_questions(story, content.get('questions'))
+
+        extensions = content.get('extensions')
+        if extensions:
+            story.append(self.section("Extension Activities"))
+            for extension in extensions:
+                if isinstance(extension, dict):
+                    story.append(Paragraph(text(extension.get('title', 'Extension')), self.styles['Subsection']))
+                    story.append(Paragraph(text(extension.get('description', '')), self.styles['Body']))
+                else:
+                    story.append(Paragraph(text(extension), self.styles['Bullet'], bulletText="•"))
+        return story
+
+class QuizTemplate(PDFTemplate):
+    product_type = ProductType.QUIZ
+    heading = "Quiz"
+    default_title = "Quiz"
+
+    def info_fields(self, content: Dict[str, Any]) -> List[Tuple[str, str]]:
+        return [
+            ("Grade", str(content.get('grade_level', 'N/A'))),
+            ("Time limit", minutes(content.get('time_limit'))),
+            ("Total points", str(content.get('total_points', 'N/A'))),
+        ]
+
+    def story(self, content: Dict[str, Any]) -> List[Flowable]:
+        story: List[Flowable] = [
+            label("<b>Name:</b> ____________________________ &nbsp;&nbsp; <b>Date:</b> ______________ &nbsp;&nbsp; "
+                  "<b>Score:</b> ________", self.styles['Body']),
+            Spacer(1, 8),
+        ]
+        self.add_paragraph(story, "Instructions", content.get('instructions'))
+        self.add_questions(story, content.get('questions'), answer_lines=1)
+        return story
+
+class PassageTemplate(PDFTemplate):
+    product_type = ProductType.PASSAGE
+    heading = "Reading Passage"
+    default_title = "Reading Passage"
+
+    def info_fields(self, content: Dict[str, Any]) -> List[Tuple[str, str]]:
+        return [
+            ("Grade", str(content.get('grade_level', 'N/A'))),
+            ("Reading level", str(content.get('reading_level', 'N/A')).title()),
+            ("Words", str(content.get('word_count', 'N/A'))),
+        ]
+
+    def story(self, content: Dict[str, Any]) -> List[Flowable]:
+        story: List[Flowable] = []
+        for block in str(content.get('content', '')).split("\n\n"):
+            if block.strip():
+                story.append(Paragraph(text(block.strip()), self.styles['Passage']))
+
+        vocabulary = content.get('vocabulary_words')
+        if vocabulary:
+            story.append(self.section("Vocabulary"))
+            story.append(Paragraph(text(", ".join(plain(word) for word in vocabulary)), self.styles['Body']))
+
+        self.add_questions(story, content.get('comprehension_questions'), "Comprehension Questions",
+                           answer_lines=3, show_points=False)
+        self.add_list(story, "Discussion Prompts", content.get('discussion_prompts'))
+        return story
+
+class AssessmentTemplate(PDFTemplate):
+    product_type = ProductType.ASSESSMENT
+    heading = "Assessment"
+    default_title = "Assessment"
+
+    def info_fields(self, content: Dict[str, Any]) -> List[Tuple[str, str]]:
+        return [
+            ("Grade", str(content.get('grade_level', 'N/A'))),
+            ("Time", minutes(content.get('estimated_time'))),
+            ("Total points", str(content.get('total_points', 'N/A'))),
+        ]
+
+    def story(self, content: Dict[str, Any]) -> List[Flowable]:
+        styles = self.styles
+        story: List[Flowable] = []
+        self.add_paragraph(story, "Instructions", content.get('instructions'))
+
+        for number, section in enumerate(content.get('sections') or [], 1):
+            if not isinstance(section, dict):
+                section = {"title": section}
+            name = section.get('title') or section.get('name') or f"Section {number}"
+            story.append(Paragraph(text(name), styles['Section']))
+            description = section.get('instructions') or section.get('description')
+            if description:
+                story.append(Paragraph(text(description), styles['Body']))
+            self.add_questions(story, section.get('questions'), name=None)
+
+        rubric = content.get('rubric')
+        if rubric:
+            story.append(self.section("Rubric"))
+            rows = [[label("<b>Criterion</b>", styles['Cell']), label("<b>Expectations</b>", styles['Cell'])]]
+            items = rubric.items() if isinstance(rubric, dict) else enumerate(rubric, 1)
+            for criterion, expectation in items:
+                rows.append([Paragraph(text(criterion), styles['Cell']), Paragraph(text(plain(expectation)), styles['Cell'])])
+            width = PAGE_SIZE[0] - 2 * MARGIN - 12
+            table = Table(rows, colWidths=[width * 0.3, width * 0.7], repeatRows=1)
+            table.setStyle(RUBRIC_TABLE_STYLE)
+            story.append(table)
+        return story
+
+TEMPLATES: Dict[ProductType, PDFTemplate] = {
+    template.product_type: template
+    for template in (WorksheetTemplate(), QuizTemplate(), PassageTemplate(), AssessmentTemplate())
+}
+
+def template_for(product_type: Any) -> PDFTemplate:
+    """Template for a ProductType or its name; unknown types use the worksheet layout"""
+    name = str(getattr(product_type, "value", product_type)).upper()
+    try:
+        return TEMPLATES[ProductType(name)]
+    except ValueError:
+        return TEMPLATES[ProductType.WORKSHEET]
@@ -0,0 +1,232 @@
+# Prometheus metrics, the /metrics exposition and the ASGI request-timing middleware
+import os
+import time
+from typing import Any, Dict, List, Tuple
+from app.core.config import settings
+
+# prometheus_client picks its value backend at import time, so the multiprocess
+# directory has to be in the environment before the first import
+if settings.prometheus_multiproc_dir:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.prometheus_multiproc_dir)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Claude calls and agent steps take seconds to minutes, HTTP requests milliseconds
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CLAUDE_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 300.0)
+PDF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# HTTP
+http_requests_total = Counter(
+    "rbb_http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+http_request_duration = Histogram(
+    "rbb_http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"],
+    buckets=HTTP_BUCKETS
+)
+http_requests_in_flight = Gauge(
+    "rbb_http_requests_in_flight", "HTTP requests currently being served", ["method"],
+    multiprocess_mode="livesum"
+)
+
+# Claude
+claude_request_duration = Histogram(
+    "rbb_claude_request_duration_seconds", "Claude API attempt latency", ["agent", "status"],
+    buckets=CLAUDE_BUCKETS
+)
+claude_errors_total = Counter(
+    "rbb_claude_errors_total", "Claude API attempts that did not return 200", ["agent", "reason"]
+)
+claude_retries_total = Counter(
+    "rbb_claude_retries_total", "Claude API attempts retried after a transient error", ["agent", "reason"]
+)
+claude_failures_total = Counter(
+    "rbb_claude_failures_total", "Claude calls that failed after retries", ["agent", "kind"]
+)
+claude_limiter_wait = Histogram(
+    "rbb_claude_limiter_wait_seconds", "Time spent queued for a Claude concurrency/rate-limit slot", ["priority"],
+    buckets=CLAUDE_BUCKETS
+)
+claude_limiter_queue_depth = Gauge(
+    "rbb_claude_limiter_queue_depth", "Claude calls queued for a limiter slot", ["priority"],
+    multiprocess_mode="livesum"
+)
+claude_limiter_in_flight = Gauge(
+    "rbb_claude_limiter_in_flight", "Claude calls holding a limiter slot", multiprocess_mode="livesum"
+)
+claude_connect_duration = Histogram(
+    "rbb_claude_connect_duration_seconds", "TCP/TLS connect time for new Claude connections",
+    buckets=HTTP_BUCKETS
+)
+claude_ttfb = Histogram(
+    "rbb_claude_ttfb_seconds", "Time to the first response byte of a Claude API attempt", ["agent", "status"],
+    buckets=CLAUDE_BUCKETS
+)
+claude_connections_total = Counter(
+    "rbb_claude_connections_total", "Claude API attempts by whether a pooled connection was reused", ["reused"]
+)
+claude_cache_requests_total = Counter(
+    "rbb_claude_cache_requests_total", "Claude response cache lookups", ["agent", "result"]
+)
+
+# Generation pipeline
+agent_step_duration = Histogram(
+    "rbb_agent_step_duration_seconds", "Agent step latency in the generation DAG", ["step", "status"],
+    buckets=CLAUDE_BUCKETS
+)
+products_finished_total = Counter(
+    "rbb_products_finished_total", "Products that finished generation", ["product_type", "status"]
+)
+generation_jobs_completed_total = Counter(
+    "rbb_generation_jobs_completed_total", "Generation jobs whose products have all finished"
+)
+generation_queue_depth = Gauge(
+    "rbb_generation_queue_depth", "PENDING generation jobs waiting for a worker",
+    multiprocess_mode="livemax"
+)
+generation_active_jobs = Gauge(
+    "rbb_generation_active_jobs", "Generation jobs being processed", multiprocess_mode="livesum"
+)
+generation_products_in_flight = Gauge(
+    "rbb_generation_products_in_flight", "Products currently running through the agent chain",
+    multiprocess_mode="livesum"
+)
+
+# PDF rendering
+pdf_render_duration = Histogram(
+    "rbb_pdf_render_duration_seconds", "ReportLab PDF build time", ["product_type"],
+    buckets=PDF_BUCKETS
+)
+pdf_render_queue_depth = Gauge(
+    "rbb_pdf_render_queue_depth", "PDF renders queued or running in the render pool",
+    multiprocess_mode="livesum"
+)
+pdf_render_coalesced_total = Counter(
+    "rbb_pdf_render_coalesced_total", "PDF requests that joined an in-flight render of the same product"
+)
+pdf_render_rejected_total = Counter(
+    "rbb_pdf_render_rejected_total", "PDF renders refused because the render queue was full"
+)
+
+# Thumbnails
+thumbnail_render_duration = Histogram(
+    "rbb_thumbnail_render_duration_seconds", "Page-one rasterise time for all thumbnail sizes",
+    buckets=PDF_BUCKETS
+)
+thumbnail_cache_hits_total = Counter(
+    "rbb_thumbnail_cache_hits_total", "Thumbnail requests served from the content store without rendering"
+)
+
+# Database connection pools
+db_pool_wait = Histogram(
+    "rbb_db_pool_wait_seconds", "Time to check a connection out of the pool", ["engine"],
+    buckets=HTTP_BUCKETS
+)
+db_pool_timeouts_total = Counter(
+    "rbb_db_pool_timeouts_total", "Checkouts that timed out waiting for a free connection", ["engine"]
+)
+db_pool_checked_out = Gauge(
+    "rbb_db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum"
+)
+db_pool_overflow = Gauge(
+    "rbb_db_pool_overflow", "Connections open beyond pool_size", ["engine"], multiprocess_mode="livesum"
+)
+db_connections_opened_total = Counter(
+    "rbb_db_connections_opened_total", "New database connections opened", ["engine"]
+)
+db_pool_overflow_connections_total = Counter(
+    "rbb_db_pool_overflow_connections_total", "Connections opened beyond pool_size", ["engine"]
+)
+db_connection_hold = Histogram(
+    "rbb_db_connection_hold_seconds", "Time a connection stays checked out", ["engine"],
+    buckets=HTTP_BUCKETS
+)
+db_long_held_connections_total = Counter(
+    "rbb_db_long_held_connections_total", "Checkouts held longer than DB_LONG_HELD_THRESHOLD", ["engine"]
+)
+
+# Logging
+log_records_dropped_total = Counter(
+    "rbb_log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+def _registry() -> CollectorRegistry:
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition payload and content type; aggregates every worker process in multiprocess mode"""
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+def snapshot(prefix: str = "rbb_") -> Dict[str, List[Dict[str, Any]]]:
+    """Current samples of the metrics named `prefix*`, as plain data for the JSON metrics endpoints"""
+    metrics: Dict[str, List[Dict[str, Any]]] = {}
+    for metric in _registry().collect():
+        if not metric.name.startswith(prefix):
+            continue
+        metrics[metric.name] = [
+            {"sample": sample.name, "labels": sample.labels, "value": sample.value}
+            for sample in metric.samples
+            if not sample.name.endswith("_created")
+        ]
+    return metrics
+
+def mark_process_dead() -> None:
+    """Drop this process's live gauges on shutdown (multiprocess mode only)"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streaming responses pass
+    straight through) recording latency, status and in-flight requests.
+
+    Routes are labelled by their path template - FastAPI leaves the matched
+    route in the scope - so /api/products/{product_id} is one series rather
+    than one per ID. Unmatched paths share a single label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            http_request_duration.labels(method, template).observe(duration)
+            http_requests_total.labels(method, template, str(status_code)).inc()
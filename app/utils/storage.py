@@ -1,66 +1,210 @@
+import hashlib
 import os
+import uuid
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 import json
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.utils.logger import logger
+from app.core.enums import FileType, Locale
+from app.db.session import SessionLocal
+from app.models.file_artifact import FileArtifact
+from app.models.product import Product
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# save_json_file names -> artifact types
+JSON_ARTIFACT_TYPES = {
+    "raw": FileType.RAW_JSON,
+    "final": FileType.FINAL_JSON,
+    "metadata": FileType.METADATA_JSON,
+    "qc": FileType.QC_JSON,
+}
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".pdf": "application/pdf",
+    ".png": "image/png",
+    ".zip": "application/zip",
+}
+
+# Artifact type -> folder inside an exported ZIP (see app/services/zip_export.py)
+ZIP_FOLDERS = {
+    FileType.RAW_JSON: "json",
+    FileType.FINAL_JSON: "json",
+    FileType.METADATA_JSON: "json",
+    FileType.QC_JSON: "json",
+    FileType.PDF: "pdf",
+    FileType.THUMBNAIL: "thumbnails",
+}
+
+class StoredFile(NamedTuple):
+    path: Path
+    size_bytes: int
+    checksum: str  # SHA-256 hex digest
+    content_type: str
+
+def file_digest(file_path: Path) -> Tuple[int, str]:
+    """Size and SHA-256 hex digest of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+def record_artifact(
+    db: Session,
+    product_id: int,
+    file_type: FileType,
+    relative_path: str,
+    stored: StoredFile,
+    locale: Optional[Locale] = None
+) -> None:
+    """Upsert the FileArtifact row for a stored file (caller commits).
+
+    A single INSERT ... ON CONFLICT on ux_file_artifacts_product_path, so
+    concurrent writers of the same file cannot race each other into a
+    unique violation. The locale defaults to the product's.
+    """
+    if locale is None:
+        locale = db.query(Product.locale).filter(Product.id == product_id).scalar() or Locale.IN
+
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(FileArtifact).values(
+        product_id=product_id,
+        locale=locale,
+        file_type=file_type,
+        file_path=relative_path,
+        size_bytes=stored.size_bytes,
+        checksum=stored.checksum,
+        content_type=stored.content_type
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[FileArtifact.product_id, FileArtifact.file_path],
+        set_={
+            "locale": statement.excluded.locale,
+            "file_type": statement.excluded.file_type,
+            "size_bytes": statement.excluded.size_bytes,
+            "checksum": statement.excluded.checksum,
+            "content_type": statement.excluded.content_type,
+            "updated_at": func.now()
+        }
+    ))
 
 class StorageManager:
     """
     Manages file storage for products and generated assets.
     Ensures directory structure exists and provides path utilities.
+
+    Every artifact written through here is registered in `file_artifacts`
+    with its size, checksum and content type, so readers resolve files from
+    that index instead of probing the filesystem.
     """
-    
+
     def __init__(self):
         self.base_path = Path(settings.storage_path)
-    
+
     def ensure_directories(self) -> None:
         """Create base storage directories if they don't exist"""
         self.base_path.mkdir(parents=True, exist_ok=True)
-    
+
     def get_product_path(self, product_id: int) -> Path:
         """Get storage path for a specific product"""
         product_path = self.base_path / f"product_{product_id}"
         product_path.mkdir(parents=True, exist_ok=True)
         return product_path
-    
-    def save_json_file(self, product_id: int, file_type: str, data: Dict[Any, Any]) -> Path:
-        """Save JSON file for product (raw.json, final.json, metadata.json)"""
-        product_path = self.get_product_path(product_id)
-        file_path = product_path / f"{file_type}.json"
-        
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        logger.info(f"Saved {file_type}.json for product {product_id}")
+
+    def relative_path(self, path: Path) -> str:
+        """Storage-relative path as recorded in file_artifacts"""
+        return Path(path).relative_to(self.base_path).as_posix()
+
+    def resolve(self, relative_path: str) -> Path:
+        """Absolute path of a recorded artifact"""
+        return self.base_path / relative_path
+
+    @staticmethod
+    def content_type_for(path: Path) -> str:
+        return CONTENT_TYPES.get(Path(path).suffix.lower(), "application/octet-stream")
+
+    def write_file(
+        self,
+        product_id: int,
+        filename: str,
+        data: bytes,
+        file_type: FileType,
+        db: Optional[Session] = None
+    ) -> Path:
+        """Write an artifact atomically and register it"""
+        file_path = self.get_product_path(product_id) / filename
+
+        # Readers never see a half-written file, and concurrent writers never share a temp file
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        stored = StoredFile(file_path, len(data), hashlib.sha256(data).hexdigest(), self.content_type_for(file_path))
+        self._register(product_id, file_type, stored, db)
         return file_path
-    
-    def prepare_zip_structure(self, product_id: int) -> Path:
-        """Prepare directory structure for ZIP bundle (no compression yet)"""
-        product_path = self.get_product_path(product_id)
-        zip_dir = product_path / "bundle"
-        zip_dir.mkdir(exist_ok=True)
-        
-        # Create subdirectories for organized bundle
-        (zip_dir / "json").mkdir(exist_ok=True)
-        (zip_dir / "pdf").mkdir(exist_ok=True)
-        (zip_dir / "thumbnails").mkdir(exist_ok=True)
-        
-        logger.info(f"Prepared ZIP structure for product {product_id}")
-        return zip_dir
-    
-    def create_stub_files(self, product_id: int) -> Dict[str, Path]:
-        """Create stub JSON files with placeholder content"""
-        stub_data = {
-            "raw": {"product_id": product_id, "status": "stub", "type": "raw_data"},
-            "final": {"product_id": product_id, "status": "stub", "type": "final_output"},
-            "metadata": {"product_id": product_id, "created_by": "stub_generator", "version": "1.0"}
-        }
-        
-        file_paths = {}
-        for file_type, data in stub_data.items():
-            file_paths[file_type] = self.save_json_file(product_id, file_type, data)
-        
-        return file_paths
+
+    def register_file(
+        self,
+        product_id: int,
+        file_type: FileType,
+        file_path: Path,
+        db: Optional[Session] = None
+    ) -> StoredFile:
+        """Register a file written by another library (e.g. a ReportLab build)"""
+        size, checksum = file_digest(file_path)
+        stored = StoredFile(Path(file_path), size, checksum, self.content_type_for(file_path))
+        self._register(product_id, file_type, stored, db)
+        return stored
+
+    def _register(self, product_id: int, file_type: FileType, stored: StoredFile, db: Optional[Session]) -> None:
+        relative_path = self.relative_path(stored.path)
+        if db is not None:
+            # Part of the caller's transaction
+            record_artifact(db, product_id, file_type, relative_path, stored)
+            return
+
+        session = SessionLocal()
+        try:
+            record_artifact(session, product_id, file_type, relative_path, stored)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def save_json_file(self, product_id: int, file_type: str, data: Dict[Any, Any], db: Optional[Session] = None) -> Path:
+        """Save JSON file for product (raw.json, final.json, metadata.json, qc.json)"""
+        artifact_type = JSON_ARTIFACT_TYPES.get(file_type)
+        if artifact_type is None:
+            raise ValueError(f"Unknown JSON artifact type: {file_type}")
+
+        file_path = self.write_file(
+            product_id,
+            f"{file_type}.json",
+            json.dumps(data, indent=2).encode("utf-8"),
+            artifact_type,
+            db
+        )
+
+        logger.info("Saved %s.json for product %s", file_type, product_id)
+        return file_path
+
+    def read_json(self, relative_path: str) -> Any:
+        """Load a recorded JSON artifact (blocking - routes call it via asyncio.to_thread)"""
+        with open(self.resolve(relative_path), 'r') as f:
+            return json.load(f)
 
 storage_manager = StorageManager()
@@ -1,28 +0,0 @@
-from pathlib import Path
-from app.utils.logger import logger
-from app.utils.storage import storage_manager
-
-def generate_stub_thumbnail(product_id: int, product_type: str) -> Path:
-    """Generate stub thumbnail image for product - placeholder implementation"""
-    product_path = storage_manager.get_product_path(product_id)
-    thumbnail_path = product_path / f"{product_type}_thumbnail.png"
-    
-    # Create minimal PNG stub (1x1 pixel)
-    # PNG signature + minimal IHDR chunk for 1x1 white pixel
-    stub_png = bytes([
-        0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A,  # PNG signature
-        0x00, 0x00, 0x00, 0x0D, 0x49, 0x48, 0x44, 0x52,  # IHDR chunk
-        0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x01,  # 1x1 dimensions
-        0x08, 0x02, 0x00, 0x00, 0x00, 0x90, 0x77, 0x53,  # bit depth, color type, etc.
-        0xDE, 0x00, 0x00, 0x00, 0x0C, 0x49, 0x44, 0x41,  # IDAT chunk start
-        0x54, 0x08, 0x99, 0x01, 0x01, 0x00, 0x00, 0x00,  # compressed data
-        0xFF, 0xFF, 0x00, 0x00, 0x00, 0x02, 0x00, 0x01,
-        0xE2, 0x21, 0xBC, 0x33, 0x00, 0x00, 0x00, 0x00,  # IEND chunk
-        0x49, 0x45, 0x4E, 0x44, 0xAE, 0x42, 0x60, 0x82
-    ])
-    
-    with open(thumbnail_path, 'wb') as f:
-        f.write(stub_png)
-    
-    logger.info(f"Generated stub thumbnail for product {product_id}: {thumbnail_path}")
-    return thumbnail_path
\ No newline at end of file
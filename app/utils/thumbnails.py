@@ -0,0 +1,58 @@
+# Page-one PNG thumbnails, stored by the SHA-256 of the PDF they were cut from
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import pypdfium2 as pdfium
+from PIL import Image
+from app.utils.logger import get_logger
+from app.utils.storage import file_digest, storage_manager
+
+logger = get_logger(__name__)
+
+# ?size= name -> width in pixels
+THUMBNAIL_SIZES = {"small": 160, "medium": 320, "large": 640}
+
+def thumbnail_path(checksum: str, size: str) -> Path:
+    """Content-addressed location: identical PDFs share one set of thumbnails"""
+    return storage_manager.base_path / "thumbnails" / checksum[:2] / checksum / f"{size}.png"
+
+def existing_thumbnails(checksum: str) -> Optional[Dict[str, Path]]:
+    """Every size's path if all are already on disk, else None"""
+    paths = {size: thumbnail_path(checksum, size) for size in THUMBNAIL_SIZES}
+    return paths if all(path.is_file() for path in paths.values()) else None
+
+def render_thumbnails(pdf_path: Path, checksum: Optional[str] = None) -> Tuple[str, Dict[str, Path]]:
+    """Rasterise page one of a PDF into every size (CPU-bound - run in a worker process).
+
+    Only sizes missing from the content store are rendered; page one is
+    rasterised once at the largest missing width and scaled down from there.
+    """
+    if checksum is None:
+        _, checksum = file_digest(pdf_path)
+    paths = {size: thumbnail_path(checksum, size) for size in THUMBNAIL_SIZES}
+    missing = sorted((size for size, path in paths.items() if not path.is_file()),
+                     key=lambda size: THUMBNAIL_SIZES[size], reverse=True)
+    if not missing:
+        return checksum, paths
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        page = pdf[0]
+        scale = THUMBNAIL_SIZES[missing[0]] / page.get_width()
+        image = page.render(scale=scale).to_pil().convert("RGB")
+        page.close()
+    finally:
+        pdf.close()
+
+    paths[missing[0]].parent.mkdir(parents=True, exist_ok=True)
+    for size in missing:
+        width = THUMBNAIL_SIZES[size]
+        if image.width != width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        # Concurrent renders of the same PDF race harmlessly - both write identical bytes
+        tmp_path = paths[size].with_name(f".{size}.{os.getpid()}.tmp")
+        image.save(tmp_path, "PNG", optimize=True)
+        os.replace(tmp_path, paths[size])
+
+    logger.info("Rendered %s thumbnails for %s", len(missing), checksum[:12])
+    return checksum, paths
@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from typing import Any, Dict, List
-from app.utils.logger import logger
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def validate_positive_integer(value: int, field_name: str) -> None:
     """Validate that a value is a positive integer"""
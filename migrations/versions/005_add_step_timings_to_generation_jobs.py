@@ -0,0 +1,22 @@
+"""Add step_timings to generation_jobs
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Per agent step timing aggregates recorded by the generation pipeline
+    op.add_column('generation_jobs', sa.Column('step_timings', sa.JSON(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('generation_jobs', 'step_timings')
@@ -0,0 +1,60 @@
+"""Add composite indexes for newest-first list queries
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns) - each ends in (created_at, id) to match the
+# ORDER BY created_at DESC, id DESC used by list endpoints and keyset cursors
+LIST_INDEXES = [
+    ('ix_products_created_id', 'products', ['created_at', 'id']),
+    ('ix_products_job_created', 'products', ['generation_job_id', 'created_at', 'id']),
+    ('ix_products_status_created', 'products', ['status', 'created_at', 'id']),
+    ('ix_products_standard_created', 'products', ['standard_id', 'created_at', 'id']),
+    ('ix_products_type_created', 'products', ['product_type', 'created_at', 'id']),
+    ('ix_products_curriculum_grade_created', 'products', ['curriculum_board', 'grade_level', 'created_at', 'id']),
+    ('ix_generation_jobs_created_id', 'generation_jobs', ['created_at', 'id']),
+    ('ix_generation_jobs_type_created', 'generation_jobs', ['job_type', 'created_at', 'id']),
+    ('ix_generation_jobs_curriculum_grade_created', 'generation_jobs', ['curriculum_board', 'grade_level', 'created_at', 'id']),
+    ('ix_upload_tasks_created_id', 'upload_tasks', ['created_at', 'id']),
+    ('ix_upload_tasks_product_created', 'upload_tasks', ['product_id', 'created_at', 'id']),
+    ('ix_upload_tasks_assigned_created', 'upload_tasks', ['assigned_to', 'created_at', 'id']),
+]
+
+def upgrade() -> None:
+    # upload_tasks had a model but no migration; create it where missing
+    if not sa.inspect(op.get_bind()).has_table('upload_tasks'):
+        upload_task_status_enum = sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', name='uploadtaskstatus')
+        op.create_table('upload_tasks',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('product_id', sa.Integer(), nullable=False),
+            sa.Column('status', upload_task_status_enum, nullable=True, server_default='PENDING'),
+            sa.Column('assigned_to', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_upload_tasks_id', 'upload_tasks', ['id'])
+        op.create_index('ix_upload_tasks_product_id', 'upload_tasks', ['product_id'])
+        op.create_index('ix_upload_tasks_status', 'upload_tasks', ['status'])
+        op.create_index('ix_upload_tasks_status_created', 'upload_tasks', ['status', 'created_at'])
+        op.create_index('ix_upload_tasks_assigned', 'upload_tasks', ['assigned_to'])
+
+    # Build without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in LIST_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(LIST_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
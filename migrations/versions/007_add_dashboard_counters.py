@@ -0,0 +1,97 @@
+"""Add dashboard_counters maintained by triggers
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-01-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ['products', 'generation_jobs', 'upload_tasks']
+
+def upgrade() -> None:
+    op.create_table('dashboard_counters',
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('entity', 'status')
+    )
+
+    # Statement-level triggers with transition tables: a bulk insert of N rows
+    # costs one upsert per distinct status, not N row updates
+    op.execute("""
+        CREATE OR REPLACE FUNCTION dashboard_counters_apply()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO dashboard_counters (entity, status, count, updated_at)
+                SELECT TG_ARGV[0], status::text, count(*), now()
+                FROM new_rows WHERE status IS NOT NULL GROUP BY status
+                ON CONFLICT (entity, status)
+                DO UPDATE SET count = dashboard_counters.count + EXCLUDED.count, updated_at = now();
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO dashboard_counters (entity, status, count, updated_at)
+                SELECT TG_ARGV[0], status::text, -count(*), now()
+                FROM old_rows WHERE status IS NOT NULL GROUP BY status
+                ON CONFLICT (entity, status)
+                DO UPDATE SET count = dashboard_counters.count + EXCLUDED.count, updated_at = now();
+            ELSE
+                INSERT INTO dashboard_counters (entity, status, count, updated_at)
+                SELECT TG_ARGV[0], status, sum(delta), now()
+                FROM (
+                    SELECT status::text AS status, 1 AS delta FROM new_rows WHERE status IS NOT NULL
+                    UNION ALL
+                    SELECT status::text, -1 FROM old_rows WHERE status IS NOT NULL
+                ) AS changes
+                GROUP BY status
+                HAVING sum(delta) <> 0
+                ON CONFLICT (entity, status)
+                DO UPDATE SET count = dashboard_counters.count + EXCLUDED.count, updated_at = now();
+            END IF;
+            RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+    """)
+
+    for table in TRACKED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_dashboard_insert
+            AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_apply('{table}');
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_dashboard_update
+            AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_apply('{table}');
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_dashboard_delete
+            AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_apply('{table}');
+        """)
+
+        # Backfill from current data
+        op.execute(f"""
+            INSERT INTO dashboard_counters (entity, status, count)
+            SELECT '{table}', status::text, count(*) FROM {table}
+            WHERE status IS NOT NULL GROUP BY status
+        """)
+
+def downgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_dashboard_delete ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_dashboard_update ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_dashboard_insert ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS dashboard_counters_apply()")
+    op.drop_table('dashboard_counters')
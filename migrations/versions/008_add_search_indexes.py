@@ -0,0 +1,58 @@
+"""Add trigram and full-text search indexes for standards and product metadata
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-01-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Must match the expressions used by app/services/search.py exactly
+STANDARDS_DOCUMENT = "to_tsvector('simple', code || ' ' || coalesce(description, ''))"
+PRODUCT_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '') || ' ' || coalesce(keywords, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(topic, '')), 'C')"
+)
+
+SEARCH_INDEXES = [
+    ('ix_standards_code_trgm', 'standards', 'USING gin (code gin_trgm_ops)'),
+    ('ix_standards_description_trgm', 'standards', 'USING gin (description gin_trgm_ops)'),
+    ('ix_standards_document', 'standards', f'USING gin (({STANDARDS_DOCUMENT}))'),
+    ('ix_product_search_document', 'product_search', 'USING gin (document)'),
+    ('ix_product_search_title_trgm', 'product_search', 'USING gin (title gin_trgm_ops)'),
+]
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Searchable copy of metadata.json, filled by the pipeline and scripts/reindex_search.py
+    op.create_table('product_search',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('tags', sa.String(), nullable=True),
+        sa.Column('keywords', sa.String(), nullable=True),
+        sa.Column('topic', sa.String(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+    op.execute(f"ALTER TABLE product_search ADD COLUMN document tsvector GENERATED ALWAYS AS ({PRODUCT_DOCUMENT}) STORED")
+
+    with op.get_context().autocommit_block():
+        for name, table, definition in SEARCH_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(SEARCH_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.drop_table('product_search')
+    # pg_trgm is left installed; other objects may depend on it
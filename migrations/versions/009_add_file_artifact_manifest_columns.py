@@ -0,0 +1,36 @@
+"""Record size, checksum and content type for file artifacts
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-01-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # ADD VALUE cannot run inside a transaction block before Postgres 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE filetype ADD VALUE IF NOT EXISTS 'QC_JSON'")
+
+    op.add_column('file_artifacts', sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+    op.add_column('file_artifacts', sa.Column('checksum', sa.String(length=64), nullable=True))
+    op.add_column('file_artifacts', sa.Column('content_type', sa.String(), nullable=True))
+    op.add_column('file_artifacts', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')))
+
+    # Storage upserts artifacts by path; scripts/backfill_artifacts.py registers pre-existing files
+    op.create_index('ux_file_artifacts_product_path', 'file_artifacts', ['product_id', 'file_path'], unique=True)
+
+def downgrade() -> None:
+    op.drop_index('ux_file_artifacts_product_path', table_name='file_artifacts')
+    op.drop_column('file_artifacts', 'updated_at')
+    op.drop_column('file_artifacts', 'content_type')
+    op.drop_column('file_artifacts', 'checksum')
+    op.drop_column('file_artifacts', 'size_bytes')
+    # Postgres cannot drop a single enum value; QC_JSON stays in the filetype type
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Register files already in storage as FileArtifact rows (products created before migration 009)
+Run with: python scripts/backfill_artifacts.py [--batch-size 500]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.enums import FileType
+from app.db.session import SessionLocal
+from app.models.product import Product
+from app.utils.storage import JSON_ARTIFACT_TYPES, storage_manager
+from app.utils.logger import start_logging
+
+def artifact_files(product_id: int):
+    """(file_type, path) for each known artifact on disk"""
+    product_path = storage_manager.base_path / f"product_{product_id}"
+    if not product_path.is_dir():
+        return
+    for name, file_type in JSON_ARTIFACT_TYPES.items():
+        path = product_path / f"{name}.json"
+        if path.is_file():
+            yield file_type, path
+    for path in product_path.glob("*.pdf"):
+        # Stub PDFs (and the *_thumbnail.png files written beside them) are placeholders, not renders
+        if not path.name.endswith("_stub.pdf"):
+            yield FileType.PDF, path
+
+def backfill(batch_size: int) -> None:
+    """Upsert an artifact row for every stored file"""
+    db = SessionLocal()
+    registered = 0
+    last_id = 0
+
+    try:
+        while True:
+            product_ids = [row.id for row in db.query(Product.id).filter(Product.id > last_id).order_by(Product.id).limit(batch_size)]
+            if not product_ids:
+                break
+            last_id = product_ids[-1]
+
+            for product_id in product_ids:
+                for file_type, path in artifact_files(product_id):
+                    storage_manager.register_file(product_id, file_type, path, db)
+                    registered += 1
+
+            db.commit()
+            print(f"Registered {registered} artifacts, up to product ID {last_id}")
+    finally:
+        db.close()
+
+    print(f"Done: {registered} artifacts registered")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Register stored product files in file_artifacts")
+    parser.add_argument("--batch-size", type=int, default=500, help="Products per transaction")
+    args = parser.parse_args()
+    start_logging()
+    backfill(args.batch_size)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Per-PDF render cost before and after the template layer, on synthetic worksheets
+Run with: python scripts/benchmark_pdf_render.py [--count 500] [--seed 7]
+
+"Before" is the story-per-render worksheet builder PDFGenerator used until the
+templates in app/utils/pdf_templates.py replaced it, reproduced below with its
+styles built once (as the old module singleton did). Both renderers write the
+same corpus to a temporary directory; no database or storage is touched.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import os
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from app.core.enums import ProductType
+from app.utils.pdf_templates import template_for
+
+WORDS = (
+    "fraction ratio angle triangle area perimeter volume equation variable graph data "
+    "energy force motion cell plant water cycle habitat climate map river history "
+    "number pattern estimate measure compare explain describe identify solve predict"
+).split()
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize() + "."
+
+def synthetic_worksheet(rng: random.Random, index: int) -> dict:
+    """Worksheet shaped like WorksheetSchema output (plus the legacy question/type keys)"""
+    questions = []
+    for number in range(1, rng.randint(8, 12) + 1):
+        question_type = "multiple_choice" if number <= 3 else rng.choice(["short_answer", "problem_solving", "creative"])
+        question_text = sentence(rng, 8, 25).rstrip(".") + "?"
+        question = {
+            "question_number": number,
+            "question_text": question_text,
+            "question": question_text,
+            "question_type": question_type,
+            "type": question_type,
+            "correct_answer": sentence(rng, 2, 6),
+            "explanation": sentence(rng, 8, 20),
+            "points": rng.randint(1, 5),
+        }
+        if question_type == "multiple_choice":
+            question["options"] = [sentence(rng, 1, 5) for _ in range(4)]
+        questions.append(question)
+
+    return {
+        "title": f"Worksheet {index}: {sentence(rng, 3, 6).rstrip('.')}",
+        "grade_level": rng.randint(6, 10),
+        "subject": rng.choice(["Mathematics", "Science", "Social Science", "English"]),
+        "estimated_time": rng.choice([30, 45, 60]),
+        "learning_objectives": [sentence(rng, 6, 14) for _ in range(rng.randint(2, 4))],
+        "instructions": " ".join(sentence(rng, 8, 16) for _ in range(3)),
+        "questions": questions,
+        "extensions": [
+            {"title": sentence(rng, 2, 5), "description": sentence(rng, 12, 30), "difficulty": "enrichment"}
+            for _ in range(2)
+        ],
+        "total_points": sum(q["points"] for q in questions),
+    }
+
+class LegacyWorksheetRenderer:
+    """The pre-template worksheet layout: every render re-parses its full markup story"""
+
+    def __init__(self):
+        self.styles = getSampleStyleSheet()
+        self.styles.add(ParagraphStyle(
+            name='CustomTitle', parent=self.styles['Heading1'], fontSize=18, spaceAfter=30,
+            textColor=colors.darkblue, alignment=1
+        ))
+        self.styles.add(ParagraphStyle(
+            name='QuestionStyle', parent=self.styles['Normal'], fontSize=12, spaceAfter=12, leftIndent=20
+        ))
+
+    def build(self, output_path: Path, content_data: dict) -> int:
+        doc = SimpleDocTemplate(str(output_path), pagesize=A4)
+        story = [Paragraph(content_data.get('title', 'Educational Worksheet'), self.styles['CustomTitle']), Spacer(1, 20)]
+        info_text = (
+            f"<b>Grade:</b> {content_data.get('grade_level', 'N/A')} | <b>Subject:</b> {content_data.get('subject', 'N/A')} | "
+            f"<b>Time:</b> {content_data.get('estimated_time', 'N/A')}"
+        )
+        story.append(Paragraph(info_text, self.styles['Normal']))
+        story.append(Spacer(1, 20))
+        if 'learning_objectives' in content_data:
+            story.append(Paragraph("<b>Learning Objectives:</b>", self.styles['Heading2']))
+            for obj in content_data['learning_objectives']:
+                story.append(Paragraph(f"• {obj}", self.styles['Normal']))
+            story.append(Spacer(1, 15))
+        if 'instructions' in content_data:
+            story.append(Paragraph("<b>Instructions:</b>", self.styles['Heading2']))
+            story.append(Paragraph(content_data['instructions'], self.styles['Normal']))
+            story.append(Spacer(1, 20))
+        if 'questions' in content_data:
+            story.append(Paragraph("<b>Questions:</b>", self.styles['Heading2']))
+            story.append(Spacer(1, 10))
+            for i, question in enumerate(content_data['questions'], 1):
+                story.append(Paragraph(f"<b>{i}. {question.get('question', f'Question {i}')}</b>", self.styles['QuestionStyle']))
+                if question.get('type') == 'multiple_choice' and 'options' in question:
+                    for j, option in enumerate(question['options']):
+                        story.append(Paragraph(f"   {chr(65 + j)}) {option}", self.styles['Normal']))
+                story.append(Paragraph(f"<i>Points: {question.get('points', 1)}</i>", self.styles['Normal']))
+                story.append(Spacer(1, 15))
+        doc.build(story)
+        return doc.page
+
+def measure(name: str, build, corpus: list, output_dir: Path) -> dict:
+    """Render the corpus once; the first (cold) render is reported separately"""
+    timings = []
+    pages = 0
+    for index, content in enumerate(corpus):
+        started = time.perf_counter()
+        pages += build(output_dir / f"{name}_{index}.pdf", content)
+        timings.append(time.perf_counter() - started)
+
+    warm = timings[1:] or timings
+    ordered = sorted(warm)
+    return {
+        "name": name,
+        "cold_ms": timings[0] * 1000,
+        "mean_ms": statistics.mean(warm) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "total_s": sum(timings),
+        "pages_per_sec": pages / sum(timings),
+    }
+
+def print_result(result: dict) -> None:
+    print(
+        f"  {result['name']:<8} cold {result['cold_ms']:7.1f} ms | mean {result['mean_ms']:6.1f} ms | "
+        f"p50 {result['p50_ms']:6.1f} ms | p95 {result['p95_ms']:6.1f} ms | "
+        f"total {result['total_s']:6.1f}s | {result['pages_per_sec']:6.1f} pages/sec"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering before/after the template layer")
+    parser.add_argument("--count", type=int, default=500, help="Synthetic worksheets to render")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_worksheet(rng, index) for index in range(1, args.count + 1)]
+    print(f"Rendering {len(corpus)} synthetic worksheets per renderer")
+
+    with tempfile.TemporaryDirectory(prefix="rbb-pdf-bench-") as tmp:
+        output_dir = Path(tmp)
+        before = measure("before", LegacyWorksheetRenderer().build, corpus, output_dir)
+        after = measure("after", template_for(ProductType.WORKSHEET).build, corpus, output_dir)
+
+    print_result(before)
+    print_result(after)
+    print(f"  Per-PDF speedup (mean): {before['mean_ms'] / after['mean_ms']:.2f}x")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the list endpoints.
+
+Seeds a large synthetic dataset into a scratch Postgres database, then runs
+EXPLAIN on the exact queries built by the repositories and pagination helpers
+and fails if any of them falls back to a sequential scan or a large sort.
+
+Run with: python scripts/check_query_plans.py --database-url postgresql://.../rbb_plans
+Never point it at a real database - it creates, fills and drops the tables.
+"""
+
+import argparse
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timezone
+from sqlalchemy import Select, create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.enums import CurriculumBoard, JobStatus, JobType, ProductStatus, ProductType, UploadTaskStatus
+from app.db.base import Base
+from app.models.generation_job import GenerationJob
+from app.models.product import Product
+from app.models.upload_task import UploadTask
+from app.repositories.generation_jobs import GenerationJobRepository
+from app.repositories.products import ProductRepository
+from app.utils.pagination import PaginationParams, build_page_query, encode_cursor
+
+TABLES = [GenerationJob.__table__, Product.__table__, UploadTask.__table__]
+
+# Cursor deep into the seeded range, for keyset pages
+DEEP_CURSOR = encode_cursor(datetime(2024, 6, 1, tzinfo=timezone.utc), 1)
+
+def seed(db, products: int) -> None:
+    """Bulk-load synthetic rows with generate_series (seconds, not minutes)"""
+    jobs = max(products // 50, 1)
+    tasks = max(products // 10, 1)
+    standards = 500
+
+    db.execute(text("""
+        INSERT INTO generation_jobs (standard_id, locale, curriculum_board, grade_level, job_type, status,
+                                     total_products, completed_products, failed_products, created_at, updated_at)
+        SELECT (g % :standards) + 1,
+               'IN',
+               (ARRAY['CBSE','COMMON_CORE'])[(g % 2) + 1]::curriculumboard,
+               (g % 12) + 1,
+               (ARRAY['SINGLE_PRODUCT','FULL_BUNDLE'])[(g % 2) + 1]::jobtype,
+               (ARRAY['PENDING','RUNNING','COMPLETED','FAILED'])[(g % 4) + 1]::jobstatus,
+               50, 0, 0,
+               timestamptz '2024-01-01' + g * interval '1 minute',
+               timestamptz '2024-01-01' + g * interval '1 minute'
+        FROM generate_series(1, :jobs) AS g
+    """), {"standards": standards, "jobs": jobs})
+
+    db.execute(text("""
+        INSERT INTO products (standard_id, generation_job_id, locale, curriculum_board, grade_level,
+                              product_type, status, created_at)
+        SELECT (g % :standards) + 1,
+               (g % :jobs) + 1,
+               'IN',
+               (ARRAY['CBSE','COMMON_CORE'])[(g % 2) + 1]::curriculumboard,
+               (g % 12) + 1,
+               (ARRAY['WORKSHEET','PASSAGE','QUIZ','ASSESSMENT'])[(g % 4) + 1]::producttype,
+               (ARRAY['DRAFT','GENERATED','FAILED'])[(g % 3) + 1]::productstatus,
+               timestamptz '2024-01-01' + g * interval '1 second'
+        FROM generate_series(1, :products) AS g
+    """), {"standards": standards, "jobs": jobs, "products": products})
+
+    db.execute(text("""
+        INSERT INTO upload_tasks (product_id, status, assigned_to, created_at)
+        SELECT (g % :products) + 1,
+               (ARRAY['PENDING','IN_PROGRESS','COMPLETED'])[(g % 3) + 1]::uploadtaskstatus,
+               'va' || (g % 20),
+               timestamptz '2024-01-01' + g * interval '10 seconds'
+        FROM generate_series(1, :tasks) AS g
+    """), {"products": products, "tasks": tasks})
+
+    db.commit()
+    for table in ("generation_jobs", "products", "upload_tasks"):
+        db.execute(text(f"ANALYZE {table}"))
+    db.commit()
+
+def upload_task_query(**filters) -> Select:
+    """Mirror of the query built by list_upload_tasks"""
+    query = select(UploadTask).join(Product, UploadTask.product_id == Product.id)
+    if filters.get("status"):
+        query = query.where(UploadTask.status == filters["status"])
+    if filters.get("assigned_to"):
+        query = query.where(UploadTask.assigned_to == filters["assigned_to"])
+    if filters.get("product_id"):
+        query = query.where(UploadTask.product_id == filters["product_id"])
+    return query
+
+def cases():
+    # Repositories only build the statements here; nothing runs on their session
+    products = ProductRepository(None)
+    jobs = GenerationJobRepository(None)
+    first_page = PaginationParams(limit=50)
+    deep_page = PaginationParams(limit=50, cursor=DEEP_CURSOR)
+
+    yield "products: unfiltered", products.get_all(), first_page
+    yield "products: keyset page", products.get_all(), deep_page
+    yield "products: by job", products.get_all(generation_job_id=42), first_page
+    yield "products: by status", products.get_all(status=ProductStatus.GENERATED), first_page
+    yield "products: by status, keyset", products.get_all(status=ProductStatus.GENERATED), deep_page
+    yield "products: by standard", products.get_all(standard_id=7), first_page
+    yield "products: by type", products.get_all(product_type=ProductType.QUIZ), first_page
+    yield "products: by curriculum + grade", products.get_all(curriculum_board=CurriculumBoard.CBSE, grade_level=6), first_page
+    yield "products: by status + type", products.get_all(status=ProductStatus.DRAFT, product_type=ProductType.WORKSHEET), first_page
+
+    yield "jobs: unfiltered", jobs.get_all(), first_page
+    yield "jobs: keyset page", jobs.get_all(), deep_page
+    yield "jobs: by status", jobs.get_all(status=JobStatus.RUNNING), first_page
+    yield "jobs: by type", jobs.get_all(job_type=JobType.FULL_BUNDLE), first_page
+    yield "jobs: by curriculum + grade", jobs.get_all(curriculum_board=CurriculumBoard.COMMON_CORE, grade_level=9), first_page
+
+    yield "upload tasks: unfiltered", upload_task_query(), first_page
+    yield "upload tasks: keyset page", upload_task_query(), deep_page
+    yield "upload tasks: by status", upload_task_query(status=UploadTaskStatus.PENDING), first_page
+    yield "upload tasks: by assignee", upload_task_query(assigned_to="va3"), first_page
+    yield "upload tasks: by product", upload_task_query(product_id=1234), first_page
+
+def plan_problems(node, max_sort_rows: int, problems=None):
+    """Collect sequential scans and large sorts anywhere in the plan tree.
+
+    Sorting a handful of rows fetched through a selective index (e.g. one
+    job's products) is cheaper than walking a composite index, so only sorts
+    over more than `max_sort_rows` estimated rows count as regressions.
+    """
+    problems = [] if problems is None else problems
+    node_type = node["Node Type"]
+    if node_type == "Seq Scan":
+        problems.append(f"Seq Scan on {node.get('Relation Name')}")
+    elif node_type == "Sort":
+        sorted_rows = node["Plans"][0]["Plan Rows"]
+        if sorted_rows > max_sort_rows:
+            problems.append(f"Sort of ~{sorted_rows} rows on {', '.join(node.get('Sort Key', []))}")
+    for child in node.get("Plans", []):
+        plan_problems(child, max_sort_rows, problems)
+    return problems
+
+def scans(node, found=None):
+    found = [] if found is None else found
+    if "Relation Name" in node:
+        found.append(f"{node['Node Type']} using {node.get('Index Name', '-')}")
+    elif node["Node Type"] == "Sort":
+        found.append(f"Sort of ~{node['Plans'][0]['Plan Rows']} rows")
+    for child in node.get("Plans", []):
+        scans(child, found)
+    return found
+
+def explain(db, query: Select) -> dict:
+    bind = db.get_bind()
+    sql = query.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Assert list endpoint queries use index scans")
+    parser.add_argument("--database-url", default=os.environ.get("PLAN_CHECK_DATABASE_URL"),
+                        help="Scratch Postgres database (or PLAN_CHECK_DATABASE_URL)")
+    parser.add_argument("--products", type=int, default=200000, help="Synthetic products to seed")
+    parser.add_argument("--max-sort-rows", type=int, default=1000, help="Largest acceptable in-memory sort")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded tables afterwards")
+    args = parser.parse_args()
+
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        print("A scratch Postgres --database-url is required")
+        return 2
+    if args.database_url == settings.database_url:
+        print("Refusing to seed the application database; use a scratch database")
+        return 2
+
+    engine = create_engine(args.database_url)
+    db = sessionmaker(bind=engine)()
+    failures = 0
+    try:
+        Base.metadata.drop_all(engine, tables=TABLES)
+        Base.metadata.create_all(engine, tables=TABLES)
+        print(f"Seeding {args.products} products...")
+        seed(db, args.products)
+
+        for name, query, params in cases():
+            plan = explain(db, build_page_query(query, params))
+            problems = plan_problems(plan, args.max_sort_rows)
+            if problems:
+                failures += 1
+                print(f"FAIL  {name}: {'; '.join(problems)}")
+            else:
+                print(f"ok    {name}: {', '.join(scans(plan))}")
+    finally:
+        db.close()
+        if not args.keep:
+            Base.metadata.drop_all(engine, tables=TABLES)
+        engine.dispose()
+
+    print(f"\n{failures} query plan regression(s)" if failures else "\nAll list queries use index scans")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
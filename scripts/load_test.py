@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP load test for the read-heavy API endpoints.
+
+Keeps --concurrency requests in flight for --duration seconds against a
+running server and reports requests/sec and latency percentiles per endpoint.
+
+Run with: python scripts/load_test.py --base-url http://localhost:8000 --concurrency 64 --duration 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/health",
+    "/api/products?limit=20",
+    "/api/v1/generation-jobs?limit=20&total=none",
+    "/api/v1/standards?limit=20",
+    "/api/dashboard/summary",
+]
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+async def run(base_url: str, paths: List[str], concurrency: int, duration: float) -> None:
+    latencies: Dict[str, List[float]] = {path: [] for path in paths}
+    errors: Dict[str, int] = {path: 0 for path in paths}
+    next_path = itertools.cycle(paths).__next__
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # Warm up connections and server-side caches
+        for path in paths:
+            await client.get(path)
+
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                path = next_path()
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[path].append((time.perf_counter() - started) * 1000)
+                else:
+                    errors[path] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{concurrency} concurrent clients for {elapsed:.1f}s against {base_url}\n")
+    print(f"{'endpoint':<48} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for path in paths:
+        values = latencies[path]
+        print(
+            f"{path:<48} {len(values) / elapsed:>8.1f} "
+            f"{(statistics.median(values) if values else 0):>8.1f} "
+            f"{percentile(values, 0.95):>8.1f} {percentile(values, 0.99):>8.1f} {errors[path]:>7}"
+        )
+    print(f"\nTotal: {total / elapsed:.1f} req/s, {sum(errors.values())} errors")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API throughput under concurrent load")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests kept in flight")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint to hit (repeatable)")
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.paths or DEFAULT_PATHS, args.concurrency, args.duration))
+
+if __name__ == "__main__":
+    main()
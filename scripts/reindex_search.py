@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Backfill the product search index from each product's metadata.json
+Run with: python scripts/reindex_search.py [--batch-size 500]
+"""
+
+import argparse
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal, engine
+from app.models.product import Product
+from app.services.search import ensure_search_schema, index_product_metadata
+from app.utils.storage import storage_manager
+from app.utils.logger import start_logging
+
+def reindex(batch_size: int) -> None:
+    """Index every product that has generated metadata"""
+    ensure_search_schema(engine)
+    db = SessionLocal()
+    indexed = skipped = 0
+    last_id = 0
+
+    try:
+        while True:
+            product_ids = [row.id for row in db.query(Product.id).filter(Product.id > last_id).order_by(Product.id).limit(batch_size)]
+            if not product_ids:
+                break
+            last_id = product_ids[-1]
+
+            for product_id in product_ids:
+                metadata_path = storage_manager.base_path / f"product_{product_id}" / "metadata.json"
+                try:
+                    metadata = json.loads(metadata_path.read_text())
+                except (OSError, ValueError):
+                    skipped += 1
+                    continue
+                # Stub metadata has no searchable fields
+                if not metadata.get("title"):
+                    skipped += 1
+                    continue
+                index_product_metadata(db, product_id, metadata)
+                indexed += 1
+
+            db.commit()
+            print(f"Indexed {indexed} products ({skipped} without metadata), up to ID {last_id}")
+    finally:
+        db.close()
+
+    print(f"Done: {indexed} indexed, {skipped} skipped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild product_search from metadata.json files")
+    parser.add_argument("--batch-size", type=int, default=500, help="Products per transaction")
+    args = parser.parse_args()
+    start_logging()
+    reindex(args.batch_size)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pre-render PDFs for every GENERATED product that does not have one yet
+Run with: python scripts/render_pdfs.py [--workers 8] [--batch-size 200] [--after-id 0] [--limit N]
+
+Safe to interrupt: finished PDFs are registered as they complete, so a rerun
+picks up only what is still missing. --after-id skips ahead using the
+"last product" ID printed in the progress lines.
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.batch_render import BatchRenderSummary, batch_renderer
+from app.utils.logger import start_logging
+
+def print_progress(summary: BatchRenderSummary) -> None:
+    stats = summary.as_dict()
+    print(
+        f"Rendered {stats['rendered']}, failed {stats['failed']}, "
+        f"{stats['pages_per_second']} pages/sec, last product {stats['last_product_id']}",
+        flush=True
+    )
+
+def print_summary(summary: BatchRenderSummary) -> None:
+    stats = summary.as_dict()
+    print("\nBatch render summary")
+    print(f"  Rendered:      {stats['rendered']} products ({stats['pages']} pages)")
+    print(f"  Failed:        {stats['failed']}")
+    print(f"  Elapsed:       {stats['elapsed_seconds']}s")
+    print(f"  Throughput:    {stats['products_per_second']} products/sec, {stats['pages_per_second']} pages/sec")
+    print(f"  Avg render:    {stats['avg_render_seconds']}s per PDF (per worker)")
+    print(f"  Last product:  {stats['last_product_id']}")
+    if stats["failures"]:
+        print("  Failures:")
+        for failure in stats["failures"]:
+            print(f"    product {failure['product_id']}: {failure['error']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render missing product PDFs across all cores")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Render processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Products fetched per query")
+    parser.add_argument("--after-id", type=int, default=0, help="Resume after this product ID")
+    parser.add_argument("--limit", type=int, default=None, help="Render at most this many products")
+    parser.add_argument("--progress-every", type=int, default=50, help="Print progress every N products")
+    args = parser.parse_args()
+    start_logging()
+
+    summary = batch_renderer.run(
+        workers=args.workers,
+        batch_size=args.batch_size,
+        after_id=args.after_id,
+        limit=args.limit,
+        progress=print_progress,
+        progress_every=args.progress_every
+    )
+    print_summary(summary)
+    sys.exit(1 if summary.failed else 0)
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.standard import Standard
 from app.core.enums import Locale, CurriculumBoard
+from app.utils.logger import start_logging
 
 def seed_cbse_standards():
     """Seed CBSE standards for grades 6-10"""
@@ -154,4 +155,5 @@ def seed_cbse_standards():
         db.close()
 
 if __name__ == "__main__":
+    start_logging()
     seed_cbse_standards()
\ No newline at end of file
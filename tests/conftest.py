@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+# Settings are read from the environment at import time; point them at SQLite before app modules load
+_TEST_DIR = tempfile.mkdtemp(prefix="rbb-tests-")
+os.environ.setdefault("APP_NAME", "RBB Engine (tests)")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DIR}/rbb.sqlite3")
+os.environ.setdefault("STORAGE_PATH", f"{_TEST_DIR}/storage")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_FORMAT", "text")
+
+import pytest
+from sqlalchemy import create_engine
+from app.db.session import Base, engine as app_engine
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+# Tables whose model metadata creates cleanly on SQLite (production schemas come from migrations)
+SQLITE_TABLES = ["products", "generation_jobs", "upload_tasks", "dashboard_counters"]
+
+def _tables():
+    return [Base.metadata.tables[name] for name in SQLITE_TABLES]
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    """A fresh SQLite database with the tables the tests use"""
+    url = f"sqlite:///{tmp_path}/test.sqlite3"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=_tables())
+    engine.dispose()
+    return url
+
+@pytest.fixture
+def app_db():
+    """The app's own DATABASE_URL (what SessionLocal and the worker use), emptied afterwards"""
+    Base.metadata.create_all(app_engine, tables=_tables())
+    yield app_engine
+    Base.metadata.drop_all(app_engine, tables=_tables())
@@ -0,0 +1,109 @@
+import asyncio
+from app.core.enums import JobStatus, JobType, ProductStatus, ProductType
+from app.db.session import SessionLocal
+from app.models.generation_job import GenerationJob
+from app.models.product import Product
+from app.services import generation_worker as worker_module
+from app.services.generation_worker import GenerationWorker
+from app.services.agent_dag import StepResult, StepStatus
+from app.services.job_status import add_step_results, transition_product_status
+
+def set_status(product_id: int, status: ProductStatus) -> None:
+    db = SessionLocal()
+    try:
+        product = db.query(Product).filter(Product.id == product_id).one()
+        assert transition_product_status(db, product, status)
+    finally:
+        db.close()
+
+def create_job(product_count: int, **job_fields) -> tuple:
+    db = SessionLocal()
+    try:
+        job = GenerationJob(
+            standard_id=1, grade_level=6, job_type=JobType.FULL_BUNDLE, status=JobStatus.RUNNING,
+            total_products=product_count, completed_products=0, failed_products=0, **job_fields
+        )
+        db.add(job)
+        db.flush()
+        products = [
+            Product(standard_id=1, generation_job_id=job.id, product_type=ProductType.WORKSHEET, grade_level=6)
+            for _ in range(product_count)
+        ]
+        db.add_all(products)
+        db.commit()
+        return job.id, [product.id for product in products]
+    finally:
+        db.close()
+
+def run_job(job_id: int) -> None:
+    async def run() -> None:
+        worker = GenerationWorker()
+        worker._slots = asyncio.Semaphore(worker.concurrency)
+        await worker._run_job(job_id)
+
+    asyncio.run(run())
+
+def test_product_reopened_while_its_job_runs_is_generated(app_db, monkeypatch):
+    db = SessionLocal()
+    try:
+        job = GenerationJob(
+            standard_id=1, grade_level=6, job_type=JobType.FULL_BUNDLE, status=JobStatus.RUNNING,
+            total_products=2, completed_products=0, failed_products=1
+        )
+        db.add(job)
+        db.flush()
+        pending = Product(standard_id=1, generation_job_id=job.id, product_type=ProductType.WORKSHEET, grade_level=6)
+        failed = Product(
+            standard_id=1, generation_job_id=job.id, product_type=ProductType.QUIZ, grade_level=6,
+            status=ProductStatus.FAILED
+        )
+        db.add_all([pending, failed])
+        db.commit()
+        job_id, pending_id, failed_id = job.id, pending.id, failed.id
+    finally:
+        db.close()
+
+    generated = []
+
+    async def fake_generation(product_id: int, step_timings=None) -> ProductStatus:
+        if product_id == pending_id:
+            # PATCH /products/{id}/status while the worker holds the job's product list
+            await asyncio.to_thread(set_status, failed_id, ProductStatus.DRAFT)
+        await asyncio.to_thread(set_status, product_id, ProductStatus.GENERATED)
+        generated.append(product_id)
+        return ProductStatus.GENERATED
+
+    monkeypatch.setattr(worker_module, "run_product_generation", fake_generation)
+    run_job(job_id)
+
+    assert generated == [pending_id, failed_id]
+    db = SessionLocal()
+    try:
+        job = db.query(GenerationJob).filter(GenerationJob.id == job_id).one()
+        assert (job.status, job.completed_products, job.failed_products) == (JobStatus.COMPLETED, 2, 0)
+    finally:
+        db.close()
+
+def test_step_timings_of_concurrent_products_are_all_recorded(app_db, monkeypatch):
+    job_id, product_ids = create_job(10)
+
+    async def fake_generation(product_id: int, step_timings=None) -> ProductStatus:
+        await asyncio.sleep(0)
+        add_step_results(step_timings, {
+            "generate": StepResult("generate", StepStatus.SUCCEEDED, duration_ms=100.0 + product_id),
+            "qc": StepResult("qc", StepStatus.FAILED, duration_ms=50.0),
+        })
+        await asyncio.to_thread(set_status, product_id, ProductStatus.GENERATED)
+        return ProductStatus.GENERATED
+
+    monkeypatch.setattr(worker_module, "run_product_generation", fake_generation)
+    run_job(job_id)
+
+    db = SessionLocal()
+    try:
+        timings = db.query(GenerationJob.step_timings).filter(GenerationJob.id == job_id).scalar()
+    finally:
+        db.close()
+    assert timings["generate"]["runs"] == 10
+    assert timings["generate"]["max_ms"] == 100.0 + max(product_ids)
+    assert (timings["qc"]["runs"], timings["qc"]["failures"]) == (10, 10)
@@ -0,0 +1,25 @@
+import logging
+import sys
+from logging.handlers import QueueHandler
+from app.utils import logger as logger_module
+from app.utils.logger import ROOT_LOGGER, get_logger, log_context, shutdown_logging, start_logging
+
+def test_importing_the_logger_starts_no_listener():
+    assert logger_module._listener is None
+    assert not any(isinstance(handler, QueueHandler) for handler in logging.getLogger(ROOT_LOGGER).handlers)
+
+def test_records_logged_after_shutdown_are_written(capsys, monkeypatch):
+    # The direct handler captured sys.stderr at import, before capsys swapped it
+    monkeypatch.setattr(logger_module._direct_handler, "stream", sys.stderr)
+    logger = get_logger("app.tests.logging")
+
+    start_logging()
+    with log_context(job_id=7):
+        logger.warning("queued record")
+    shutdown_logging()
+    logger.warning("direct record")
+
+    err = capsys.readouterr().err
+    assert "queued record" in err and "job_id=7" in err
+    assert "direct record" in err
+    assert logger_module._listener is None
@@ -0,0 +1,39 @@
+import asyncio
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from app.core.enums import ProductType
+from app.db.session import async_database_url
+from app.models.product import Product
+from app.utils.pagination import PaginationParams, paginate_query
+
+def seed_products(url: str, count: int) -> None:
+    # One statement: every row gets the same CURRENT_TIMESTAMP second
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(insert(Product), [
+            {"standard_id": 1, "product_type": ProductType.WORKSHEET, "grade_level": 6} for _ in range(count)
+        ])
+    engine.dispose()
+
+async def collect_pages(url: str, limit: int):
+    engine = create_async_engine(async_database_url(url))
+    pages = []
+    try:
+        async with AsyncSession(engine) as db:
+            cursor = None
+            while len(pages) < 20:
+                page = await paginate_query(db, select(Product), PaginationParams(limit=limit, cursor=cursor))
+                pages.append([product.id for product in page.items])
+                if not page.has_next:
+                    break
+                cursor = page.next_cursor
+    finally:
+        await engine.dispose()
+    return pages
+
+def test_cursor_pages_through_sqlite_rows_sharing_a_timestamp(sqlite_url):
+    seed_products(sqlite_url, 7)
+
+    pages = asyncio.run(collect_pages(sqlite_url, limit=2))
+
+    assert pages == [[7, 6], [5, 4], [3, 2], [1]]
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+import pytest
+from app.ai.rate_limiter import AdvisoryLockSlots
+
+def test_advisory_lock_slots_rejects_zero_slots():
+    with pytest.raises(ValueError):
+        AdvisoryLockSlots(0)
+
+def test_slot_won_after_cancellation_is_released(monkeypatch):
+    slots = AdvisoryLockSlots(1)
+    entered, finish = threading.Event(), threading.Event()
+    released = []
+
+    def slow_try_acquire():
+        entered.set()
+        finish.wait(5)
+        return "conn", 0
+
+    monkeypatch.setattr(slots, "_try_acquire", slow_try_acquire)
+    monkeypatch.setattr(slots, "_release", lambda conn, slot: released.append((conn, slot)))
+
+    async def run() -> None:
+        task = asyncio.create_task(slots.acquire())
+        await asyncio.to_thread(entered.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The lock is taken after the caller has already given up
+        finish.set()
+        for _ in range(100):
+            if released:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert released == [("conn", 0)]